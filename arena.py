@@ -0,0 +1,205 @@
+import numpy as np
+
+# Arena berupa occupancy grid dan sensor jarak (lidar) yang disimulasikan
+# dengan raycasting. Semua berkas (beam) dari semua robot ditelusuri
+# bersamaan dengan DDA (grid traversal Amanatides-Woo): di setiap iterasi
+# setiap ray aktif maju tepat satu sel ke batas sel x atau y terdekat, dan
+# ray yang menabrak sel terisi atau melewati jangkauan maksimum dikeluarkan
+# dari himpunan aktif. Grid dibungkus satu sel terisi di sekelilingnya,
+# sehingga ray yang keluar peta berhenti di tepi peta tanpa cek batas.
+#
+# Sel grid: baris = sumbu y (baris 0 di ymin), kolom = sumbu x.
+
+
+class OccupancyGrid:
+    def __init__(self, width, height, resolution=0.05, origin=(0.0, 0.0)):
+        if resolution <= 0:
+            raise ValueError("resolusi harus lebih besar dari 0")
+        self.resolution = float(resolution)
+        self.origin = (float(origin[0]), float(origin[1]))
+        self.cells = np.zeros((int(height), int(width)), dtype=bool)
+        self._solid = None
+
+    # Grid yang menutup extent (xmin, xmax, ymin, ymax) dalam meter
+    @classmethod
+    def from_extent(cls, extent, resolution=0.05):
+        xmin, xmax, ymin, ymax = extent
+        width = int(np.ceil((xmax - xmin) / resolution))
+        height = int(np.ceil((ymax - ymin) / resolution))
+        return cls(width, height, resolution, (xmin, ymin))
+
+    @property
+    def shape(self):
+        return self.cells.shape
+
+    @property
+    def extent(self):
+        height, width = self.cells.shape
+        x0, y0 = self.origin
+        return (x0, x0 + width * self.resolution, y0, y0 + height * self.resolution)
+
+    # Indeks sel (baris, kolom) untuk titik dunia; boleh di luar grid
+    def world_to_cell(self, x, y):
+        col = np.floor((np.asarray(x, dtype=float) - self.origin[0]) / self.resolution).astype(np.intp)
+        row = np.floor((np.asarray(y, dtype=float) - self.origin[1]) / self.resolution).astype(np.intp)
+        return row, col
+
+    # Koordinat dunia pusat sel
+    def cell_to_world(self, row, col):
+        return (self.origin[0] + (np.asarray(col) + 0.5) * self.resolution,
+                self.origin[1] + (np.asarray(row) + 0.5) * self.resolution)
+
+    # Apakah titik berada di sel terisi; titik di luar grid dianggap terisi
+    def occupied(self, x, y):
+        row, col = self.world_to_cell(x, y)
+        height, width = self.cells.shape
+        inside = (row >= 0) & (row < height) & (col >= 0) & (col < width)
+        return ~inside | self.cells[np.clip(row, 0, height - 1), np.clip(col, 0, width - 1)]
+
+    def _changed(self):
+        self._solid = None
+
+    # Isi (atau kosongkan) persegi panjang dunia [x0, x1] x [y0, y1]
+    def add_box(self, x0, x1, y0, y1, value=True):
+        row0, col0 = self.world_to_cell(min(x0, x1), min(y0, y1))
+        row1, col1 = self.world_to_cell(max(x0, x1), max(y0, y1))
+        height, width = self.cells.shape
+        self.cells[max(row0, 0):min(row1 + 1, height), max(col0, 0):min(col1 + 1, width)] = value
+        self._changed()
+
+    # Isi (atau kosongkan) lingkaran berpusat (x, y) dengan jari-jari radius
+    def add_circle(self, x, y, radius, value=True):
+        row0, col0 = self.world_to_cell(x - radius, y - radius)
+        row1, col1 = self.world_to_cell(x + radius, y + radius)
+        height, width = self.cells.shape
+        rows = slice(max(row0, 0), min(row1 + 1, height))
+        cols = slice(max(col0, 0), min(col1 + 1, width))
+        cx, cy = self.cell_to_world(np.arange(rows.start, rows.stop)[:, None], np.arange(cols.start, cols.stop))
+        self.cells[rows, cols][(cx - x) ** 2 + (cy - y) ** 2 <= radius * radius] = value
+        self._changed()
+
+    # Dinding setebal thickness meter di keempat tepi grid
+    def add_walls(self, thickness=None):
+        cells = 1 if thickness is None else max(int(np.ceil(thickness / self.resolution)), 1)
+        self.cells[:cells] = self.cells[-cells:] = True
+        self.cells[:, :cells] = self.cells[:, -cells:] = True
+        self._changed()
+
+    # Grid datar dengan bingkai sel terisi, dipakai raycast()
+    def solid(self):
+        if self._solid is None:
+            self._solid = np.pad(self.cells, 1, constant_values=True).ravel()
+        return self._solid
+
+    # Telusuri ray dari (x, y) searah vektor satuan (dx, dy) (semua array
+    # sebentuk) dan kembalikan jarak ke sel terisi pertama, dibatasi
+    # max_range. Ray yang dimulai di sel terisi berjarak 0. Ray diproses per
+    # blok supaya array kerja DDA tetap muat di cache.
+    def raycast(self, x, y, dx, dy, max_range, chunk=65536):
+        x, y, dx, dy = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (x, y, dx, dy)))
+        shape = x.shape
+        x, y, dx, dy = (a.ravel() for a in (x, y, dx, dy))
+        distance = np.empty(x.size)
+        for start in range(0, x.size, chunk):
+            block = slice(start, start + chunk)
+            distance[block] = self._traverse(x[block], y[block], dx[block], dy[block], max_range)
+        return distance.reshape(shape)
+
+    def _traverse(self, x, y, dx, dy, max_range):
+        solid = self.solid()
+        height, width = self.cells.shape
+        stride = width + 2
+        limit = max_range / self.resolution
+        distance = np.full(x.size, float(max_range))
+
+        # Posisi dalam satuan sel (grid berbingkai); next_* = jarak sepanjang
+        # ray ke batas sel x/y berikutnya, delta_* = jarak antar batas
+        gx = (x - self.origin[0]) / self.resolution + 1
+        gy = (y - self.origin[1]) / self.resolution + 1
+        col = np.clip(np.floor(gx), 0, width + 1).astype(np.intp)
+        row = np.clip(np.floor(gy), 0, height + 1).astype(np.intp)
+        flat = row * stride + col
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step_x = np.where(dx > 0, 1, -1)
+            step_y = np.where(dy > 0, stride, -stride)
+            delta_x = np.abs(1 / dx)
+            delta_y = np.abs(1 / dy)
+            next_x = np.where(dx != 0, (col + (dx > 0) - gx) / dx, np.inf)
+            next_y = np.where(dy != 0, (row + (dy > 0) - gy) / dy, np.inf)
+
+        start = solid[flat]
+        distance[start] = 0.0
+        active = np.flatnonzero(~start)
+        state = [a[active] for a in (flat, step_x, step_y, delta_x, delta_y, next_x, next_y)]
+
+        # Ray yang sudah berhenti dibekukan di tempat (next_* = inf, langkah
+        # 0) dan baru dibuang dari array kerja setelah cukup banyak, supaya
+        # pemadatan array tidak terjadi di setiap iterasi
+        done = np.zeros(active.size, dtype=bool)
+        finished = 0
+        while active.size:
+            flat, step_x, step_y, delta_x, delta_y, next_x, next_y = state
+            along_x = next_x < next_y
+            t = np.where(along_x, next_x, next_y)
+            flat += np.where(along_x, step_x, step_y)
+            np.add(next_x, delta_x, out=next_x, where=along_x)
+            np.add(next_y, delta_y, out=next_y, where=~along_x)
+
+            stop = solid[flat] | (t >= limit)
+            stop &= ~done
+            index = np.flatnonzero(stop)
+            if index.size == 0:
+                continue
+            distance[active[index]] = np.minimum(t[index], limit) * self.resolution
+            done[index] = True
+            next_x[index] = next_y[index] = np.inf
+            step_y[index] = 0
+            finished += index.size
+
+            if finished * 8 >= active.size:
+                keep = ~done
+                active = active[keep]
+                state = [a[keep] for a in state]
+                done = np.zeros(active.size, dtype=bool)
+                finished = 0
+        return distance
+
+    # Gambar grid ke axes matplotlib (sel terisi berwarna gelap)
+    def draw(self, ax, **kwargs):
+        kwargs.setdefault("cmap", "Greys")
+        return ax.imshow(self.cells, origin="lower", extent=self.extent, interpolation="nearest",
+                         vmin=0, vmax=1, **kwargs)
+
+
+# Sensor jarak dengan K beam pada sudut tetap relatif terhadap heading robot.
+# cos/sin sudut beam dihitung sekali; arah beam untuk heading theta didapat
+# dengan rumus penjumlahan sudut sehingga scan N robot hanya butuh N cos/sin.
+class RangeSensor:
+    def __init__(self, beams=36, fov=2 * np.pi, max_range=5.0):
+        if beams < 1:
+            raise ValueError("jumlah beam minimal 1")
+        if fov >= 2 * np.pi:
+            self.angles = np.linspace(-np.pi, np.pi, beams, endpoint=False)
+        else:
+            self.angles = np.linspace(-0.5 * fov, 0.5 * fov, beams)
+        self.max_range = float(max_range)
+        self._cos = np.cos(self.angles)
+        self._sin = np.sin(self.angles)
+
+    # Arah beam (N, K) untuk heading (N,)
+    def directions(self, theta):
+        c = np.cos(theta)[..., None]
+        s = np.sin(theta)[..., None]
+        return c * self._cos - s * self._sin, s * self._cos + c * self._sin
+
+    # Jarak (N, K) dari robot di (x, y, theta) ke rintangan terdekat
+    def scan(self, grid, x, y, theta):
+        x, y, theta = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (x, y, theta)))
+        dx, dy = self.directions(theta)
+        return grid.raycast(x[..., None], y[..., None], dx, dy, self.max_range)
+
+    # Titik ujung beam (N, K) di koordinat dunia, misalnya untuk digambar
+    def endpoints(self, x, y, theta, ranges):
+        dx, dy = self.directions(np.asarray(theta, dtype=float))
+        return np.asarray(x)[..., None] + ranges * dx, np.asarray(y)[..., None] + ranges * dy
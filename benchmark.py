@@ -0,0 +1,573 @@
+import argparse
+import os
+import time
+import numpy as np
+
+# Kumpulan benchmark headless. Jalankan misalnya:
+#   python benchmark.py fleet
+
+
+# Ukur waktu rata-rata satu pemanggilan fungsi (detik)
+def time_call(func, repeat=5, min_time=0.2):
+    func()
+    best = float("inf")
+    for _ in range(repeat):
+        count = 0
+        start = time.perf_counter()
+        while True:
+            func()
+            count += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time / repeat:
+                break
+        best = min(best, elapsed / count)
+    return best
+
+
+# Arena 20 x 20 m dengan rintangan acak; scan sensor jarak K beam untuk N
+# robot dalam satu pemanggilan raycast
+def bench_arena():
+    from arena import OccupancyGrid, RangeSensor
+
+    rng = np.random.default_rng(0)
+    grid = OccupancyGrid.from_extent((-10, 10, -10, 10), resolution=0.05)
+    grid.add_walls()
+    for _ in range(40):
+        cx, cy = rng.uniform(-9, 9, 2)
+        w, h = rng.uniform(0.1, 1.0, 2)
+        grid.add_box(cx - w, cx + w, cy - h, cy + h)
+
+    print(f"{'N':>6} {'K':>4} {'rays':>8} {'ms/scan':>9} {'Mrays/s':>8}")
+    for n, beams in ((1, 360), (100, 36), (100, 360), (1000, 360), (2778, 360)):
+        sensor = RangeSensor(beams, max_range=5.0)
+        x, y = rng.uniform(-9.5, 9.5, (2, n))
+        theta = rng.uniform(-np.pi, np.pi, n)
+        per_scan = time_call(lambda: sensor.scan(grid, x, y, theta), repeat=3, min_time=0.5)
+        print(f"{n:>6} {beams:>4} {n * beams:>8} {per_scan * 1e3:>9.2f} {n * beams / per_scan / 1e6:>8.2f}")
+
+
+# Loop tertutup armada: waktu per tick (controller + FleetSimulator.step)
+# untuk pure pursuit batch dibandingkan PathFollower per robot, beserta
+# robot yang sampai tujuan dan error lateral setelah 40 detik simulasi
+def bench_controller():
+    from controller import PurePursuitController
+    from fleet import FleetSimulator
+    from planner import PathFollower
+
+    rng = np.random.default_rng(0)
+    dt = 0.02
+    print(f"{'N':>6} {'loop us/tick':>13} {'batch us/tick':>14} {'speedup':>8} {'arrived':>8} {'p99 err m':>10}")
+    for n in (10, 100, 500, 1000):
+        paths = [np.cumsum(rng.uniform(-1.5, 1.5, (rng.integers(3, 12), 2)), axis=0) + rng.uniform(-20, 20, 2)
+                 for _ in range(n)]
+        x = np.array([path[0, 0] for path in paths])
+        y = np.array([path[0, 1] for path in paths])
+        theta = np.array([np.arctan2(path[1, 1] - path[0, 1], path[1, 0] - path[0, 0]) for path in paths])
+
+        def make_fleet():
+            return FleetSimulator(x, y, theta, 0.0, 0.05, 0.0, 0.05, 0.3)
+
+        # Waktu diukur pada 50 tick pertama dari state awal, saat semua
+        # robot masih berjalan
+        def loop_run():
+            fleet = make_fleet()
+            followers = [PathFollower(path, 0.05, 0.05, 0.3, speed=0.5, max_wheel_speed=20) for path in paths]
+            for _ in range(50):
+                commands = [follower.command(fleet.x[k], fleet.y[k], fleet.theta[k])
+                            for k, follower in enumerate(followers)]
+                left, right = np.array(commands).T
+                fleet.set_wheel_speeds(left, right)
+                fleet.step(dt)
+
+        def batch_run():
+            fleet = make_fleet()
+            controller = PurePursuitController(paths, fleet.left_radius, fleet.right_radius, fleet.body_radius,
+                                               speed=0.5, max_wheel_speed=20)
+            for _ in range(50):
+                controller.drive(fleet)
+                fleet.step(dt)
+
+        per_loop = time_call(loop_run, repeat=1, min_time=0.3) / 50
+        per_batch = time_call(batch_run, repeat=3, min_time=0.3) / 50
+
+        fleet = make_fleet()
+        controller = PurePursuitController(paths, fleet.left_radius, fleet.right_radius, fleet.body_radius,
+                                           speed=0.5, max_wheel_speed=20)
+        errors = []
+        for _ in range(int(40 / dt)):
+            controller.drive(fleet)
+            fleet.step(dt)
+            errors.append(controller.error.copy())
+        print(f"{n:>6} {per_loop * 1e6:>13.0f} {per_batch * 1e6:>14.0f} {per_loop / per_batch:>8.1f} "
+              f"{controller.done.sum():>8} {np.percentile(errors, 99):>10.3f}")
+
+
+# Deteksi tabrakan robot-robot dan robot-dinding per tick pada kepadatan
+# tetap (arena membesar dengan N); spatial hash dibandingkan pemeriksaan
+# semua pasangan O(N^2) (hanya sampai N = 5000)
+def bench_collision():
+    from collision import CollisionChecker
+
+    def brute_force(x, y, radius):
+        count = 0
+        for start in range(0, x.size, 1000):
+            dx = x[start:start + 1000, None] - x[None, :]
+            dy = y[start:start + 1000, None] - y[None, :]
+            reach = radius[start:start + 1000, None] + radius[None, :]
+            hit = dx * dx + dy * dy < reach * reach
+            count += np.triu(hit, start + 1).sum()
+        return count
+
+    rng = np.random.default_rng(0)
+    print(f"{'N':>6} {'pairs':>6} {'walls':>6} {'hash ms':>9} {'O(N^2) ms':>10} {'speedup':>8}")
+    for n in (100, 1000, 5000, 10000, 50000):
+        half = 0.6 * np.sqrt(n)
+        x = rng.uniform(-half, half, n)
+        y = rng.uniform(-half, half, n)
+        radius = rng.uniform(0.1, 0.25, n)
+        checker = CollisionChecker(bounds=(-half, half, -half, half))
+        (i, _, _), (walls, _, _) = checker.check(x, y, radius)
+        hashed = time_call(lambda: checker.check(x, y, radius), repeat=3)
+        if n <= 5000:
+            assert brute_force(x, y, radius) == len(i)
+            pairwise = time_call(lambda: brute_force(x, y, radius), repeat=1)
+            print(f"{n:>6} {len(i):>6} {len(walls):>6} {hashed * 1e3:>9.3f} {pairwise * 1e3:>10.2f} "
+                  f"{pairwise / hashed:>8.1f}")
+        else:
+            print(f"{n:>6} {len(i):>6} {len(walls):>6} {hashed * 1e3:>9.3f} {'-':>10} {'-':>8}")
+
+
+# Biaya per tick FleetSimulator.step untuk N robot
+def bench_fleet():
+    from fleet import FleetSimulator
+
+    rng = np.random.default_rng(0)
+    print(f"{'N':>8} {'us/tick':>10} {'ns/robot':>10}")
+    for n in (1, 10, 100, 1000, 10000, 100000):
+        fleet = FleetSimulator(rng.uniform(-10, 10, n), rng.uniform(-10, 10, n), rng.uniform(-np.pi, np.pi, n),
+                               rng.uniform(0, 5, n), 0.05, rng.uniform(0, 5, n), 0.05, 0.2)
+        per_tick = time_call(lambda: fleet.step(0.01))
+        print(f"{n:>8} {per_tick * 1e6:>10.2f} {per_tick * 1e9 / n:>10.2f}")
+
+
+# Error posisi terhadap lingkaran analitik dan biaya per detik simulasi
+# untuk setiap integrator (satu robot, v = 1, omega = 2, 10 detik simulasi)
+def bench_integrators():
+    from integrators import RK45
+    from simulation import RobotSimulation
+
+    v, omega, horizon = 1.0, 2.0, 10.0
+    radius = v / omega
+    candidates = [
+        ("euler", "euler"),
+        ("rk4", "rk4"),
+        ("rk45 rtol=1e-4", lambda: RK45(rtol=1e-4, atol=1e-7)),
+        ("rk45 rtol=1e-8", lambda: RK45(rtol=1e-8, atol=1e-11)),
+        ("exact", "exact"),
+    ]
+
+    print(f"{'integrator':<16} {'dt':>7} {'max err':>10} {'ms/sim-s':>10}")
+    for name, integrator in candidates:
+        for dt in (0.001, 0.01, 0.1):
+            steps = int(round(horizon / dt))
+
+            def run():
+                # Roda kiri diam dan roda kanan 2 m/s dengan body_radius 1 -> v = 1, omega = 2
+                sim = RobotSimulation(0.0, 1.0, 2.0, 1.0, 1.0,
+                                      integrator=integrator() if callable(integrator) else integrator)
+                return sim.run(dt, steps)
+
+            per_run = time_call(run, repeat=3, min_time=0.3)
+            t, xs, ys, _ = run()
+            error = np.hypot(xs - radius * np.sin(omega * t), ys - radius * (1 - np.cos(omega * t))).max()
+            print(f"{name:<16} {dt:>7g} {error:>10.2e} {per_run * 1e3 / horizon:>10.4f}")
+
+
+# Frame per detik renderer kamera langit-langit (dengan motion blur dan noise)
+def bench_camera():
+    from camera import PinholeCamera, CeilingCameraRenderer
+    from fleet import FleetSimulator
+
+    rng = np.random.default_rng(0)
+    print(f"{'resolution':>10} {'robots':>7} {'ms/frame':>10} {'fps':>8}")
+    for width, height in ((1280, 720), (1920, 1080)):
+        renderer = CeilingCameraRenderer(PinholeCamera(width, height, k1=-0.05), exposure=1 / 60, seed=0)
+        for n in (1, 50, 200):
+            fleet = FleetSimulator(rng.uniform(-2.5, 2.5, n), rng.uniform(-1.4, 1.4, n), rng.uniform(-np.pi, np.pi, n),
+                                   rng.uniform(0, 5, n), 0.05, rng.uniform(0, 5, n), 0.05, 0.1)
+            per_frame = time_call(lambda: renderer.render_simulation(fleet), repeat=3, min_time=0.5)
+            print(f"{width}x{height:<5} {n:>7} {per_frame * 1e3:>10.2f} {1 / per_frame:>8.1f}")
+
+
+# Frame per detik rasterizer footprint tag top-down (arena 16 x 9 m, tag 0.3 m)
+def bench_rasterizer():
+    from rasterizer import FootprintRasterizer
+
+    rng = np.random.default_rng(0)
+    print(f"{'resolution':>10} {'robots':>7} {'ms/frame':>10} {'fps':>8}")
+    for width, height in ((1280, 720), (1920, 1080), (3840, 2160)):
+        rasterizer = FootprintRasterizer(width, height, extent=(-8, 8, -4.5, 4.5), tag_size=0.3)
+        frame = np.empty((height, width), dtype=np.uint8)
+        for n in (1, 50, 200):
+            x, y = rng.uniform(-8, 8, n), rng.uniform(-4.5, 4.5, n)
+            theta = rng.uniform(-np.pi, np.pi, n)
+            per_frame = time_call(lambda: rasterizer.render(x, y, theta, out=frame))
+            print(f"{width}x{height:<5} {n:>7} {per_frame * 1e3:>10.3f} {1 / per_frame:>8.1f}")
+
+
+# Pose N robot pada grid (tidak saling tumpang tindih) di arena width x height meter
+def _grid_poses(n, width, height, rng):
+    cols = int(np.ceil(np.sqrt(n * width / height)))
+    rows = int(np.ceil(n / cols))
+    gx, gy = np.meshgrid((np.arange(cols) + 0.5) / cols - 0.5, (np.arange(rows) + 0.5) / rows - 0.5)
+    return gx.ravel()[:n] * width, gy.ravel()[:n] * height, rng.uniform(-np.pi, np.pi, n)
+
+
+# Waktu deteksi tag per frame kamera sintetis dan jumlah tag yang ditemukan
+def bench_detection():
+    from camera import PinholeCamera, CeilingCameraRenderer
+    from detection import TagDetector
+
+    rng = np.random.default_rng(0)
+    detector = TagDetector()
+    print(f"{'resolution':>10} {'robots':>7} {'found':>6} {'ms/frame':>10} {'fps':>8}")
+    for width, height in ((1280, 720), (1920, 1080)):
+        renderer = CeilingCameraRenderer(PinholeCamera(width, height, k1=-0.03), tag_size=0.2, seed=0)
+        for n in (1, 50, 200):
+            x, y, theta = _grid_poses(n, 5.0, 2.8, rng)
+            frame = renderer.render(x, y, theta, body_radius=min(0.15, 0.9 * 2.8 / np.sqrt(n) / 2))
+            found = len(detector.detect(frame))
+            per_frame = time_call(lambda: detector.detect(frame), repeat=3, min_time=0.5)
+            print(f"{width}x{height:<5} {n:>7} {found:>6} {per_frame * 1e3:>10.2f} {1 / per_frame:>8.1f}")
+
+
+# Frame uji dengan tepi anti-alias: dirender pada resolusi supersample kali
+# lebih besar lalu didesimasi; kembalikan (frame, sudut tag sebenarnya
+# (N, 4, 2) dalam piksel)
+def _antialiased_frame(width, height, x, y, theta, tag_size=0.2, supersample=2, noise=2.0, seed=0):
+    from camera import PinholeCamera, CeilingCameraRenderer
+    from detection import TAG_SPAN
+    from localizer import decimate
+    from tags import TAG_CELLS
+
+    camera = PinholeCamera(width, height, k1=-0.03)
+    k = supersample
+    large = PinholeCamera(width * k, height * k, fx=camera.fx * k, fy=camera.fy * k,
+                          cx=(camera.cx + 0.5) * k - 0.5, cy=(camera.cy + 0.5) * k - 0.5, k1=camera.k1)
+    renderer = CeilingCameraRenderer(large, tag_size=tag_size, noise=0)
+    frame = decimate(renderer.render(x, y, theta, body_radius=0.15), k)
+    rng = np.random.default_rng(seed)
+    frame = np.clip(frame + rng.normal(0, noise, frame.shape), 0, 255).astype(np.uint8)
+
+    half = tag_size * TAG_SPAN / TAG_CELLS / 2
+    local = np.array([[-half, half], [half, half], [half, -half], [-half, -half]])
+    c, s = np.cos(theta)[:, None], np.sin(theta)[:, None]
+    u, v = camera.project(x[:, None] + c * local[:, 0] - s * local[:, 1],
+                          y[:, None] + s * local[:, 0] + c * local[:, 1], renderer.robot_height)
+    return frame, np.stack((u, v), axis=-1)
+
+
+# Kecepatan vs akurasi sub-piksel lokalisasi piramida pada frame 4K
+# dibanding pencarian resolusi penuh
+def bench_pyramid():
+    from detection import TagDetector
+    from localizer import PyramidLocalizer
+
+    rng = np.random.default_rng(0)
+    x, y, theta = _grid_poses(50, 5.0, 2.8, rng)
+    frame, truth = _antialiased_frame(3840, 2160, x, y, theta)
+
+    methods = [("full", TagDetector())] + [(f"pyramid /{f}", PyramidLocalizer(f)) for f in (1, 2, 4, 8)]
+    print(f"{'method':<11} {'found':>6} {'ms/frame':>10} {'mean err':>9} {'p95 err':>9}")
+    for name, detector in methods:
+        detections = detector.detect(frame)
+        per_frame = time_call(lambda: detector.detect(frame), repeat=3, min_time=1.0)
+        error = np.concatenate([np.hypot(*(d.corners - truth[d.tag_id]).T) for d in detections])
+        print(f"{name:<11} {len(detections):>6} {per_frame * 1e3:>10.1f} {error.mean():>9.3f} "
+              f"{np.percentile(error, 95):>9.3f}")
+
+
+# Kerja piksel dan waktu per frame pelacakan ber-ROI dibanding deteksi
+# penuh setiap frame, untuk armada yang bergerak lambat (1080p, 30 FPS)
+def bench_tracking():
+    from camera import PinholeCamera, CeilingCameraRenderer
+    from detection import TagDetector
+    from fleet import FleetSimulator
+    from tracking import TagTracker
+
+    rng = np.random.default_rng(0)
+    renderer = CeilingCameraRenderer(PinholeCamera(1920, 1080, k1=-0.03), tag_size=0.2, seed=0)
+    detector = TagDetector()
+    fps, count = 30.0, 90
+    print(f"{'robots':>7} {'found':>6} {'tracked':>8} {'px full':>9} {'px gated':>9} {'ratio':>6} "
+          f"{'ms full':>8} {'ms gated':>9}")
+    for n in (1, 10, 50):
+        x, y, theta = _grid_poses(n, 5.0, 2.8, rng)
+        fleet = FleetSimulator(x, y, theta, rng.uniform(0, 4, n), 0.05, rng.uniform(0, 4, n), 0.05, 0.15)
+        frames = []
+        for _ in range(count):
+            frames.append((fleet.t, renderer.render_simulation(fleet)))
+            fleet.step(1 / fps)
+
+        tracker = TagTracker(detector)
+        found = tracked = pixels = 0
+        full_time = gated_time = 0.0
+        for t, frame in frames:
+            start = time.perf_counter()
+            found += len(detector.detect(frame))
+            middle = time.perf_counter()
+            tracked += len(tracker.update(frame, t))
+            full_time += middle - start
+            gated_time += time.perf_counter() - middle
+            pixels += tracker.pixels
+
+        full_pixels = frames[0][1].size
+        print(f"{n:>7} {found / count:>6.1f} {tracked / count:>8.1f} {full_pixels:>9} {pixels // count:>9} "
+              f"{full_pixels * count / pixels:>6.1f} {full_time * 1e3 / count:>8.1f} {gated_time * 1e3 / count:>9.1f}")
+
+
+# Skala eksekutor tile (deteksi tag di frame 4K sintetis) terhadap jumlah
+# worker, untuk thread pool dan process pool dengan shared memory
+def bench_tiles():
+    from camera import PinholeCamera, CeilingCameraRenderer
+    from detection import TagDetector
+    from tiles import TiledExecutor
+
+    rng = np.random.default_rng(0)
+    x, y, theta = _grid_poses(120, 5.2, 2.9, rng)
+    frame = CeilingCameraRenderer(PinholeCamera(3840, 2160, k1=-0.03), tag_size=0.15, seed=0).render(
+        x, y, theta, body_radius=0.1)
+    detector = TagDetector()
+    single = time_call(lambda: detector.detect(frame), repeat=2, min_time=1.0)
+    print(f"cpu_count={os.cpu_count()}, untiled single thread {single * 1e3:.1f} ms/frame, "
+          f"{len(detector.detect(frame))} tags")
+
+    print(f"{'mode':<8} {'workers':>7} {'found':>6} {'ms/frame':>10} {'speedup':>8}")
+    for mode in ("thread", "process"):
+        for workers in (1, 2, 4, 8, 16):
+            with TiledExecutor(tile_size=512, overlap=96, workers=workers, mode=mode) as executor:
+                found = len(executor.run(frame))
+                per_frame = time_call(lambda: executor.run(frame), repeat=2, min_time=1.0)
+            print(f"{mode:<8} {workers:>7} {found:>6} {per_frame * 1e3:>10.1f} {single / per_frame:>8.2f}")
+
+
+def _pipeline_detect(pipeline):
+    from pipeline import DetectStage
+
+    pipeline.serve("detect", DetectStage())
+
+
+def _queue_echo(inbox, outbox):
+    while True:
+        frame = inbox.get()
+        if frame is None:
+            break
+        outbox.put(frame)
+
+
+def bench_pipeline():
+    import multiprocessing
+    import queue
+    import threading
+    from camera import PinholeCamera, CeilingCameraRenderer
+    from pipeline import FramePipeline
+
+    camera = PinholeCamera(1920, 1080)
+    rng = np.random.default_rng(0)
+    x, y, theta = _grid_poses(20, 3.0, 1.6, rng)
+    frame = CeilingCameraRenderer(camera, tag_size=0.2, seed=0).render(x, y, theta)
+
+    # Satu hop antar proses: array disalin lewat multiprocessing.Queue
+    # dibandingkan indeks slot lewat ring shared memory
+    inbox, outbox = multiprocessing.Queue(), multiprocessing.Queue()
+    echo = multiprocessing.Process(target=_queue_echo, args=(inbox, outbox))
+    echo.start()
+    copied = time_call(lambda: (inbox.put(frame), outbox.get()), repeat=3, min_time=0.5)
+    inbox.put(None)
+    echo.join()
+
+    pipeline = FramePipeline(frame.shape, slots=4, stages=("view",))
+
+    def hop():
+        pipeline.publish(pipeline.acquire())
+        pipeline.forward("view", pipeline.receive("view"))
+
+    indexed = time_call(hop, repeat=3, min_time=0.5)
+    pipeline.close()
+    print(f"1080p hop: Queue (copy) {copied * 1e3:.2f} ms, shared ring (index) {indexed * 1e6:.1f} us")
+
+    # Capture 60 fps -> deteksi (proses) -> tampilan (thread utama)
+    print(f"{'policy':<12} {'published':>9} {'dropped':>8} {'shown':>6} {'latency ms':>11} {'last seq':>9}")
+    for policy in ("drop-oldest", "block"):
+        pipeline = FramePipeline(frame.shape, slots=4, policy=policy)
+        detector = multiprocessing.Process(target=_pipeline_detect, args=(pipeline,))
+        detector.start()
+
+        def capture():
+            for _ in range(120):
+                index = pipeline.acquire()
+                pipeline.ring.frame(index)[...] = frame
+                pipeline.publish(index)
+                time.sleep(1 / 60)
+
+        source = threading.Thread(target=capture)
+        source.start()
+        latency = []
+        last = -1
+        while source.is_alive() or pipeline.completed + pipeline.dropped < pipeline.published:
+            try:
+                index = pipeline.receive("view", timeout=0.1)
+            except queue.Empty:
+                continue
+            latency.append(time.perf_counter() - pipeline.ring.timestamp(index))
+            last = pipeline.ring.sequence(index)
+            pipeline.forward("view", index)
+        source.join()
+        pipeline.stop()
+        detector.join()
+        print(f"{policy:<12} {pipeline.published:>9} {pipeline.dropped:>8} {pipeline.completed:>6} "
+              f"{np.mean(latency) * 1e3:>11.1f} {last:>9}")
+        pipeline.close()
+
+
+# Perencanaan jalur 200 robot ke 4 stasiun di arena 20 x 20 m (grid 5 cm):
+# distance field per tujuan dari cache LRU dibandingkan satu ekspansi
+# wavefront per robot
+def bench_planner():
+    from arena import OccupancyGrid
+    from planner import GridPlanner, segment_cells
+
+    rng = np.random.default_rng(0)
+    grid = OccupancyGrid.from_extent((-10, 10, -10, 10), resolution=0.05)
+    grid.add_walls()
+    for _ in range(25):
+        cx, cy = rng.uniform(-8, 8, 2)
+        w, h = rng.uniform(0.2, 1.0, 2)
+        grid.add_box(cx - w, cx + w, cy - h, cy + h)
+    stations = [(-9.0, -9.0), (9.0, -9.0), (-9.0, 9.0), (9.0, 9.0)]
+    for x, y in stations:
+        grid.add_box(x - 0.5, x + 0.5, y - 0.5, y + 0.5, value=False)
+
+    planner = GridPlanner(grid, clearance=0.2, cache_size=len(stations))
+    n = 200
+    starts = rng.uniform(-9, 9, (4 * n, 2))
+    rows, cols = grid.world_to_cell(starts[:, 0], starts[:, 1])
+    starts = starts[planner.free[rows, cols]][:n]
+    goals = rng.integers(len(stations), size=n)
+
+    def cached():
+        return [path for goal in range(len(stations))
+                for path in planner.plan_many(starts[goals == goal], stations[goal])]
+
+    paths = [path for path in cached() if path is not None]
+    found = len(paths)
+
+    # Setiap segmen jalur hasil shortcut harus tetap di sel bebas (termasuk
+    # sel yang hanya tersentuh di sudutnya)
+    for path in paths:
+        for a, b in zip(path[:-1], path[1:]):
+            rows, cols = segment_cells(a, b, grid)
+            assert planner.free[rows, cols].all()
+
+    print(f"grid {grid.shape[1]}x{grid.shape[0]}, {found}/{n} robots reachable, "
+          f"cache hits {planner.hits} misses {planner.misses}")
+
+    # Tanpa cache setiap robot mengekspansi wavefront sendiri; diukur pada
+    # 10 robot lalu diskalakan
+    def uncached():
+        for k in range(10):
+            planner.clear_cache()
+            planner.plan(starts[k], stations[goals[k]])
+
+    per_cached = time_call(cached, repeat=3, min_time=0.5)
+    per_uncached = time_call(uncached, repeat=1, min_time=0.1) * n / 10
+    print(f"{n} robots: wavefront per robot {per_uncached * 1e3:.0f} ms, cached fields {per_cached * 1e3:.1f} ms "
+          f"({per_uncached / per_cached:.1f}x)")
+
+
+# Waktu per frame (update + gambar ulang artist, seperti blitting) untuk
+# armada N robot: artist baru per robot setiap frame dibandingkan
+# FleetRenderer dengan satu PathCollection dan satu LineCollection
+def bench_renderer():
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from fleet import FleetSimulator
+    from renderer import FleetRenderer
+
+    rng = np.random.default_rng(0)
+    trail = 100
+    print(f"{'N':>6} {'per-robot ms':>13} {'artists':>8} {'fleet ms':>9} {'artists':>8} {'speedup':>8}")
+    for n in (10, 100, 1000):
+        fleet = FleetSimulator(rng.uniform(-8, 8, n), rng.uniform(-8, 8, n), rng.uniform(-np.pi, np.pi, n),
+                               rng.uniform(1, 5, n), 0.05, rng.uniform(1, 5, n), 0.05, 0.2)
+        fig, ax = plt.subplots()
+        ax.set_xlim(-10, 10)
+        ax.set_ylim(-10, 10)
+        fig.canvas.draw()
+
+        history = np.empty((trail, 2, n))
+        for k in range(trail):
+            fleet.step(0.05)
+            history[k] = fleet.x, fleet.y
+        artists = []
+
+        def per_robot():
+            fleet.step(0.05)
+            for artist in artists:
+                artist.remove()
+            artists.clear()
+            for i in range(n):
+                artists.extend(ax.plot(history[:, 0, i], history[:, 1, i], 'b-', animated=True))
+                artists.extend(ax.plot(fleet.x[i], fleet.y[i], 'bo', animated=True))
+            for artist in artists:
+                ax.draw_artist(artist)
+
+        naive = time_call(per_robot, repeat=1, min_time=0.5)
+        naive_artists = len(artists)
+        for artist in artists:
+            artist.remove()
+
+        renderer = FleetRenderer(ax, fleet.x, fleet.y, fleet.theta, trail=trail)
+        for _ in range(trail):
+            fleet.step(0.05)
+            renderer.update(fleet.x, fleet.y, fleet.theta)
+
+        def single():
+            fleet.step(0.05)
+            for artist in renderer.update(fleet.x, fleet.y, fleet.theta):
+                ax.draw_artist(artist)
+
+        batched = time_call(single, repeat=3, min_time=0.5)
+        print(f"{n:>6} {naive * 1e3:>13.2f} {naive_artists:>8} {batched * 1e3:>9.2f} {len(renderer.artists):>8} "
+              f"{naive / batched:>8.1f}")
+        plt.close(fig)
+
+
+BENCHMARKS = {
+    "arena": bench_arena,
+    "camera": bench_camera,
+    "collision": bench_collision,
+    "controller": bench_controller,
+    "detection": bench_detection,
+    "fleet": bench_fleet,
+    "integrators": bench_integrators,
+    "pipeline": bench_pipeline,
+    "planner": bench_planner,
+    "pyramid": bench_pyramid,
+    "rasterizer": bench_rasterizer,
+    "renderer": bench_renderer,
+    "tiles": bench_tiles,
+    "tracking": bench_tracking,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark simulasi differential drive")
+    parser.add_argument("names", nargs="*", choices=sorted(BENCHMARKS), help="benchmark yang dijalankan (default: semua)")
+    args = parser.parse_args()
+
+    for name in args.names or sorted(BENCHMARKS):
+        print(f"== {name}")
+        BENCHMARKS[name]()
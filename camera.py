@@ -0,0 +1,206 @@
+import time
+import numpy as np
+from kinematics import trajectory
+from tags import FAMILY_SIZE, TAG_CELLS, tag_texture
+
+# Kamera langit-langit sintetis: kamera pinhole menghadap lurus ke bawah di
+# atas arena, dengan distorsi radial (model Brown k1, k2), noise sensor dan
+# motion blur. Setiap robot membawa tag (lihat tags.py) di atas body-nya.
+#
+# Konvensi sumbu: kolom gambar bertambah searah +X dunia dan baris bertambah
+# searah -Y dunia, sehingga gambar terlihat seperti peta biasa (Y ke atas).
+# Piksel (0, 0) adalah pusat piksel kiri atas.
+
+
+class PinholeCamera:
+    def __init__(self, width=1280, height=720, fx=None, fy=None, cx=None, cy=None, k1=0.0, k2=0.0,
+                 mount_height=3.0, position=(0.0, 0.0), fov=90.0):
+        if width <= 0 or height <= 0:
+            raise ValueError("resolusi kamera harus positif")
+        if mount_height <= 0:
+            raise ValueError("tinggi kamera harus positif")
+
+        self.width = int(width)
+        self.height = int(height)
+
+        # Bila fx tidak diberikan, dihitung dari field of view horizontal (derajat)
+        self.fx = float(fx) if fx is not None else 0.5 * width / np.tan(np.radians(fov) / 2)
+        self.fy = float(fy) if fy is not None else self.fx
+        self.cx = float(cx) if cx is not None else (width - 1) / 2
+        self.cy = float(cy) if cy is not None else (height - 1) / 2
+        self.k1 = float(k1)
+        self.k2 = float(k2)
+
+        # Posisi kamera di dunia: (X, Y) di atas lantai pada ketinggian mount_height
+        self.mount_height = float(mount_height)
+        self.position = (float(position[0]), float(position[1]))
+        self._rays = None
+
+    @property
+    def shape(self):
+        return self.height, self.width
+
+    # Faktor distorsi radial untuk koordinat ternormalisasi
+    def _distortion(self, xn, yn):
+        r2 = xn * xn + yn * yn
+        return 1 + r2 * (self.k1 + self.k2 * r2)
+
+    # Proyeksi titik dunia (X, Y, Z) ke piksel (u, v)
+    def project(self, x, y, z=0.0):
+        depth = self.mount_height - np.asarray(z, dtype=float)
+        xn = (np.asarray(x, dtype=float) - self.position[0]) / depth
+        yn = (self.position[1] - np.asarray(y, dtype=float)) / depth
+        d = self._distortion(xn, yn)
+        return self.fx * xn * d + self.cx, self.fy * yn * d + self.cy
+
+    # Koordinat ternormalisasi tanpa distorsi (xn, yn) untuk setiap piksel,
+    # dihitung sekali lewat iterasi titik tetap lalu disimpan. Dengan peta
+    # ini titik lantai pada ketinggian mana pun untuk setiap piksel cukup
+    # satu perkalian (lihat floor_coordinates).
+    def rays(self):
+        if self._rays is None:
+            u = (np.arange(self.width) - self.cx) / self.fx
+            v = (np.arange(self.height) - self.cy) / self.fy
+            xd, yd = np.meshgrid(u, v)
+            xn, yn = xd.copy(), yd.copy()
+            if self.k1 or self.k2:
+                for _ in range(20):
+                    d = self._distortion(xn, yn)
+                    xn = xd / d
+                    yn = yd / d
+            self._rays = (xn.astype(np.float32), yn.astype(np.float32))
+        return self._rays
+
+    # Koordinat dunia (X, Y) pada ketinggian z untuk jendela piksel
+    # [row0:row1, col0:col1]
+    def floor_coordinates(self, z=0.0, rows=slice(None), cols=slice(None)):
+        xn, yn = self.rays()
+        depth = self.mount_height - z
+        return self.position[0] + xn[rows, cols] * depth, self.position[1] - yn[rows, cols] * depth
+
+
+# Renderer frame grayscale (uint8) dari pose robot. Setiap robot digambar
+# sebagai body berbentuk lingkaran dengan tag persegi di atasnya, keduanya
+# pada bidang z = robot_height.
+class CeilingCameraRenderer:
+    def __init__(self, camera, tag_size=0.15, robot_height=0.1, floor_level=0.6, body_level=0.3,
+                 noise=2.0, exposure=0.0, blur_samples=5, seed=None):
+        self.camera = camera
+        self.tag_size = float(tag_size)
+        self.robot_height = float(robot_height)
+        self.floor_level = float(floor_level)
+        self.body_level = float(body_level)
+
+        # Simpangan baku noise Gaussian dalam skala 0..255
+        self.noise = float(noise)
+
+        # Lama exposure (detik); motion blur dirata-ratakan dari
+        # blur_samples pose di sepanjang gerak robot selama exposure
+        self.exposure = float(exposure)
+        self.blur_samples = max(1, int(blur_samples))
+
+        self.rng = np.random.default_rng(seed)
+        self.background = np.full(camera.shape, self.floor_level, dtype=np.float32)
+        self._textures = {}
+
+    def texture(self, tag_id):
+        if tag_id not in self._textures:
+            self._textures[tag_id] = tag_texture(tag_id)
+        return self._textures[tag_id]
+
+    # Pose sub-frame untuk motion blur (kecepatan konstan selama exposure)
+    def _subframe_poses(self, x, y, theta, v, omega):
+        if self.exposure <= 0 or self.blur_samples == 1:
+            return x[None], y[None], theta[None]
+        offsets = np.linspace(-0.5, 0.5, self.blur_samples)[:, None] * self.exposure
+        return trajectory(x[None], y[None], theta[None], v[None], omega[None], offsets)
+
+    # Kotak piksel (row0, row1, col0, col1) yang memuat robot di semua pose
+    # sub-frame, atau None bila di luar gambar
+    def _bounds(self, xs, ys, radius):
+        corners = np.array([[-1, -1], [-1, 0], [-1, 1], [0, -1], [0, 1], [1, -1], [1, 0], [1, 1]]) * radius
+        u, v = self.camera.project(xs[:, None] + corners[:, 0], ys[:, None] + corners[:, 1], self.robot_height)
+        col0 = max(int(np.floor(u.min())) - 1, 0)
+        col1 = min(int(np.ceil(u.max())) + 2, self.camera.width)
+        row0 = max(int(np.floor(v.min())) - 1, 0)
+        row1 = min(int(np.ceil(v.max())) + 2, self.camera.height)
+        if col0 >= col1 or row0 >= row1:
+            return None
+        return row0, row1, col0, col1
+
+    # Gambar satu robot pada pose (x, y, theta) ke patch (koordinat dunia
+    # piksel patch di X, Y)
+    def _draw(self, patch, X, Y, x, y, theta, body_radius, texture):
+        dx = X - x
+        dy = Y - y
+        patch[dx * dx + dy * dy <= body_radius * body_radius] = self.body_level
+
+        # Koordinat lokal tag: u searah hadap robot, w ke kiri robot
+        c, s = np.cos(theta), np.sin(theta)
+        u = (c * dx + s * dy) / self.tag_size + 0.5
+        w = 0.5 - (c * dy - s * dx) / self.tag_size
+        inside = (u >= 0) & (u < 1) & (w >= 0) & (w < 1)
+        cols = (u[inside] * TAG_CELLS).astype(np.intp)
+        rows = (w[inside] * TAG_CELLS).astype(np.intp)
+        patch[inside] = texture[rows, cols]
+
+    def render(self, x, y, theta, v=0.0, omega=0.0, body_radius=0.2, tag_ids=None):
+        x, y, theta, v, omega, body_radius = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(a, dtype=float)) for a in (x, y, theta, v, omega, body_radius)))
+        if tag_ids is None:
+            tag_ids = np.arange(x.size) % FAMILY_SIZE
+
+        frame = self.background.copy()
+        xs, ys, thetas = self._subframe_poses(x, y, theta, v, omega)
+        for i in range(x.size):
+            radius = max(body_radius[i], self.tag_size * np.sqrt(0.5))
+            bounds = self._bounds(xs[:, i], ys[:, i], radius)
+            if bounds is None:
+                continue
+
+            row0, row1, col0, col1 = bounds
+            X, Y = self.camera.floor_coordinates(self.robot_height, slice(row0, row1), slice(col0, col1))
+            texture = self.texture(int(tag_ids[i]))
+
+            # Rata-rata sub-frame; robot yang saling tumpang tindih ditimpa
+            # robot berikutnya
+            window = frame[row0:row1, col0:col1]
+            accumulated = np.zeros_like(window)
+            for j in range(xs.shape[0]):
+                patch = window.copy()
+                self._draw(patch, X, Y, xs[j, i], ys[j, i], thetas[j, i], body_radius[i], texture)
+                accumulated += patch
+            window[...] = accumulated / xs.shape[0]
+
+        frame *= 255
+        if self.noise > 0:
+            frame += self.rng.standard_normal(frame.shape, dtype=np.float32) * self.noise
+        return np.clip(frame, 0, 255, out=frame).astype(np.uint8)
+
+    # Render pose simulasi saat ini (FleetSimulator atau RobotSimulation)
+    def render_simulation(self, sim, tag_ids=None):
+        return self.render(sim.x, sim.y, sim.theta, sim.v, sim.omega, sim.body_radius, tag_ids)
+
+
+# Generator frame pada FPS target. Setiap frame simulasi dimajukan 1/fps
+# detik (dalam `substeps` langkah) lalu dirender; yield (t, frame). Dengan
+# realtime=True generator menunggu sampai jadwal frame berikutnya seperti
+# kamera sungguhan.
+def stream(renderer, sim, fps=30.0, duration=None, realtime=False, substeps=1, tag_ids=None):
+    if fps <= 0:
+        raise ValueError("fps harus positif")
+
+    dt = 1.0 / fps
+    count = None if duration is None else int(round(duration * fps))
+    start = time.perf_counter()
+    index = 0
+    while count is None or index < count:
+        if index > 0:
+            for _ in range(substeps):
+                sim.step(dt / substeps)
+        if realtime:
+            delay = start + index * dt - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        yield sim.t, renderer.render_simulation(sim, tag_ids)
+        index += 1
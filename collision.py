@@ -0,0 +1,151 @@
+import numpy as np
+
+# Deteksi tabrakan armada (body robot = lingkaran berjari-jari body_radius)
+# dengan spatial hash grid seragam yang dibangun ulang setiap tick. Sel
+# berukuran paling sedikit diameter body terbesar, jadi dua robot yang
+# bersentuhan selalu berada di sel yang sama atau bertetangga. Robot diurutkan
+# menurut kunci sel, lalu setiap robot hanya dibandingkan dengan robot di
+# selnya sendiri dan di 4 sel tetangga "maju" (setengah lingkungan 3x3),
+# sehingga setiap pasangan kandidat muncul tepat sekali. Semua langkah
+# berupa operasi array; biaya ~O(N log N) untuk kepadatan yang wajar.
+
+# Sisi dinding arena untuk wall_contacts
+WALLS = ("left", "right", "bottom", "top")
+
+
+class SpatialHash:
+    def __init__(self, cell_size):
+        if cell_size <= 0:
+            raise ValueError("ukuran sel harus lebih besar dari 0")
+        self.cell_size = float(cell_size)
+
+    # Bangun ulang grid dari posisi (N,)
+    def build(self, x, y):
+        cx = np.floor(np.asarray(x, dtype=float) / self.cell_size).astype(np.int64)
+        cy = np.floor(np.asarray(y, dtype=float) / self.cell_size).astype(np.int64)
+        n = cx.size
+        if n == 0:
+            self.order = np.empty(0, dtype=np.intp)
+            self.keys = np.empty(0, dtype=np.int64)
+            self.cells = self.starts = self.counts = np.empty(0, dtype=np.int64)
+            self.stride = 1
+            return self
+
+        # Kunci sel: kolom sel dikali stride ditambah baris sel; baris diberi
+        # cadangan satu sel di kedua sisi supaya tetangga tidak melompat ke
+        # kolom lain
+        cx -= cx.min()
+        cy -= cy.min() - 1
+        self.stride = int(cy.max()) + 2
+        keys = cx * self.stride + cy
+
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+        self.cells, self.starts, self.counts = np.unique(self.keys, return_index=True, return_counts=True)
+        return self
+
+    # Pasangan kandidat (i, j) dengan i != j di sel yang sama atau
+    # bertetangga, dalam indeks asli; setiap pasangan tepat sekali
+    def candidates(self):
+        n = self.keys.size
+        rank = np.arange(n)
+        cell_of = np.repeat(np.arange(self.cells.size), self.counts)
+        firsts, seconds = [], []
+
+        # Sel sendiri: hanya robot sesudahnya dalam urutan terurut
+        begin = rank + 1
+        count = self.starts[cell_of] + self.counts[cell_of] - begin
+        firsts.append(np.repeat(rank, count))
+        seconds.append(_expand(begin, count))
+
+        for offset in (1, self.stride - 1, self.stride, self.stride + 1):
+            target = self.keys + offset
+            slot = np.minimum(np.searchsorted(self.cells, target), self.cells.size - 1)
+            found = self.cells[slot] == target
+            count = np.where(found, self.counts[slot], 0)
+            firsts.append(np.repeat(rank, count))
+            seconds.append(_expand(self.starts[slot], count))
+
+        first = np.concatenate(firsts)
+        second = np.concatenate(seconds)
+        return self.order[first], self.order[second]
+
+
+# Untuk setiap k, deret begin[k], begin[k] + 1, ..., begin[k] + count[k] - 1
+# digabung menjadi satu array
+def _expand(begin, count):
+    total = int(count.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.intp)
+    ends = np.cumsum(count)
+    return np.arange(total) + np.repeat(begin - (ends - count), count)
+
+
+# Pasangan robot yang body-nya tumpang tindih: (i, j, depth) dengan i < j dan
+# depth = radius_i + radius_j - jarak pusat (> 0)
+def robot_contacts(x, y, radius, cell_size=None):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    radius = np.broadcast_to(np.asarray(radius, dtype=float), x.shape)
+    if x.size < 2:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty, np.empty(0)
+    if cell_size is None:
+        cell_size = 2 * radius.max()
+    if cell_size <= 0:
+        raise ValueError("body_radius harus lebih besar dari 0")
+
+    i, j = SpatialHash(cell_size).build(x, y).candidates()
+    dx = x[j] - x[i]
+    dy = y[j] - y[i]
+    reach = radius[i] + radius[j]
+    hit = dx * dx + dy * dy < reach * reach
+    i, j = i[hit], j[hit]
+    depth = reach[hit] - np.hypot(dx[hit], dy[hit])
+
+    swap = i > j
+    i, j = np.where(swap, j, i), np.where(swap, i, j)
+    order = np.lexsort((j, i))
+    return i[order], j[order], depth[order]
+
+
+# Robot yang menyentuh dinding arena persegi bounds = (xmin, xmax, ymin, ymax):
+# (index, side, depth) dengan side indeks ke WALLS dan depth penetrasi (> 0)
+def wall_contacts(x, y, radius, bounds):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    radius = np.broadcast_to(np.asarray(radius, dtype=float), x.shape)
+    xmin, xmax, ymin, ymax = bounds
+    penetration = np.stack((xmin - (x - radius), (x + radius) - xmax,
+                            ymin - (y - radius), (y + radius) - ymax), axis=1)
+    index, side = np.nonzero(penetration > 0)
+    return index, side, penetration[index, side]
+
+
+# Pemeriksa tabrakan untuk FleetSimulator; hasil tick terakhir disimpan di
+# atribut pairs (i, j, depth) dan walls (index, side, depth)
+class CollisionChecker:
+    def __init__(self, bounds=None, cell_size=None):
+        self.bounds = bounds
+        self.cell_size = cell_size
+        self.pairs = None
+        self.walls = None
+
+    def check(self, x, y, radius):
+        self.pairs = robot_contacts(x, y, radius, self.cell_size)
+        if self.bounds is not None:
+            self.walls = wall_contacts(x, y, radius, self.bounds)
+        return self.pairs, self.walls
+
+    def check_fleet(self, fleet):
+        return self.check(fleet.x, fleet.y, fleet.body_radius)
+
+    # Mask (N,) robot yang sedang bertabrakan (dengan robot lain atau dinding)
+    def colliding(self, n):
+        mask = np.zeros(n, dtype=bool)
+        if self.pairs is not None:
+            mask[self.pairs[0]] = True
+            mask[self.pairs[1]] = True
+        if self.walls is not None:
+            mask[self.walls[0]] = True
+        return mask
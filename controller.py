@@ -0,0 +1,146 @@
+import numpy as np
+from kinematics import unicycle_to_wheels
+
+# Controller pure pursuit untuk seluruh armada sekaligus. Jalur referensi N
+# robot disimpan sebagai satu array (N, M, 2) yang dipad dengan titik
+# terakhir masing-masing jalur (segmen padding berpanjang 0), beserta
+# panjang busur kumulatifnya. Setiap tick:
+#   1. proyeksi pose ke jalur dicari hanya di `window` segmen mulai dari
+#      indeks progres robot, dan indeks progres tidak pernah mundur (jalur
+#      yang bersilangan tidak membuat robot melompat ke bagian lain)
+#   2. titik sasaran = titik di jalur sejauh `lookahead` (panjang busur)
+#      setelah proyeksi
+#   3. kelengkungan pure pursuit 2*y_lokal / jarak^2 ke titik sasaran,
+#      omega = v * kelengkungan, lalu dikonversi ke kecepatan roda
+# Semua langkah berupa operasi array (N, window) atau (N, M).
+
+
+# Gabungkan jalur (masing-masing (M_i, 2)) menjadi array (N, M, 2) yang
+# dipad dengan titik terakhirnya; kembalikan (padded, panjang asli)
+def pad_paths(paths, length=None):
+    paths = [np.asarray(path, dtype=float).reshape(-1, 2) for path in paths]
+    if any(len(path) == 0 for path in paths):
+        raise ValueError("jalur tidak boleh kosong")
+    lengths = np.array([len(path) for path in paths])
+    size = max(int(lengths.max()), 2) if length is None else length
+    if size < lengths.max():
+        raise ValueError("length lebih pendek dari jalur terpanjang")
+    padded = np.empty((len(paths), size, 2))
+    for k, path in enumerate(paths):
+        padded[k, :len(path)] = path
+        padded[k, len(path):] = path[-1]
+    return padded, lengths
+
+
+class PurePursuitController:
+    def __init__(self, paths, left_radius, right_radius, body_radius, lookahead=0.4, speed=0.5,
+                 slowdown=0.5, tolerance=0.05, max_wheel_speed=None, window=8):
+        if isinstance(paths, np.ndarray) and paths.ndim == 3:
+            self.paths = np.asarray(paths, dtype=float)
+        else:
+            self.paths = pad_paths(paths)[0]
+        n = len(self.paths)
+        self.left_radius = np.broadcast_to(np.asarray(left_radius, dtype=float), (n,))
+        self.right_radius = np.broadcast_to(np.asarray(right_radius, dtype=float), (n,))
+        self.body_radius = np.broadcast_to(np.asarray(body_radius, dtype=float), (n,))
+        self.lookahead = lookahead
+        self.speed = speed
+        self.slowdown = slowdown      # jarak (meter) sebelum tujuan mulai diperlambat
+        self.tolerance = tolerance
+        self.max_wheel_speed = max_wheel_speed
+        self.window = window
+
+        # Segmen jalur: titik awal, vektor, panjang, dan panjang busur
+        # kumulatif di setiap titik
+        self._start = self.paths[:, :-1]
+        self._edge = np.diff(self.paths, axis=1)
+        self._length = np.hypot(self._edge[..., 0], self._edge[..., 1])
+        self._arc = np.concatenate((np.zeros((n, 1)), np.cumsum(self._length, axis=1)), axis=1)
+        self.total = self._arc[:, -1]
+
+        self.progress = np.zeros(n, dtype=np.intp)   # indeks segmen, monoton
+        self.done = np.zeros(n, dtype=bool)
+        self.error = np.zeros(n)                     # jarak lateral ke jalur
+        self._rows = np.arange(n)[:, None]
+
+    def __len__(self):
+        return len(self.paths)
+
+    # Proyeksi (x, y) ke jalur di jendela segmen progres; kembalikan panjang
+    # busur titik proyeksi
+    def _project(self, x, y):
+        segments = self._length.shape[1]
+        index = np.minimum(self.progress[:, None] + np.arange(self.window), segments - 1)
+        start = self._start[self._rows, index]
+        edge = self._edge[self._rows, index]
+        length = self._length[self._rows, index]
+
+        px = x[:, None] - start[..., 0]
+        py = y[:, None] - start[..., 1]
+        t = (px * edge[..., 0] + py * edge[..., 1]) / np.maximum(length * length, 1e-12)
+        t = np.clip(t, 0.0, 1.0)
+        dx = px - t * edge[..., 0]
+        dy = py - t * edge[..., 1]
+        distance = dx * dx + dy * dy
+
+        best = np.argmin(distance, axis=1)
+        rows = self._rows[:, 0]
+        self.progress = np.maximum(self.progress, index[rows, best])
+        self.error = np.sqrt(distance[rows, best])
+        return self._arc[rows, index[rows, best]] + t[rows, best] * length[rows, best]
+
+    # Titik di jalur pada panjang busur s (N,)
+    def point_at(self, s):
+        s = np.clip(s, 0.0, self.total)
+        rows = self._rows[:, 0]
+        segment = np.minimum((self._arc[:, 1:] < s[:, None]).sum(axis=1), self._length.shape[1] - 1)
+        t = (s - self._arc[rows, segment]) / np.maximum(self._length[rows, segment], 1e-12)
+        t = np.clip(t, 0.0, 1.0)[:, None]
+        return self._start[rows, segment] + t * self._edge[rows, segment]
+
+    # Kecepatan (v, omega) untuk pose (N,)
+    def velocities(self, x, y, theta):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        theta = np.asarray(theta, dtype=float)
+
+        along = self._project(x, y)
+        target = self.point_at(along + self.lookahead)
+
+        # Titik sasaran di kerangka robot
+        dx = target[:, 0] - x
+        dy = target[:, 1] - y
+        c, s = np.cos(theta), np.sin(theta)
+        local_x = c * dx + s * dy
+        local_y = -s * dx + c * dy
+        curvature = 2 * local_y / np.maximum(local_x * local_x + local_y * local_y, 1e-12)
+
+        goal = self.paths[:, -1]
+        remaining = np.hypot(goal[:, 0] - x, goal[:, 1] - y)
+        self.done |= remaining < self.tolerance
+        v = self.speed * np.minimum(1.0, np.maximum(self.total - along, remaining) / self.slowdown)
+        # Sasaran di belakang robot: berputar di tempat lebih dulu
+        v = np.where(local_x > 0, v, 0.0)
+        omega = np.where(local_x > 0, v * curvature, np.sign(local_y + 1e-12) * self.speed / self.lookahead)
+
+        v = np.where(self.done, 0.0, v)
+        omega = np.where(self.done, 0.0, omega)
+        return v, omega
+
+    # Kecepatan roda (left_speed, right_speed) (N,). Bila melewati
+    # max_wheel_speed, kedua roda diskalakan bersama sehingga kelengkungan
+    # jalur tetap.
+    def command(self, x, y, theta):
+        v, omega = self.velocities(x, y, theta)
+        left, right = unicycle_to_wheels(v, omega, self.left_radius, self.right_radius, self.body_radius)
+        if self.max_wheel_speed is not None:
+            scale = np.maximum(np.maximum(np.abs(left), np.abs(right)) / self.max_wheel_speed, 1.0)
+            left = left / scale
+            right = right / scale
+        return left, right
+
+    # Satu langkah loop tertutup untuk FleetSimulator
+    def drive(self, fleet):
+        left, right = self.command(fleet.x, fleet.y, fleet.theta)
+        fleet.set_wheel_speeds(left, right)
+        return left, right
@@ -0,0 +1,449 @@
+import numpy as np
+from tags import DATA_BITS, MIN_DISTANCE, decode_codes
+
+# Deteksi tag fiducial (tags.py) pada frame grayscale, sepenuhnya dengan
+# operasi array NumPy:
+#
+#   1. threshold adaptif: piksel gelap bila lebih gelap dari rata-rata
+#      jendela block_size x block_size di sekitarnya (integral image)
+#   2. segmentasi: run horizontal piksel gelap dilabeli komponen terhubung
+#      (8-konektivitas) dengan union-find tervektorisasi (pointer jumping)
+#   3. quad: sudut awal dari titik ekstrem kontur luar setiap komponen, lalu
+#      setiap sisi di-fit ulang dengan garis (total least squares) dan
+#      sudut = perpotongan garis
+#   4. decoding: homografi 4 titik (DLT) dari grid tag ke gambar, sampling
+#      bilinear setiap sel bit, lalu dicocokkan dengan famili tag termasuk
+#      keempat rotasinya
+#
+# Koordinat gambar: x = kolom, y = baris, pusat piksel (0, 0) di (0, 0).
+
+# Sisi persegi hitam tag dalam satuan sel (border + data + border)
+TAG_SPAN = DATA_BITS + 2
+
+
+# Hasil deteksi satu tag. corners (4, 2) berurutan sudut kiri-atas,
+# kanan-atas, kanan-bawah, kiri-bawah tekstur tag (lihat tags.tag_texture);
+# angle adalah arah sisi atas tag dalam radian, berlawanan jarum jam dengan
+# sumbu y gambar menghadap ke atas, sehingga untuk kamera langit-langit
+# (camera.py) sama dengan heading robot.
+class Detection:
+    def __init__(self, tag_id, hamming, corners, homography):
+        self.tag_id = tag_id
+        self.hamming = hamming
+        self.corners = corners
+        self.homography = homography
+
+        center = homography @ np.array([TAG_SPAN / 2, TAG_SPAN / 2, 1.0])
+        self.center = center[:2] / center[2]
+        dx, dy = corners[1] - corners[0]
+        self.angle = float(np.arctan2(-dy, dx))
+
+    # Detection yang sama dalam koordinat frame yang lebih besar, untuk hasil
+    # dari potongan frame[row0:, col0:] (jendela ROI, tile)
+    def shifted(self, col0, row0):
+        translation = np.array([[1.0, 0.0, col0], [0.0, 1.0, row0], [0.0, 0.0, 1.0]])
+        return Detection(self.tag_id, self.hamming, self.corners + (col0, row0), translation @ self.homography)
+
+    def __repr__(self):
+        return (f"Detection(tag_id={self.tag_id}, hamming={self.hamming}, "
+                f"center=({self.center[0]:.2f}, {self.center[1]:.2f}), angle={self.angle:.3f})")
+
+
+# Mask piksel gelap: frame < rata-rata jendela - offset. Jumlah jendela
+# dihitung terpisah per sumbu dari integral (cumsum) baris lalu kolom,
+# sehingga cukup int32 tanpa overflow. Tepi gambar dipad dengan nilai tepi
+# supaya setiap jendela berukuran sama.
+def adaptive_threshold(frame, block_size=15, offset=7):
+    b = int(block_size) | 1
+    half = b // 2
+    padded = np.pad(np.asarray(frame), half, mode="edge")
+
+    integral = np.zeros((padded.shape[0] + 1, padded.shape[1]), dtype=np.int32)
+    np.cumsum(padded, axis=0, out=integral[1:])
+    vertical = integral[b:] - integral[:-b]
+
+    integral = np.zeros((vertical.shape[0], vertical.shape[1] + 1), dtype=np.int32)
+    np.cumsum(vertical, axis=1, out=integral[:, 1:])
+    sums = integral[:, b:] - integral[:, :-b]
+
+    area = b * b
+    return np.asarray(frame, dtype=np.int32) * area < sums - offset * area
+
+
+# Run horizontal piksel True: (rows, starts, ends) dengan ends eksklusif,
+# terurut per baris lalu kolom
+def find_runs(mask):
+    height, width = mask.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    # Perubahan 0->1 dan 1->0 selalu berselang-seling dalam satu baris
+    changes = np.flatnonzero(np.diff(padded, axis=1))
+    rows, cols = np.divmod(changes, width + 1)
+    return rows[0::2], cols[0::2], cols[1::2]
+
+
+# Label komponen terhubung untuk setiap run (0..count-1) dan jumlah komponen.
+# Run di baris r bersentuhan dengan run di baris r-1 yang rentang kolomnya
+# tumpang tindih (8-konektivitas: bersinggungan diagonal juga dihitung).
+# Karena run terurut, run di baris sebelumnya yang bersentuhan selalu
+# berurutan, sehingga cukup dua pencarian biner per run.
+def label_runs(rows, starts, ends, width):
+    n = rows.size
+    if n == 0:
+        return np.empty(0, dtype=np.intp), 0
+
+    stride = width + 1
+    key_start = rows * stride + starts
+    key_end = rows * stride + ends
+    previous = (rows - 1) * stride
+    lo = np.searchsorted(key_end, previous + starts - 1, side="right")
+    hi = np.searchsorted(key_start, previous + ends + 1, side="left")
+    count = np.maximum(hi - lo, 0)
+
+    a = np.repeat(np.arange(n), count)
+    b = np.repeat(lo - np.cumsum(count) + count, count) + np.arange(count.sum())
+
+    # Union-find tervektorisasi: kaitkan akar berlabel lebih besar ke label
+    # yang lebih kecil, lalu pointer jumping sampai setiap run menunjuk
+    # langsung ke akarnya; ulangi sampai tidak ada pasangan yang berbeda
+    labels = np.arange(n)
+    while a.size:
+        la = labels[a]
+        lb = labels[b]
+        differ = la != lb
+        if not differ.any():
+            break
+        a, b = a[differ], b[differ]
+        np.minimum.at(labels, np.maximum(la, lb)[differ], np.minimum(la, lb)[differ])
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+    roots, labels = np.unique(labels, return_inverse=True)
+    return labels, roots.size
+
+
+# Indeks elemen pertama yang mencapai maksimum skor di setiap grup (elemen
+# sudah terurut per grup, grup ke-g dimulai di starts[g])
+def _group_argmax(score, group, starts):
+    best = np.maximum.reduceat(score, starts)
+    hits = np.flatnonzero(score == best[group])
+    _, first = np.unique(group[hits], return_index=True)
+    return hits[first]
+
+
+# Urutkan 4 sudut setiap quad searah jarum jam di layar (y gambar ke bawah)
+def _order_corners(corners):
+    center = corners.mean(axis=1, keepdims=True)
+    angle = np.arctan2(corners[..., 1] - center[..., 1], corners[..., 0] - center[..., 0])
+    order = np.argsort(angle, axis=1)
+    return np.take_along_axis(corners, order[..., None], axis=1)
+
+
+def _quad_area(corners):
+    x, y = corners[..., 0], corners[..., 1]
+    return 0.5 * (x * np.roll(y, -1, axis=-1) - np.roll(x, -1, axis=-1) * y).sum(axis=-1)
+
+
+# Titik kontur luar setiap komponen: piksel paling kiri/kanan di setiap
+# baris dan paling atas/bawah di setiap kolom bounding box-nya. Ekstrem
+# dikumpulkan di array padat (satu slot per baris/kolom bounding box setiap
+# komponen) dengan ufunc.at, tanpa sorting. Kembalikan (group, x, y)
+# terurut per group.
+def _outline(rows, starts, ends, group, top, left, box_h, box_w):
+    # Ekstrem per baris langsung dari run
+    row_offset = np.cumsum(box_h) - box_h
+    slot = row_offset[group] + rows - top[group]
+    leftmost = np.full(box_h.sum(), np.iinfo(np.intp).max)
+    rightmost = np.full(box_h.sum(), -1)
+    np.minimum.at(leftmost, slot, starts)
+    np.maximum.at(rightmost, slot, ends - 1)
+    row_group = np.repeat(np.arange(box_h.size), box_h)
+    row_y = np.arange(box_h.sum()) - row_offset[row_group] + top[row_group]
+    filled = rightmost >= 0
+    row_group, row_y = row_group[filled], row_y[filled]
+    leftmost, rightmost = leftmost[filled], rightmost[filled]
+
+    # Ekstrem per kolom dari piksel run
+    lengths = ends - starts
+    pixel_x = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+    pixel_y = np.repeat(rows, lengths)
+    pixel_group = np.repeat(group, lengths)
+    col_offset = np.cumsum(box_w) - box_w
+    slot = col_offset[pixel_group] + pixel_x - left[pixel_group]
+    topmost = np.full(box_w.sum(), np.iinfo(np.intp).max)
+    bottommost = np.full(box_w.sum(), -1)
+    np.minimum.at(topmost, slot, pixel_y)
+    np.maximum.at(bottommost, slot, pixel_y)
+    col_group = np.repeat(np.arange(box_w.size), box_w)
+    col_x = np.arange(box_w.sum()) - col_offset[col_group] + left[col_group]
+    filled = bottommost >= 0
+    col_group, col_x = col_group[filled], col_x[filled]
+    topmost, bottommost = topmost[filled], bottommost[filled]
+
+    group = np.concatenate((row_group, row_group, col_group, col_group))
+    x = np.concatenate((leftmost, rightmost, col_x, col_x)).astype(float)
+    y = np.concatenate((row_y, row_y, topmost, bottommost)).astype(float)
+    order = np.argsort(group, kind="stable")
+    return group[order], x[order], y[order]
+
+
+# Cari quad (kandidat tag) di mask gelap. Kembalikan array sudut (Q, 4, 2)
+# berurutan searah jarum jam di layar.
+def find_quads(mask, min_side=12, max_side=None, max_outliers=0.15):
+    height, width = mask.shape
+    rows, starts, ends = find_runs(mask)
+    labels, count = label_runs(rows, starts, ends, width)
+    if count == 0:
+        return np.empty((0, 4, 2))
+
+    # Bounding box dan luas komponen, lalu saring komponen yang terlalu
+    # kecil/besar atau terlalu jarang untuk menjadi border tag
+    lengths = ends - starts
+    area = np.bincount(labels, weights=lengths, minlength=count)
+    top = np.full(count, height)
+    bottom = np.full(count, -1)
+    left = np.full(count, width)
+    right = np.full(count, -1)
+    np.minimum.at(top, labels, rows)
+    np.maximum.at(bottom, labels, rows)
+    np.minimum.at(left, labels, starts)
+    np.maximum.at(right, labels, ends - 1)
+    box_w = right - left + 1
+    box_h = bottom - top + 1
+    max_side = max(height, width) if max_side is None else max_side
+    keep = ((np.minimum(box_w, box_h) >= min_side) & (np.maximum(box_w, box_h) <= max_side)
+            & (area >= 0.2 * box_w * box_h))
+    if not keep.any():
+        return np.empty((0, 4, 2))
+
+    # Label ulang komponen yang lolos menjadi 0..G-1
+    remap = np.full(count, -1)
+    remap[keep] = np.arange(np.count_nonzero(keep))
+    selected = remap[labels] >= 0
+    group, x, y = _outline(rows[selected], starts[selected], ends[selected], remap[labels][selected],
+                           top[keep], left[keep], box_h[keep], box_w[keep])
+    groups = int(group[-1]) + 1
+    group_starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+
+    # Sudut awal: titik ekstrem ke arah diagonal (tag hampir sejajar sumbu)
+    # atau ke arah sumbu (tag berputar ~45 derajat); pilih yang luasnya
+    # lebih besar
+    candidates = []
+    for directions in (((1, 1), (1, -1), (-1, 1), (-1, -1)), ((1, 0), (0, 1), (-1, 0), (0, -1))):
+        corners = np.empty((groups, 4, 2))
+        for k, (dx, dy) in enumerate(directions):
+            index = _group_argmax(dx * x + dy * y, group, group_starts)
+            corners[:, k, 0] = x[index]
+            corners[:, k, 1] = y[index]
+        candidates.append(_order_corners(corners))
+    areas = [_quad_area(corners) for corners in candidates]
+    corners = np.where((areas[0] >= areas[1])[:, None, None], candidates[0], candidates[1])
+
+    return _refine_edges(corners, group, x, y, min_side, max_outliers)
+
+
+# Fit ulang keempat sisi setiap quad dari titik kontur, lalu buang quad yang
+# kontur luarnya tidak mirip persegi empat
+def _refine_edges(corners, group, x, y, min_side, max_outliers):
+    groups = corners.shape[0]
+    start = corners[group]                          # (P, 4, 2)
+    direction = np.roll(corners, -1, axis=1)[group] - start
+    length = np.hypot(direction[..., 0], direction[..., 1])
+    length = np.maximum(length, 1e-9)
+    px = x[:, None] - start[..., 0]
+    py = y[:, None] - start[..., 1]
+    along = (px * direction[..., 0] + py * direction[..., 1]) / length ** 2
+    distance = np.abs(px * direction[..., 1] - py * direction[..., 0]) / length
+
+    # Titik dekat sudut tidak dipakai untuk fitting karena ambigu
+    usable = (along > 0.1) & (along < 0.9)
+    edge = np.argmin(np.where(usable, distance, np.inf), axis=1)
+    nearest = distance[np.arange(x.size), edge]
+    side = np.hypot(*(np.roll(corners, -1, axis=1) - corners).transpose(2, 0, 1)).min(axis=1)
+    tolerance = np.maximum(1.5, 0.06 * side[group])
+    inlier = usable[np.arange(x.size), edge] & (nearest <= tolerance)
+
+    # Quad ditolak bila terlalu banyak titik kontur jauh dari semua sisi
+    # (misalnya body robot yang bulat)
+    outliers = np.bincount(group, weights=distance.min(axis=1) > tolerance, minlength=groups)
+    total = np.bincount(group, minlength=groups)
+
+    # Total least squares per sisi dari momen titik (bincount per group*4+edge)
+    slot = group[inlier] * 4 + edge[inlier]
+    xi, yi = x[inlier], y[inlier]
+    size = groups * 4
+    n = np.bincount(slot, minlength=size)
+    safe = np.maximum(n, 1)
+    mx = np.bincount(slot, weights=xi, minlength=size) / safe
+    my = np.bincount(slot, weights=yi, minlength=size) / safe
+    cxx = np.bincount(slot, weights=xi * xi, minlength=size) / safe - mx * mx
+    cyy = np.bincount(slot, weights=yi * yi, minlength=size) / safe - my * my
+    cxy = np.bincount(slot, weights=xi * yi, minlength=size) / safe - mx * my
+    phi = 0.5 * np.arctan2(2 * cxy, cxx - cyy)
+    dx, dy = np.cos(phi), np.sin(phi)
+
+    # Titik kontur adalah pusat piksel gelap terluar, rata-rata sekitar
+    # setengah piksel (searah sumbu scan) di dalam tepi sebenarnya; geser
+    # garis keluar sejauh itu
+    nx, ny = -dy, dx
+    center = corners.mean(axis=1).repeat(4, axis=0)
+    inward = np.sign((center[:, 0] - mx) * nx + (center[:, 1] - my) * ny)
+    shift = 0.5 / (np.abs(nx) + np.abs(ny))
+    mx = mx - inward * shift * nx
+    my = my - inward * shift * ny
+
+    # Sudut k = perpotongan sisi k-1 dan sisi k
+    mx, my, dx, dy = (a.reshape(groups, 4) for a in (mx, my, dx, dy))
+    pmx, pmy, pdx, pdy = (np.roll(a, 1, axis=1) for a in (mx, my, dx, dy))
+    det = pdx * dy - pdy * dx
+    t = ((mx - pmx) * dy - (my - pmy) * dx) / np.where(np.abs(det) > 1e-6, det, 1.0)
+    refined = np.stack((pmx + t * pdx, pmy + t * pdy), axis=-1)
+
+    enough = (n.reshape(groups, 4) >= 3).all(axis=1) & (np.abs(det) > 0.2).all(axis=1)
+    moved = np.hypot(*(refined - corners).transpose(2, 0, 1)).max(axis=1)
+    enough &= moved < 0.25 * side + 2
+    corners = np.where(enough[:, None, None], refined, corners)
+
+    sides = np.hypot(*(np.roll(corners, -1, axis=1) - corners).transpose(2, 0, 1))
+    good = (outliers <= max_outliers * total) & (sides.min(axis=1) >= min_side * 0.7) & (_quad_area(corners) > 0)
+    return corners[good]
+
+
+# Homografi (Q, 3, 3) yang memetakan titik src (4, 2) ke dst (Q, 4, 2)
+# (DLT 4 titik, h33 = 1)
+def homographies(src, dst):
+    q = dst.shape[0]
+    a = np.zeros((q, 8, 8))
+    b = np.empty((q, 8))
+    for k in range(4):
+        sx, sy = src[k]
+        u, v = dst[:, k, 0], dst[:, k, 1]
+        a[:, 2 * k, 0:3] = sx, sy, 1
+        a[:, 2 * k, 6] = -u * sx
+        a[:, 2 * k, 7] = -u * sy
+        a[:, 2 * k + 1, 3:6] = sx, sy, 1
+        a[:, 2 * k + 1, 6] = -v * sx
+        a[:, 2 * k + 1, 7] = -v * sy
+        b[:, 2 * k] = u
+        b[:, 2 * k + 1] = v
+    h = np.linalg.solve(a, b[..., None])[..., 0]
+    return np.concatenate((h, np.ones((q, 1))), axis=1).reshape(q, 3, 3)
+
+
+# Petakan titik (K, 2) dengan setiap homografi -> (Q, K, 2)
+def apply_homographies(h, points):
+    mapped = np.einsum("qij,kj->qki", h, np.column_stack((points, np.ones(len(points)))))
+    return mapped[..., :2] / mapped[..., 2:]
+
+
+# Sampling bilinear frame di titik (..., 2); juga kembalikan mask titik
+# yang berada di dalam gambar
+def sample_bilinear(frame, points):
+    height, width = frame.shape
+    x, y = points[..., 0], points[..., 1]
+    inside = (x >= 0) & (x <= width - 1) & (y >= 0) & (y <= height - 1)
+    x = np.clip(x, 0, width - 1.001)
+    y = np.clip(y, 0, height - 1.001)
+    x0 = x.astype(np.intp)
+    y0 = y.astype(np.intp)
+    fx = x - x0
+    fy = y - y0
+    top = frame[y0, x0] * (1 - fx) + frame[y0, x0 + 1] * fx
+    bottom = frame[y0 + 1, x0] * (1 - fx) + frame[y0 + 1, x0 + 1] * fx
+    return top * (1 - fy) + bottom * fy, inside
+
+
+def _grid_points():
+    cells = np.arange(TAG_SPAN) + 0.5
+    data = np.arange(DATA_BITS) + 1.5
+    bx, by = np.meshgrid(data, data)
+    bits = np.column_stack((bx.ravel(), by.ravel()))
+    edge = np.concatenate([np.column_stack((cells, np.full(TAG_SPAN, c))) for c in (0.5, TAG_SPAN - 0.5)])
+    border = np.concatenate((edge, edge[:, ::-1]))
+    edge = np.concatenate([np.column_stack((cells, np.full(TAG_SPAN, c))) for c in (-0.5, TAG_SPAN + 0.5)])
+    quiet = np.concatenate((edge, edge[:, ::-1]))
+    return bits, border, quiet
+
+
+_BITS, _BORDER, _QUIET = _grid_points()
+_SQUARE = np.array([[0, 0], [TAG_SPAN, 0], [TAG_SPAN, TAG_SPAN], [0, TAG_SPAN]], dtype=float)
+_SHIFTS = np.arange(DATA_BITS * DATA_BITS - 1, -1, -1, dtype=np.uint64)
+
+
+# Decode quad (Q, 4, 2) menjadi daftar Detection. Threshold setiap quad
+# adalah titik tengah antara rata-rata sel border (hitam) dan quiet zone
+# di luarnya (putih).
+def decode_quads(frame, quads, max_hamming=None, min_contrast=20):
+    if len(quads) == 0:
+        return []
+
+    h = homographies(_SQUARE, quads)
+    bits, inside = sample_bilinear(frame, apply_homographies(h, _BITS))
+    black, inside_black = sample_bilinear(frame, apply_homographies(h, _BORDER))
+    white, inside_white = sample_bilinear(frame, apply_homographies(h, _QUIET))
+    black = black.mean(axis=1)
+    white = white.mean(axis=1)
+
+    codes = np.sum((bits > (0.5 * (black + white))[:, None]).astype(np.uint64) << _SHIFTS, axis=1)
+    tag_ids, rotations, hamming = decode_codes(codes, max_hamming)
+    valid = ((tag_ids >= 0) & (white - black >= min_contrast)
+             & inside.all(axis=1) & inside_black.all(axis=1) & inside_white.all(axis=1))
+
+    detections = []
+    for q in np.flatnonzero(valid):
+        # Putar urutan sudut supaya sudut 0 = kiri-atas tekstur tag
+        corners = np.roll(quads[q], rotations[q], axis=0)
+        homography = homographies(_SQUARE, corners[None])[0]
+        detections.append(Detection(int(tag_ids[q]), int(hamming[q]), corners, homography))
+    return detections
+
+
+class TagDetector:
+    def __init__(self, block_size=15, threshold_offset=7, min_side=12, max_side=None,
+                 max_hamming=(MIN_DISTANCE - 1) // 2, min_contrast=20):
+        self.block_size = block_size
+        self.threshold_offset = threshold_offset
+        self.min_side = min_side
+        self.max_side = max_side
+        self.max_hamming = max_hamming
+        self.min_contrast = min_contrast
+
+    def quads(self, frame):
+        mask = adaptive_threshold(frame, self.block_size, self.threshold_offset)
+        return find_quads(mask, self.min_side, self.max_side)
+
+    def detect(self, frame):
+        frame = np.asarray(frame)
+        if frame.ndim != 2:
+            raise ValueError("frame harus grayscale 2-D")
+        frame = to_uint8(frame)
+        return decode_quads(frame, self.quads(frame), self.max_hamming, self.min_contrast)
+
+
+def detect(frame, **options):
+    return TagDetector(**options).detect(frame)
+
+
+# Konversi frame ke uint8 seperti yang diharapkan threshold dan min_contrast.
+# Frame float dengan nilai di [0, 1] (seperti hasil matplotlib.image.imread)
+# diskalakan ke 0..255; frame float lain dianggap sudah berskala 0..255.
+def to_uint8(image):
+    image = np.asarray(image)
+    if image.dtype == np.uint8:
+        return image
+    if image.dtype.kind == "f" and image.size and image.max() <= 1.0:
+        image = image * 255
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+# Baca file gambar sebagai frame grayscale uint8
+def read_frame(path):
+    import matplotlib.image
+
+    image = matplotlib.image.imread(path)
+    if image.ndim == 3:
+        image = image[..., :3] @ np.array([0.299, 0.587, 0.114])
+    return to_uint8(image)
@@ -0,0 +1,94 @@
+import numpy as np
+from kinematics import wheel_to_unicycle
+from integrators import get_integrator
+
+# Simulasi banyak robot differential drive sekaligus. Semua pose dan parameter
+# roda disimpan sebagai array NumPy kontigu berukuran (N,) (structure of
+# arrays), sehingga satu langkah simulasi untuk seluruh armada cukup beberapa
+# operasi vektor.
+
+
+class FleetSimulator:
+    def __init__(self, x, y, theta, left_speed, left_radius, right_speed, right_radius, body_radius,
+                 integrator="exact"):
+        n = np.broadcast(x, y, theta, left_speed, left_radius, right_speed, right_radius, body_radius).size
+
+        # Pose robot (theta dalam radian)
+        self.x = self._column(x, n)
+        self.y = self._column(y, n)
+        self.theta = self._column(theta, n)
+
+        # Parameter roda dan body
+        self.left_speed = self._column(left_speed, n)
+        self.left_radius = self._column(left_radius, n)
+        self.right_speed = self._column(right_speed, n)
+        self.right_radius = self._column(right_radius, n)
+        self.body_radius = self._column(body_radius, n)
+
+        self.t = 0.0
+
+        # "exact" memakai jalur cepat di step(); integrator lain dipanggil
+        # langsung dengan array seluruh armada
+        self.integrator = None if integrator == "exact" else get_integrator(integrator)
+
+        # Buffer kerja supaya step() tidak mengalokasikan array baru
+        self._heading = np.empty(n)
+        self._trig = np.empty(n)
+        self._step_dt = None
+        self.update_velocities()
+
+    @staticmethod
+    def _column(values, n):
+        return np.array(np.broadcast_to(np.asarray(values, dtype=float), (n,)))
+
+    def __len__(self):
+        return self.x.size
+
+    # Hitung ulang v dan omega; panggil setelah mengubah parameter roda
+    def update_velocities(self):
+        self.v, self.omega = wheel_to_unicycle(self.left_speed, self.left_radius,
+                                               self.right_speed, self.right_radius,
+                                               self.body_radius)
+        self._step_dt = None
+
+    # Ganti kecepatan roda sebagian/seluruh robot (index boleh slice atau mask)
+    def set_wheel_speeds(self, left_speed, right_speed, index=slice(None)):
+        self.left_speed[index] = left_speed
+        self.right_speed[index] = right_speed
+        self.update_velocities()
+
+    # Maju satu langkah dt untuk semua robot dengan integrasi busur eksak.
+    # Tali busur dan setengah sudut putar hanya bergantung pada v, omega dan
+    # dt, jadi dihitung sekali lalu dipakai ulang di setiap tick.
+    def step(self, dt):
+        if self.integrator is not None:
+            self.x, self.y, self.theta = self.integrator(self.x, self.y, self.theta, self.v, self.omega, dt)
+            self.t += dt
+            return
+
+        if self._step_dt != dt:
+            self._half = 0.5 * self.omega * dt
+            self._chord = self.v * dt * np.sinc(self._half / np.pi)
+            self._step_dt = dt
+
+        np.add(self.theta, self._half, out=self._heading)
+
+        np.cos(self._heading, out=self._trig)
+        self._trig *= self._chord
+        self.x += self._trig
+
+        np.sin(self._heading, out=self._trig)
+        self._trig *= self._chord
+        self.y += self._trig
+
+        self.theta += self._half
+        self.theta += self._half
+        self.t += dt
+
+    def run(self, dt, steps):
+        for _ in range(steps):
+            self.step(dt)
+
+    # Pose seluruh armada sebagai array (N, 3): x, y, theta
+    def poses(self):
+        return np.column_stack((self.x, self.y, self.theta))
@@ -0,0 +1,128 @@
+import numpy as np
+from kinematics import step, trajectory
+
+# Integrator untuk model differential drive (unicycle) dengan kecepatan roda
+# konstan selama satu langkah. Semua integrator punya antarmuka yang sama:
+#
+#     integrator(x, y, theta, v, omega, dt) -> (x, y, theta)
+#
+# dan bekerja elemen per elemen, jadi argumen boleh skalar maupun array
+# (misalnya state seluruh armada di FleetSimulator).
+
+
+# Turunan state: dx/dt = v cos(theta), dy/dt = v sin(theta), dtheta/dt = omega
+def _derivative(theta, v, omega):
+    return v * np.cos(theta), v * np.sin(theta), omega
+
+
+# Euler maju (integrator asli di closure update())
+def euler(x, y, theta, v, omega, dt):
+    return step(x, y, theta, v, omega, dt)
+
+
+# Integrasi busur eksak; tidak ada error diskretisasi untuk kecepatan konstan
+def exact(x, y, theta, v, omega, dt):
+    return trajectory(x, y, theta, v, omega, dt)
+
+
+# Runge-Kutta orde 4 klasik
+def rk4(x, y, theta, v, omega, dt):
+    k1 = _derivative(theta, v, omega)
+    k2 = _derivative(theta + 0.5 * dt * k1[2], v, omega)
+    k3 = _derivative(theta + 0.5 * dt * k2[2], v, omega)
+    k4 = _derivative(theta + dt * k3[2], v, omega)
+
+    x = x + dt / 6 * (k1[0] + 2 * k2[0] + 2 * k3[0] + k4[0])
+    y = y + dt / 6 * (k1[1] + 2 * k2[1] + 2 * k3[1] + k4[1])
+    theta = theta + dt / 6 * (k1[2] + 2 * k2[2] + 2 * k3[2] + k4[2])
+    return x, y, theta
+
+
+# Tabel Butcher Dormand-Prince 5(4)
+_DP_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+_DP_B5 = (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0)
+_DP_B4 = (5179 / 57600, 0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40)
+_DP_E = tuple(b5 - b4 for b5, b4 in zip(_DP_B5, _DP_B4))
+
+
+# RK45 adaptif (Dormand-Prince). Satu panggilan tetap maju tepat dt, tetapi
+# di dalamnya dt dipecah menjadi sub-langkah yang ukurannya diatur supaya
+# estimasi error lokal di bawah atol + rtol * |state|. Ukuran sub-langkah
+# terakhir diingat untuk panggilan berikutnya.
+class RK45:
+    def __init__(self, rtol=1e-6, atol=1e-9, max_substeps=10000):
+        self.rtol = rtol
+        self.atol = atol
+        self.max_substeps = max_substeps
+        self.h = None
+        self.substeps = 0  # jumlah sub-langkah yang diterima (untuk benchmark)
+
+    def _attempt(self, state, v, omega, h):
+        k = []
+        for a in _DP_A:
+            theta = state[2] + h * sum(a_j * k_j[2] for a_j, k_j in zip(a, k))
+            k.append(_derivative(theta, v, omega))
+
+        new = tuple(state[i] + h * sum(b * k_j[i] for b, k_j in zip(_DP_B5, k)) for i in range(3))
+        err = tuple(h * sum(e * k_j[i] for e, k_j in zip(_DP_E, k)) for i in range(3))
+
+        norm = 0.0
+        for i in range(3):
+            scale = self.atol + self.rtol * np.maximum(np.abs(state[i]), np.abs(new[i]))
+            norm = max(norm, float(np.max(np.abs(err[i]) / scale)))
+        return new, norm
+
+    def __call__(self, x, y, theta, v, omega, dt):
+        state = (x, y, theta)
+        remaining = dt
+        h = dt if self.h is None else self.h
+
+        for _ in range(self.max_substeps):
+            if remaining <= 1e-12 * dt:
+                self.h = h
+                return state
+
+            # Sub-langkah terakhir dipotong supaya tepat berakhir di dt
+            step_h = min(h, remaining)
+            new, norm = self._attempt(state, v, omega, step_h)
+
+            # Faktor ukuran langkah standar untuk metode orde 5
+            factor = 5.0 if norm == 0 else min(5.0, max(0.2, 0.9 * norm ** -0.2))
+            if norm <= 1.0:
+                state = new
+                remaining -= step_h
+                self.substeps += 1
+                if step_h == h:
+                    h *= factor
+            else:
+                h = step_h * factor
+
+        raise RuntimeError("RK45 melebihi max_substeps; longgarkan toleransi atau perkecil dt")
+
+
+INTEGRATORS = {
+    "euler": euler,
+    "exact": exact,
+    "rk4": rk4,
+    "rk45": RK45,
+}
+
+
+# Ambil integrator dari nama (lihat INTEGRATORS), kelas integrator, atau
+# callable yang sudah jadi
+def get_integrator(integrator):
+    if isinstance(integrator, str):
+        if integrator not in INTEGRATORS:
+            raise ValueError(f"integrator tidak dikenal: {integrator!r} (pilihan: {', '.join(INTEGRATORS)})")
+        integrator = INTEGRATORS[integrator]
+    if isinstance(integrator, type):
+        return integrator()
+    return integrator
@@ -0,0 +1,67 @@
+import numpy as np
+
+# Model kinematika robot differential drive (unicycle) tanpa GUI, sehingga
+# bisa diimpor dari batch job, test, atau server tracking.
+
+
+# Hitung kecepatan translasi (linear) dan rotasi (angular) robot dari roda
+def wheel_to_unicycle(left_speed, left_radius, right_speed, right_radius, body_radius):
+    # Hitung kecepatan translasi (linear) masing-masing roda
+    v_left = left_speed * left_radius
+    v_right = right_speed * right_radius
+
+    # Hitung kecepatan translasi (linear) total dan kecepatan rotasi (angular) robot
+    v = (v_left + v_right) / 2
+    omega = (v_right - v_left) / body_radius
+    return v, omega
+
+
+# Kebalikan wheel_to_unicycle: kecepatan putar roda kiri dan kanan untuk
+# kecepatan translasi v dan rotasi omega yang diinginkan
+def unicycle_to_wheels(v, omega, left_radius, right_radius, body_radius):
+    v_left = v - omega * body_radius / 2
+    v_right = v + omega * body_radius / 2
+    return v_left / left_radius, v_right / right_radius
+
+
+# Satu langkah integrasi Euler untuk posisi dan orientasi robot
+def step(x, y, theta, v, omega, dt):
+    # Hitung perubahan posisi dan orientasi
+    dx = v * np.cos(theta) * dt
+    dy = v * np.sin(theta) * dt
+    dtheta = omega * dt
+
+    # Perbarui posisi dan orientasi
+    return x + dx, y + dy, theta + dtheta
+
+
+# Jalankan beberapa langkah berturut-turut, kembalikan jalur lengkap
+# (termasuk pose awal) sebagai array dengan panjang steps + 1
+def propagate(x, y, theta, v, omega, dt, steps):
+    xs = np.empty(steps + 1)
+    ys = np.empty(steps + 1)
+    thetas = np.empty(steps + 1)
+    xs[0], ys[0], thetas[0] = x, y, theta
+
+    for i in range(1, steps + 1):
+        x, y, theta = step(x, y, theta, v, omega, dt)
+        xs[i], ys[i], thetas[i] = x, y, theta
+
+    return xs, ys, thetas
+
+
+# Trajektori eksak (integrasi busur) untuk kecepatan roda konstan, dievaluasi
+# sekaligus pada grid waktu sembarang. Semua argumen di-broadcast oleh NumPy,
+# jadi v dan omega juga boleh berupa array (misalnya untuk sweep parameter).
+def trajectory(x0, y0, theta0, v, omega, times):
+    times = np.asarray(times, dtype=float)
+    half = 0.5 * np.asarray(omega, dtype=float) * times
+
+    # Panjang tali busur: v*t*sin(w*t/2)/(w*t/2), bernilai v*t saat omega = 0
+    chord = v * times * np.sinc(half / np.pi)
+    heading = theta0 + half
+
+    x = x0 + chord * np.cos(heading)
+    y = y0 + chord * np.sin(heading)
+    theta = theta0 + 2 * half
+    return x, y, theta
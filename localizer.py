@@ -0,0 +1,121 @@
+import numpy as np
+from detection import TAG_SPAN, TagDetector, adaptive_threshold, decode_quads, find_quads, sample_bilinear, to_uint8
+
+# Lokalisasi tag coarse-to-fine untuk frame besar (misalnya 4K). Kandidat
+# quad dicari pada level piramida yang sudah didesimasi (rata-rata blok
+# factor x factor), lalu posisi sisi dan sudutnya diperhalus sampai
+# sub-piksel pada resolusi penuh hanya di jendela sempit sepanjang sisi
+# setiap kandidat, dan bit tag di-decode dari frame resolusi penuh. Piksel
+# resolusi penuh yang disentuh hanya profil tepi dan titik sampel bit.
+
+
+# Desimasi dengan rata-rata blok factor x factor (sisa tepi dibuang)
+def decimate(frame, factor):
+    if factor == 1:
+        return np.asarray(frame)
+    height = frame.shape[0] // factor * factor
+    width = frame.shape[1] // factor * factor
+    # Jumlahkan dulu sepanjang baris (memori kontigu), lalu antar baris
+    rows = frame[:height, :width].reshape(height, width // factor, factor).sum(axis=2, dtype=np.uint32)
+    blocks = rows.reshape(height // factor, factor, width // factor).sum(axis=1, dtype=np.uint32)
+    return (blocks // (factor * factor)).astype(np.uint8)
+
+
+# Perhalus quad (Q, 4, 2) di frame resolusi penuh. Di `samples` titik
+# sepanjang setiap sisi, profil intensitas diambil tegak lurus sisi sejauh
+# +-reach piksel (sampling bilinear); posisi tepi adalah centroid gradien
+# gelap->terang ke arah luar. Garis sisi di-fit ulang dari titik-titik tepi
+# itu (total least squares) dan sudut = perpotongan sisi yang bersebelahan.
+# reach boleh skalar atau per quad; quad yang fitting-nya gagal tidak diubah.
+def refine_edges(frame, quads, reach=2.0, samples=12, iterations=2, steps=17):
+    quads = np.asarray(quads, dtype=float)
+    if len(quads) == 0:
+        return quads.copy()
+    reach = np.broadcast_to(np.asarray(reach, dtype=float), (len(quads),))
+    along = np.linspace(0.15, 0.85, samples)
+    across = np.linspace(-1.0, 1.0, steps)[None, :] * reach[:, None]      # (Q, S)
+    middle = 0.5 * (across[:, 1:] + across[:, :-1])
+
+    for _ in range(iterations):
+        start = quads
+        edge = np.roll(quads, -1, axis=1) - start
+        length = np.maximum(np.hypot(edge[..., 0], edge[..., 1]), 1e-9)
+        direction = edge / length[..., None]
+
+        # Normal sisi diarahkan keluar dari pusat quad
+        normal = np.stack((direction[..., 1], -direction[..., 0]), axis=-1)
+        outward = ((start + 0.5 * edge - quads.mean(axis=1, keepdims=True)) * normal).sum(axis=-1)
+        normal = normal * np.where(outward < 0, -1.0, 1.0)[..., None]
+
+        base = start[:, :, None, :] + along[None, None, :, None] * edge[:, :, None, :]   # (Q, 4, M, 2)
+        points = base[:, :, :, None, :] + across[:, None, None, :, None] * normal[:, :, None, None, :]
+        profile, inside = sample_bilinear(frame, points)
+
+        weight = np.maximum(np.diff(profile, axis=-1), 0)
+        total = weight.sum(axis=-1)
+        offset = (weight * middle[:, None, None, :]).sum(axis=-1) / np.maximum(total, 1e-9)
+        found = (total > 0) & inside.all(axis=-1)
+        x = base[..., 0] + offset * normal[:, :, None, 0]
+        y = base[..., 1] + offset * normal[:, :, None, 1]
+
+        # Total least squares per sisi dari titik tepi yang ditemukan
+        w = found.astype(float)
+        count = w.sum(axis=-1)
+        safe = np.maximum(count, 1)
+        mx = (w * x).sum(axis=-1) / safe
+        my = (w * y).sum(axis=-1) / safe
+        dx = x - mx[..., None]
+        dy = y - my[..., None]
+        phi = 0.5 * np.arctan2(2 * (w * dx * dy).sum(axis=-1), (w * (dx * dx - dy * dy)).sum(axis=-1))
+        ux, uy = np.cos(phi), np.sin(phi)
+
+        # Sudut k = perpotongan sisi k-1 dan sisi k
+        pmx, pmy, pux, puy = (np.roll(a, 1, axis=1) for a in (mx, my, ux, uy))
+        det = pux * uy - puy * ux
+        t = ((mx - pmx) * uy - (my - pmy) * ux) / np.where(np.abs(det) > 1e-6, det, 1.0)
+        refined = np.stack((pmx + t * pux, pmy + t * puy), axis=-1)
+
+        good = (count >= 3).all(axis=1) & (np.abs(det) > 0.2).all(axis=1)
+        good &= (np.abs(refined - quads).max(axis=(1, 2)) <= 2 * reach + 1)
+        quads = np.where(good[:, None, None], refined, quads)
+    return quads
+
+
+class PyramidLocalizer:
+    # Parameter detector (block_size, min_side, ...) dalam piksel resolusi
+    # penuh; diskalakan otomatis ke level piramida. Jangkauan profil tepi
+    # cukup untuk menutup error kuantisasi level piramida, tetapi dibatasi
+    # di bawah setengah sel tag supaya tidak mengenai tepi bit data.
+    def __init__(self, decimation=2, detector=None, samples=12, iterations=2):
+        if decimation < 1:
+            raise ValueError("faktor desimasi minimal 1")
+        self.decimation = int(decimation)
+        self.detector = detector if detector is not None else TagDetector()
+        self.samples = samples
+        self.iterations = iterations
+
+    # Quad kandidat dari level piramida, dalam koordinat resolusi penuh.
+    # Pusat piksel i level desimasi berada di i * factor + (factor - 1) / 2.
+    def candidates(self, frame):
+        f = self.decimation
+        detector = self.detector
+        level = decimate(frame, f)
+        mask = adaptive_threshold(level, max(3, detector.block_size // f), detector.threshold_offset)
+        max_side = None if detector.max_side is None else detector.max_side / f
+        quads = find_quads(mask, max(4, detector.min_side / f), max_side)
+        return quads * f + (f - 1) / 2
+
+    def refine(self, frame, quads):
+        if len(quads) == 0:
+            return quads
+        sides = np.hypot(*(np.roll(quads, -1, axis=1) - quads).transpose(2, 0, 1)).min(axis=1)
+        reach = np.minimum(max(2.0, 0.75 * self.decimation), 0.45 * sides / TAG_SPAN)
+        return refine_edges(frame, quads, reach, self.samples, self.iterations)
+
+    def detect(self, frame):
+        frame = np.asarray(frame)
+        if frame.ndim != 2:
+            raise ValueError("frame harus grayscale 2-D")
+        frame = to_uint8(frame)
+        quads = self.refine(frame, self.candidates(frame))
+        return decode_quads(frame, quads, self.detector.max_hamming, self.detector.min_contrast)
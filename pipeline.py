@@ -0,0 +1,274 @@
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from detection import Detection, TAG_SPAN, homographies
+
+# Pipeline frame antar stage (capture -> deteksi -> tampilan) tanpa menyalin
+# piksel. Semua frame tinggal di satu ring buffer multiprocessing.shared_memory
+# dengan `slots` slot; yang berpindah antar stage hanya indeks slot. Setiap
+# slot selalu berada di tepat satu tempat: antrean slot kosong, antrean
+# masukan salah satu stage, atau sedang dipegang satu stage.
+#
+# Kebijakan saat stage tertinggal:
+#   "drop-oldest"  capture tidak pernah menunggu: bila tidak ada slot kosong,
+#                  frame tertua yang belum diambil stage pertama dibuang dan
+#                  slotnya dipakai ulang; stage mengambil frame terbaru dan
+#                  membuang yang lebih lama, jadi yang dideteksi selalu frame
+#                  terakhir
+#   "block"        backpressure: capture menunggu slot kosong dan setiap
+#                  frame diproses berurutan
+#
+# Hasil deteksi ditulis ke tabel per slot di shared memory yang sama (tag_id,
+# hamming, 4 sudut), sehingga stage tampilan juga cukup menerima indeks.
+
+POLICIES = ("drop-oldest", "block")
+RESULT_FIELDS = ("tag_id", "hamming", "x0", "y0", "x1", "y1", "x2", "y2", "x3", "y3")
+_META_FIELDS = 3  # timestamp, sequence, jumlah hasil
+
+
+# Ring buffer frame beserta metadata dan tabel hasil per slot
+class FrameRing:
+    def __init__(self, shape, dtype=np.uint8, slots=4, max_results=256, name=None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = int(slots)
+        self.max_results = int(max_results)
+
+        size = self._layout()
+        if name is None:
+            self.shared = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            self.shared = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self._views()
+
+    def _layout(self):
+        frame_bytes = self.slots * int(np.prod(self.shape)) * self.dtype.itemsize
+        self._meta_offset = -(-frame_bytes // 8) * 8
+        self._result_offset = self._meta_offset + self.slots * _META_FIELDS * 8
+        return self._result_offset + self.slots * self.max_results * len(RESULT_FIELDS) * 8
+
+    def _views(self):
+        buf = self.shared.buf
+        self.frames = np.ndarray((self.slots,) + self.shape, dtype=self.dtype, buffer=buf)
+        self.meta = np.ndarray((self.slots, _META_FIELDS), dtype=np.float64, buffer=buf, offset=self._meta_offset)
+        self.results = np.ndarray((self.slots, self.max_results, len(RESULT_FIELDS)), dtype=np.float64,
+                                  buffer=buf, offset=self._result_offset)
+
+    # Saat dikirim ke proses lain hanya nama blok memori yang ikut; view
+    # array dibuat ulang di proses tujuan
+    def __getstate__(self):
+        return {"shape": self.shape, "dtype": self.dtype.str, "slots": self.slots,
+                "max_results": self.max_results, "name": self.shared.name}
+
+    def __setstate__(self, state):
+        self.__init__(state["shape"], state["dtype"], state["slots"], state["max_results"], state["name"])
+
+    def frame(self, index):
+        return self.frames[index]
+
+    def timestamp(self, index):
+        return float(self.meta[index, 0])
+
+    def sequence(self, index):
+        return int(self.meta[index, 1])
+
+    def write_results(self, index, detections):
+        detections = detections[:self.max_results]
+        table = self.results[index]
+        for row, detection in zip(table, detections):
+            row[0] = detection.tag_id
+            row[1] = detection.hamming
+            row[2:] = detection.corners.ravel()
+        self.meta[index, 2] = len(detections)
+
+    # Hasil slot sebagai array (n, len(RESULT_FIELDS)), view tanpa salinan
+    def result_table(self, index):
+        return self.results[index, :int(self.meta[index, 2])]
+
+    def read_results(self, index):
+        table = self.result_table(index)
+        if len(table) == 0:
+            return []
+        corners = table[:, 2:].reshape(-1, 4, 2)
+        square = np.array([[0, 0], [TAG_SPAN, 0], [TAG_SPAN, TAG_SPAN], [0, TAG_SPAN]], dtype=float)
+        return [Detection(int(row[0]), int(row[1]), c.copy(), h)
+                for row, c, h in zip(table, corners, homographies(square, corners))]
+
+    def close(self):
+        self.frames = self.meta = self.results = None
+        self.shared.close()
+        if self.owner:
+            self.shared.unlink()
+
+
+# Antrean FIFO indeks slot yang aman untuk thread maupun proses (ring di
+# shared ctypes + Condition). Kapasitasnya sama dengan jumlah slot sehingga
+# put() tidak pernah penuh.
+class SlotQueue:
+    def __init__(self, capacity, context=multiprocessing):
+        self.capacity = capacity
+        self._items = context.RawArray("l", capacity)
+        self._head = context.RawValue("l", 0)
+        self._count = context.RawValue("l", 0)
+        self._condition = context.Condition()
+
+    def __len__(self):
+        with self._condition:
+            return self._count.value
+
+    def put(self, index):
+        with self._condition:
+            if self._count.value >= self.capacity:
+                raise queue.Full
+            self._items[(self._head.value + self._count.value) % self.capacity] = index
+            self._count.value += 1
+            self._condition.notify_all()
+
+    def _pop_oldest(self):
+        index = self._items[self._head.value]
+        self._head.value = (self._head.value + 1) % self.capacity
+        self._count.value -= 1
+        return index
+
+    # Ambil indeks tertua, atau dengan latest=True yang terbaru; kembalikan
+    # (index, indeks lain yang dilewati). timeout=0 tidak menunggu.
+    def get(self, latest=False, timeout=None):
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._count.value > 0, timeout):
+                raise queue.Empty
+            skipped = []
+            if latest:
+                while self._count.value > 1:
+                    skipped.append(self._pop_oldest())
+            return self._pop_oldest(), skipped
+
+    # Ambil indeks tertua tanpa menunggu, atau None bila kosong
+    def steal(self):
+        with self._condition:
+            return self._pop_oldest() if self._count.value > 0 else None
+
+
+class FramePipeline:
+    def __init__(self, shape, dtype=np.uint8, slots=4, stages=("detect", "view"), policy="drop-oldest",
+                 max_results=256, context=multiprocessing):
+        if policy not in POLICIES:
+            raise ValueError(f"kebijakan tidak dikenal: {policy!r} (pilihan: {', '.join(POLICIES)})")
+        if slots < len(stages) + 1:
+            raise ValueError("jumlah slot minimal jumlah stage + 1")
+
+        self.ring = FrameRing(shape, dtype, slots, max_results)
+        self.stages = tuple(stages)
+        self.policy = policy
+        self.free = SlotQueue(slots, context)
+        self.inputs = {stage: SlotQueue(slots, context) for stage in self.stages}
+        for index in range(slots):
+            self.free.put(index)
+
+        self.stop_event = context.Event()
+        self._counters = context.RawArray("q", 3)  # published, dropped, completed
+        self._counter_lock = context.Lock()
+
+    def _count(self, which, amount=1):
+        with self._counter_lock:
+            self._counters[which] += amount
+
+    @property
+    def published(self):
+        return self._counters[0]
+
+    @property
+    def dropped(self):
+        return self._counters[1]
+
+    @property
+    def completed(self):
+        return self._counters[2]
+
+    # Capture: ambil slot untuk ditulisi. Dengan "drop-oldest" tidak pernah
+    # menunggu selama ada frame yang belum diambil stage pertama.
+    def acquire(self, timeout=None):
+        if self.policy == "drop-oldest":
+            try:
+                return self.free.get(timeout=0)[0]
+            except queue.Empty:
+                index = self.inputs[self.stages[0]].steal()
+                if index is not None:
+                    self._count(1)
+                    return index
+        return self.free.get(timeout=timeout)[0]
+
+    # Capture: frame di slot index sudah lengkap; serahkan ke stage pertama
+    def publish(self, index, timestamp=None):
+        self.ring.meta[index, 0] = time.perf_counter() if timestamp is None else timestamp
+        self.ring.meta[index, 1] = self.published
+        self.ring.meta[index, 2] = 0
+        self._count(0)
+        self.inputs[self.stages[0]].put(index)
+
+    # Salin frame ke slot lalu publish (untuk sumber yang tidak bisa menulis
+    # langsung ke ring.frame(index)); kembalikan indeks slot
+    def push(self, frame, timestamp=None, timeout=None):
+        index = self.acquire(timeout)
+        self.ring.frames[index] = frame
+        self.publish(index, timestamp)
+        return index
+
+    # Stage: ambil indeks frame berikutnya. Default-nya frame terbaru untuk
+    # "drop-oldest" (frame lebih lama dibuang) dan berurutan untuk "block".
+    def receive(self, stage, timeout=None, latest=None):
+        if latest is None:
+            latest = self.policy == "drop-oldest"
+        index, skipped = self.inputs[stage].get(latest, timeout)
+        for old in skipped:
+            self.free.put(old)
+        if skipped:
+            self._count(1, len(skipped))
+        return index
+
+    # Stage selesai dengan slot: teruskan ke stage berikutnya, atau
+    # kembalikan ke antrean kosong bila ini stage terakhir
+    def forward(self, stage, index):
+        position = self.stages.index(stage)
+        if position + 1 < len(self.stages):
+            self.inputs[self.stages[position + 1]].put(index)
+        else:
+            self.release(index)
+            self._count(2)
+
+    def release(self, index):
+        self.free.put(index)
+
+    # Loop stage: func(pipeline, index) untuk setiap frame sampai stop()
+    def serve(self, stage, func, poll=0.05):
+        while not self.stop_event.is_set():
+            try:
+                index = self.receive(stage, timeout=poll)
+            except queue.Empty:
+                continue
+            func(self, index)
+            self.forward(stage, index)
+
+    def stop(self):
+        self.stop_event.set()
+
+    def close(self):
+        self.stop()
+        self.ring.close()
+
+
+# Fungsi stage deteksi: deteksi tag di frame slot dan tulis hasilnya ke
+# tabel hasil slot yang sama
+class DetectStage:
+    def __init__(self, detector=None):
+        if detector is None:
+            from detection import TagDetector
+
+            detector = TagDetector()
+        self.detector = detector
+
+    def __call__(self, pipeline, index):
+        pipeline.ring.write_results(index, self.detector.detect(pipeline.ring.frame(index)))
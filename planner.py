@@ -0,0 +1,283 @@
+from collections import OrderedDict
+import numpy as np
+from kinematics import unicycle_to_wheels
+
+# Perencana jalur di occupancy grid (arena.OccupancyGrid). Untuk setiap
+# tujuan dihitung satu distance field (Dijkstra dari sel tujuan ke seluruh
+# sel bebas, 8-tetangga, tanpa memotong sudut rintangan). Jalur terpendek
+# dari posisi mana pun cukup mengikuti turunan tercuram field itu, jadi
+# banyak robot yang menuju stasiun yang sama memakai satu ekspansi wavefront.
+# Field disimpan di cache LRU per sel tujuan.
+#
+# Ekspansi wavefront dijalankan vektor: di setiap iterasi seluruh frontier
+# merelaksasi 8 tetangganya sekaligus dan sel yang jaraknya membaik menjadi
+# frontier berikutnya (label-correcting), sampai tidak ada yang membaik.
+
+# Offset tetangga (baris, kolom) dan biayanya dalam satuan sel
+_NEIGHBORS = np.array([(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)])
+_COSTS = np.hypot(_NEIGHBORS[:, 0], _NEIGHBORS[:, 1])
+
+# Toleransi (satuan sel) untuk titik yang jatuh tepat di garis grid
+_EDGE = 1e-9
+
+
+# Perbesar rintangan dengan lingkaran berjari-jari radius sel
+def inflate(cells, radius):
+    cells = np.asarray(cells, dtype=bool)
+    reach = int(np.ceil(radius))
+    if reach <= 0:
+        return cells.copy()
+    height, width = cells.shape
+    padded = np.pad(cells, reach)
+    inflated = np.zeros_like(cells)
+    for dr in range(-reach, reach + 1):
+        for dc in range(-reach, reach + 1):
+            if dr * dr + dc * dc <= radius * radius:
+                inflated |= padded[reach + dr:reach + dr + height, reach + dc:reach + dc + width]
+    return inflated
+
+
+# Mask (F, 8) langkah yang sah dari sel datar cells di grid berbingkai:
+# sel tujuan bebas, dan langkah diagonal hanya bila kedua sel ortogonalnya
+# juga bebas
+def _moves(passable, cells, stride):
+    ok = passable[cells[:, None] + _NEIGHBORS[:, 0] * stride + _NEIGHBORS[:, 1]]
+    for k in np.flatnonzero((_NEIGHBORS != 0).all(axis=1)):
+        dr, dc = _NEIGHBORS[k]
+        ok[:, k] &= passable[cells + dr * stride] & passable[cells + dc]
+    return ok
+
+
+# Jarak Dijkstra (satuan sel) dari sel goal = (baris, kolom) ke setiap sel
+# bebas; inf untuk sel terisi atau tak terjangkau
+def distance_field(free, goal):
+    free = np.asarray(free, dtype=bool)
+    height, width = free.shape
+    stride = width + 2
+    passable = np.pad(free, 1).ravel()
+    offsets = _NEIGHBORS[:, 0] * stride + _NEIGHBORS[:, 1]
+
+    distance = np.full(passable.size, np.inf)
+    start = (goal[0] + 1) * stride + goal[1] + 1
+    if passable[start]:
+        distance[start] = 0.0
+        frontier = np.array([start])
+    else:
+        frontier = np.empty(0, dtype=np.intp)
+
+    while frontier.size:
+        neighbors = frontier[:, None] + offsets
+        ok = _moves(passable, frontier, stride)
+        candidate = distance[frontier][:, None] + _COSTS
+        neighbors, candidate = neighbors[ok], candidate[ok]
+        better = candidate < distance[neighbors]
+        neighbors, candidate = neighbors[better], candidate[better]
+        np.minimum.at(distance, neighbors, candidate)
+        frontier = np.unique(neighbors)
+
+    return distance.reshape(height + 2, stride)[1:-1, 1:-1]
+
+
+# Turuni distance field dari sel-sel awal (K, 2) sekaligus sampai tujuan;
+# kembalikan daftar array sel (M, 2) per awal, None bila tak terjangkau
+def descend(field, starts):
+    height, width = field.shape
+    stride = width + 2
+    padded = np.pad(field, 1, constant_values=np.inf).ravel()
+    passable = np.isfinite(padded)
+    offsets = _NEIGHBORS[:, 0] * stride + _NEIGHBORS[:, 1]
+
+    starts = np.asarray(starts, dtype=np.intp).reshape(-1, 2)
+    current = (starts[:, 0] + 1) * stride + starts[:, 1] + 1
+    paths = [[cell] for cell in current]
+    reachable = np.isfinite(padded[current])
+    active = np.flatnonzero(reachable & (padded[current] > 0))
+    while active.size:
+        # Tetangga dengan biaya langkah + jarak sisa terkecil adalah
+        # pendahulu pada jalur terpendek
+        neighbors = current[active, None] + offsets
+        cost = np.where(_moves(passable, current[active], stride), padded[neighbors] + _COSTS, np.inf)
+        best = np.argmin(cost, axis=1)
+        current[active] = neighbors[np.arange(active.size), best]
+        for k, cell in zip(active, current[active]):
+            paths[k].append(cell)
+        active = active[padded[current[active]] > 0]
+
+    result = []
+    for path, ok in zip(paths, reachable):
+        if not ok:
+            result.append(None)
+            continue
+        flat = np.array(path)
+        result.append(np.column_stack((flat // stride - 1, flat % stride - 1)))
+    return result
+
+
+# Sel (baris, kolom) yang disentuh segmen tertutup a-b (supercover): segmen
+# dipotong di setiap perpotongan dengan garis grid, lalu titik tengah setiap
+# potongan dan setiap titik potong (termasuk ujung segmen) dipetakan ke semua
+# sel yang menyentuhnya. Segmen yang melewati tepat sudut sel atau berjalan
+# di atas garis grid ikut menandai sel di kedua sisinya.
+def segment_cells(a, b, grid):
+    origin = np.asarray(grid.origin)
+    g0 = (np.asarray(a, dtype=float) - origin) / grid.resolution
+    g1 = (np.asarray(b, dtype=float) - origin) / grid.resolution
+    d = g1 - g0
+
+    crossings = [np.array([0.0, 1.0])]
+    for axis in (0, 1):
+        if d[axis] != 0:
+            lo, hi = sorted((g0[axis], g1[axis]))
+            lines = np.arange(np.floor(lo) + 1, np.ceil(hi))
+            crossings.append((lines - g0[axis]) / d[axis])
+    t = np.unique(np.concatenate(crossings))
+    t = np.concatenate((t, 0.5 * (t[:-1] + t[1:])))
+    points = g0 + t[:, None] * d
+
+    # Titik di atas garis grid menyentuh sel di kedua sisi garis
+    low = np.floor(points - _EDGE).astype(np.intp)
+    high = np.floor(points + _EDGE).astype(np.intp)
+    cols = np.concatenate((low[:, 0], low[:, 0], high[:, 0], high[:, 0]))
+    rows = np.concatenate((low[:, 1], high[:, 1], low[:, 1], high[:, 1]))
+    return rows, cols
+
+
+# Apakah segmen lurus a-b hanya menyentuh sel bebas
+def _visible(a, b, free, grid):
+    rows, cols = segment_cells(a, b, grid)
+    height, width = free.shape
+    if rows.min() < 0 or cols.min() < 0 or rows.max() >= height or cols.max() >= width:
+        return False
+    return bool(free[rows, cols].all())
+
+
+# Pangkas jalur sel (string pulling): dari setiap titik jangkar langsung ke
+# titik terjauh yang masih terlihat lurus melalui sel bebas. Titik terjauh
+# dicari dengan bisection, jadi per jangkar hanya O(log M) segmen diperiksa;
+# titik sesudah jangkar selalu terlihat (sel bertetangga).
+def shortcut(points, free, grid):
+    points = np.asarray(points, dtype=float)
+    kept = [0]
+    anchor = 0
+    last = len(points) - 1
+    while anchor < last:
+        low, high = anchor + 1, last
+        while low < high:
+            middle = (low + high + 1) // 2
+            if _visible(points[anchor], points[middle], free, grid):
+                low = middle
+            else:
+                high = middle - 1
+        anchor = low
+        kept.append(anchor)
+    return points[kept]
+
+
+class GridPlanner:
+    # clearance: jarak minimum (meter) dari rintangan, biasanya body_radius;
+    # cache_size: jumlah distance field tujuan yang disimpan
+    def __init__(self, grid, clearance=0.0, cache_size=16):
+        if cache_size < 1:
+            raise ValueError("cache_size minimal 1")
+        self.grid = grid
+        self.clearance = clearance
+        self.cache_size = cache_size
+        self.free = ~inflate(grid.cells, clearance / grid.resolution)
+        self._fields = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # Distance field (meter) untuk tujuan (x, y) dunia, dari cache bila ada
+    def field(self, goal):
+        row, col = (int(v) for v in self.grid.world_to_cell(*goal))
+        height, width = self.free.shape
+        if not (0 <= row < height and 0 <= col < width):
+            raise ValueError(f"tujuan {goal} berada di luar grid")
+
+        key = (row, col)
+        field = self._fields.get(key)
+        if field is not None:
+            self._fields.move_to_end(key)
+            self.hits += 1
+            return field
+
+        self.misses += 1
+        field = distance_field(self.free, key) * self.grid.resolution
+        self._fields[key] = field
+        if len(self._fields) > self.cache_size:
+            self._fields.popitem(last=False)
+        return field
+
+    def clear_cache(self):
+        self._fields.clear()
+
+    # Jalur (M, 2) dunia untuk setiap awal (K, 2) menuju goal; titik pertama
+    # posisi awal, titik terakhir goal. None bila tak terjangkau.
+    def plan_many(self, starts, goal):
+        starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+        field = self.field(goal)
+        rows, cols = self.grid.world_to_cell(starts[:, 0], starts[:, 1])
+        height, width = field.shape
+        inside = (rows >= 0) & (rows < height) & (cols >= 0) & (cols < width)
+        cells = np.column_stack((np.clip(rows, 0, height - 1), np.clip(cols, 0, width - 1)))
+
+        paths = []
+        for start, ok, cells_path in zip(starts, inside, descend(field / self.grid.resolution, cells)):
+            if not ok or cells_path is None:
+                paths.append(None)
+                continue
+            x, y = self.grid.cell_to_world(cells_path[:, 0], cells_path[:, 1])
+            points = np.column_stack((x, y))
+            points[0] = start
+            points[-1] = goal
+            paths.append(shortcut(points, self.free, self.grid))
+        return paths
+
+    def plan(self, start, goal):
+        return self.plan_many([start], goal)[0]
+
+
+# Pengikut jalur untuk satu robot differential drive: titik sasaran adalah
+# waypoint pertama yang lebih jauh dari lookahead, kecepatan sudut sebanding
+# dengan selisih heading ke sasaran, dan kecepatan translasi diperlambat saat
+# heading belum searah atau tujuan sudah dekat. Hasilnya kecepatan roda untuk
+# RobotSimulation.set_wheel_speeds / FleetSimulator.set_wheel_speeds.
+class PathFollower:
+    def __init__(self, path, left_radius, right_radius, body_radius, speed=0.5, lookahead=0.3, gain=2.0,
+                 tolerance=0.05, max_wheel_speed=None):
+        self.path = np.asarray(path, dtype=float)
+        self.left_radius = left_radius
+        self.right_radius = right_radius
+        self.body_radius = body_radius
+        self.speed = speed
+        self.lookahead = lookahead
+        self.gain = gain
+        self.tolerance = tolerance
+        self.max_wheel_speed = max_wheel_speed
+        self.index = 0
+        self.done = False
+
+    # Kecepatan roda (left_speed, right_speed) untuk pose saat ini
+    def command(self, x, y, theta):
+        goal = self.path[-1]
+        remaining = np.hypot(goal[0] - x, goal[1] - y)
+        if self.done or remaining < self.tolerance:
+            self.done = True
+            return 0.0, 0.0
+
+        last = len(self.path) - 1
+        while self.index < last and np.hypot(*(self.path[self.index] - (x, y))) < self.lookahead:
+            self.index += 1
+        target = self.path[self.index]
+
+        error = np.arctan2(target[1] - y, target[0] - x) - theta
+        error = (error + np.pi) % (2 * np.pi) - np.pi
+        omega = self.gain * error
+        v = min(self.speed, self.gain * remaining) * max(np.cos(error), 0.0)
+
+        left, right = unicycle_to_wheels(v, omega, self.left_radius, self.right_radius, self.body_radius)
+        if self.max_wheel_speed is not None:
+            scale = max(abs(left), abs(right)) / self.max_wheel_speed
+            if scale > 1:
+                left, right = left / scale, right / scale
+        return float(left), float(right)
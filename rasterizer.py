@@ -0,0 +1,122 @@
+import numpy as np
+from tags import FAMILY_SIZE, TAG_CELLS, tag_texture
+
+# Rasterizer top-down (ortografis) untuk footprint tag seluruh armada.
+# Untuk setiap heading terkuantisasi (headings bin per putaran) disiapkan
+# sekali daftar offset piksel (baris, kolom) yang tertutup tag persegi yang
+# sudah diputar, beserta indeks sel tekstur di setiap piksel. Menggambar N
+# robot lalu cukup satu gather stamp per heading robot dan satu scatter ke
+# gambar, tanpa loop Python per robot.
+
+
+class FootprintRasterizer:
+    def __init__(self, width, height, extent=(-10.0, 10.0, -10.0, 10.0), tag_size=0.15, headings=72,
+                 background=153):
+        xmin, xmax, ymin, ymax = extent
+        if xmax <= xmin or ymax <= ymin:
+            raise ValueError("extent harus berbentuk (xmin, xmax, ymin, ymax) dengan xmin < xmax dan ymin < ymax")
+        if headings < 1:
+            raise ValueError("jumlah heading minimal 1")
+
+        self.width = int(width)
+        self.height = int(height)
+        self.extent = tuple(float(e) for e in extent)
+        self.tag_size = float(tag_size)
+        self.headings = int(headings)
+        self.background = background
+
+        # Skala piksel per meter; baris 0 berada di ymax (Y ke atas)
+        self.sx = self.width / (xmax - xmin)
+        self.sy = self.height / (ymax - ymin)
+
+        self._build_stamps()
+        self._textures = np.stack([tag_texture(i).ravel() for i in range(FAMILY_SIZE)])
+        self._textures = (self._textures * 255).astype(np.uint8)
+
+    # Stamp per heading: offset baris/kolom (headings, M) dan indeks sel
+    # tekstur (headings, M). Stamp yang lebih pendek dari M dipad dengan
+    # elemen pertamanya (menulis piksel yang sama dua kali tidak berpengaruh);
+    # stamp_valid menandai elemen yang bukan padding.
+    def _build_stamps(self):
+        half = self.tag_size / 2
+        reach = int(np.ceil(half * np.sqrt(2) * max(self.sx, self.sy))) + 1
+        dr, dc = np.mgrid[-reach:reach + 1, -reach:reach + 1]
+        dx = dc.ravel() / self.sx
+        dy = -dr.ravel() / self.sy
+
+        stamps = []
+        for k in range(self.headings):
+            angle = 2 * np.pi * k / self.headings
+            c, s = np.cos(angle), np.sin(angle)
+            u = (c * dx + s * dy) / self.tag_size + 0.5
+            w = 0.5 - (c * dy - s * dx) / self.tag_size
+            inside = np.flatnonzero((u >= 0) & (u < 1) & (w >= 0) & (w < 1))
+            cells = (w[inside] * TAG_CELLS).astype(np.intp) * TAG_CELLS + (u[inside] * TAG_CELLS).astype(np.intp)
+            stamps.append((dr.ravel()[inside], dc.ravel()[inside], cells))
+
+        size = max(max(len(stamp[0]) for stamp in stamps), 1)
+        self.stamp_rows = np.zeros((self.headings, size), dtype=np.intp)
+        self.stamp_cols = np.zeros((self.headings, size), dtype=np.intp)
+        self.stamp_cells = np.zeros((self.headings, size), dtype=np.intp)
+        self.stamp_valid = np.zeros((self.headings, size), dtype=bool)
+        for k, (rows, cols, cells) in enumerate(stamps):
+            for target, values in ((self.stamp_rows, rows), (self.stamp_cols, cols), (self.stamp_cells, cells)):
+                target[k, :len(values)] = values
+                target[k, len(values):] = values[0] if len(values) else 0
+            self.stamp_valid[k, :len(rows)] = True
+        self.stamp_offsets = self.stamp_rows * self.width + self.stamp_cols
+        self.reach = reach
+
+    # Pusat piksel dan bin heading setiap robot
+    def _locate(self, x, y, theta):
+        xmin, _, _, ymax = self.extent
+        cols = np.rint((np.asarray(x, dtype=float) - xmin) * self.sx - 0.5).astype(np.intp)
+        rows = np.rint((ymax - np.asarray(y, dtype=float)) * self.sy - 0.5).astype(np.intp)
+        bins = np.rint(np.asarray(theta, dtype=float) * (self.headings / (2 * np.pi))).astype(np.intp) % self.headings
+        return np.atleast_1d(rows), np.atleast_1d(cols), np.atleast_1d(bins)
+
+    # Indeks piksel datar (N, M) semua stamp, beserta mask piksel di dalam
+    # gambar (None bila semua robot jauh dari tepi)
+    def _pixels(self, rows, cols, bins):
+        index = (rows * self.width + cols)[:, None] + self.stamp_offsets[bins]
+        inside = None
+        if (rows.min() < self.reach or cols.min() < self.reach
+                or rows.max() >= self.height - self.reach or cols.max() >= self.width - self.reach):
+            r = rows[:, None] + self.stamp_rows[bins]
+            c = cols[:, None] + self.stamp_cols[bins]
+            inside = (r >= 0) & (r < self.height) & (c >= 0) & (c < self.width)
+        return index, inside
+
+    # Gambar tag semua robot ke frame uint8 (height, width). Tag yang saling
+    # tumpang tindih: robot dengan indeks lebih besar menang.
+    def render(self, x, y, theta, tag_ids=None, out=None):
+        rows, cols, bins = self._locate(x, y, theta)
+        if out is None:
+            out = np.empty((self.height, self.width), dtype=np.uint8)
+        out.fill(self.background)
+        if rows.size == 0:
+            return out
+
+        if tag_ids is None:
+            tag_ids = np.arange(rows.size) % FAMILY_SIZE
+        index, inside = self._pixels(rows, cols, bins)
+        values = self._textures[np.asarray(tag_ids)[:, None], self.stamp_cells[bins]]
+        flat = out.reshape(-1)
+        if inside is None:
+            flat[index] = values
+        else:
+            flat[index[inside]] = values[inside]
+        return out
+
+    # Jumlah robot yang menutupi setiap piksel (occupancy), int32 (height, width)
+    def occupancy(self, x, y, theta):
+        rows, cols, bins = self._locate(x, y, theta)
+        if rows.size == 0:
+            return np.zeros((self.height, self.width), dtype=np.int32)
+
+        index, inside = self._pixels(rows, cols, bins)
+        # Piksel padding stamp tidak boleh dihitung dua kali
+        valid = self.stamp_valid[bins]
+        if inside is not None:
+            valid = valid & inside
+        return np.bincount(index[valid], minlength=self.height * self.width).astype(np.int32).reshape(self.height, self.width)
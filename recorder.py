@@ -0,0 +1,162 @@
+import queue
+import threading
+import zlib
+import numpy as np
+from trajectory_buffer import FIELDS
+from trajectory_file import DTYPE, TrajectoryFormatError, TrajectoryWriter, read_header, write_header
+
+# Perekam trajektori di thread terpisah. Loop simulasi hanya memasukkan blok
+# sampel ke antrean berukuran tetap (tanpa menunggu); thread perekam
+# mengumpulkannya menjadi chunk, mengompresi dengan zlib, lalu menulis ke
+# file. Jika antrean penuh, blok dibuang dan dihitung di `dropped`, sehingga
+# perekaman tidak pernah menghentikan simulasi maupun event loop Tk. Untuk
+# run offline yang harus lengkap, blocking=True membuat record() menunggu.
+#
+# File memakai header trajectory_file dengan "encoding": "zlib-chunks",
+# diikuti chunk berformat: jumlah sampel (uint32), panjang data terkompresi
+# (uint32), lalu data float64 baris per sampel yang dikompresi.
+
+ENCODING = "zlib-chunks"
+_STOP = object()
+
+
+class TrajectoryRecorder:
+    def __init__(self, path, parameters=None, fields=FIELDS, chunk_size=65536, queue_size=256, level=1,
+                 blocking=False):
+        self.path = path
+        self.fields = tuple(fields)
+        self.chunk_size = chunk_size
+        self.level = level
+        self.blocking = blocking
+
+        self.recorded = 0  # sampel yang sudah masuk antrean
+        self.dropped = 0  # sampel yang dibuang karena antrean penuh
+        self.written = 0  # sampel yang sudah ditulis ke file
+        self.chunks = 0
+        self._flushed = None  # ukuran file pada flush() terakhir
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._file = open(path, "wb")
+        write_header(self._file, parameters, self.fields, encoding=ENCODING, chunk_size=chunk_size)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # Masukkan satu sampel (1-D) atau blok (len(fields), m); kembalikan False
+    # jika blok dibuang karena antrean penuh
+    def record(self, samples, copy=True):
+        samples = np.array(samples, dtype=DTYPE) if copy else np.asarray(samples, dtype=DTYPE)
+        if samples.ndim == 1:
+            samples = samples[:, None]
+        try:
+            self._queue.put(samples, block=self.blocking)
+        except queue.Full:
+            self.dropped += samples.shape[1]
+            return False
+        self.recorded += samples.shape[1]
+        return True
+
+    def _write_chunk(self, blocks):
+        data = np.ascontiguousarray(np.concatenate(blocks, axis=1).T)
+        compressed = zlib.compress(data.tobytes(), self.level)
+        self._file.write(np.array([data.shape[0], len(compressed)], dtype="<u4").tobytes())
+        self._file.write(compressed)
+        self.written += data.shape[0]
+        self.chunks += 1
+
+    def _run(self):
+        pending = []
+        count = 0
+        while True:
+            block = self._queue.get()
+            if block is _STOP:
+                break
+
+            # Permintaan flush(): tulis sisa blok sebagai chunk pendek
+            if isinstance(block, threading.Event):
+                if pending:
+                    self._write_chunk(pending)
+                pending = []
+                count = 0
+                self._file.flush()
+                self._flushed = self._file.tell()
+                block.set()
+                continue
+
+            pending.append(block)
+            count += block.shape[1]
+
+            # Tulis chunk berukuran tetap; sisa blok dibawa ke chunk berikutnya
+            while count >= self.chunk_size:
+                merged = np.concatenate(pending, axis=1)
+                self._write_chunk([merged[:, :self.chunk_size]])
+                rest = merged[:, self.chunk_size:]
+                pending = [rest] if rest.shape[1] else []
+                count = rest.shape[1]
+
+        if pending:
+            self._write_chunk(pending)
+        self._file.flush()
+
+    # Tunggu sampai semua sampel yang sudah masuk antrean ditulis ke file;
+    # kembalikan ukuran file saat itu. Perekaman berjalan terus sesudahnya.
+    def flush(self):
+        if self._thread is None:
+            return self._flushed
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        return self._flushed
+
+    # Salin seluruh sampel yang sudah direkam ke file trajektori raw baru
+    # (bisa di-memmap dan diputar ulang) dengan header baru, tanpa
+    # menghentikan perekaman
+    def export(self, path, parameters=None, **extra):
+        end = self.flush()
+        with TrajectoryWriter(path, parameters, self.fields, **extra) as writer:
+            for chunk in iter_chunks(self.path, end):
+                writer.append(chunk.T)
+
+    # Tunggu semua sampel di antrean ditulis, lalu tutup file
+    def close(self):
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        self._flushed = self._file.tell()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Iterasi chunk rekaman sebagai array (m, len(fields)), satu chunk per kali;
+# end membatasi pembacaan sampai offset byte tersebut (misalnya hasil
+# TrajectoryRecorder.flush() saat file masih ditulis)
+def iter_chunks(path, end=None):
+    header, offset = read_header(path)
+    if header.get("encoding") != ENCODING:
+        raise TrajectoryFormatError(f"{path} bukan rekaman {ENCODING}")
+
+    columns = len(header["fields"])
+    with open(path, "rb") as file:
+        file.seek(offset)
+        while end is None or file.tell() < end:
+            prefix = file.read(8)
+            if len(prefix) < 8:
+                break
+            count, length = np.frombuffer(prefix, dtype="<u4")
+            data = zlib.decompress(file.read(int(length)))
+            yield np.frombuffer(data, dtype=header["dtype"]).reshape(int(count), columns)
+
+
+# Baca seluruh rekaman sebagai (header, array (n, len(fields)))
+def read_recording(path):
+    header, _ = read_header(path)
+    chunks = list(iter_chunks(path))
+    if not chunks:
+        return header, np.empty((0, len(header["fields"])))
+    return header, np.concatenate(chunks)
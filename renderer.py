@@ -0,0 +1,231 @@
+import numpy as np
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.path import Path
+from matplotlib.transforms import IdentityTransform
+
+# Renderer inkremental untuk animasi robot. Semua artist (jalur, penanda robot,
+# garis body, label) dibuat sekali dengan animated=True, lalu setiap frame
+# hanya datanya yang diperbarui lewat set_data sehingga FuncAnimation bisa
+# memakai blitting (blit=True) tanpa ax.clear().
+
+
+class RobotRenderer:
+    def __init__(self, ax, body_radius=None, path=True, heading=False, label=False, color='b'):
+        self.ax = ax
+        self.body_radius = body_radius
+        self.artists = []
+        self._limits = None
+
+        # Jalur yang diikuti robot
+        self.path_line = None
+        if path:
+            self.path_line, = ax.plot([], [], color + '-', animated=True)
+            self.artists.append(self.path_line)
+
+        # Garis body robot searah orientasi
+        self.heading_line = None
+        if heading:
+            self.heading_line, = ax.plot([], [], color + '-', animated=True)
+            self.artists.append(self.heading_line)
+
+        # Posisi robot
+        self.marker, = ax.plot([], [], color + 'o', animated=True)
+        self.artists.append(self.marker)
+
+        # Label parameter; diletakkan di dalam axes karena blitting hanya
+        # menyalin area axes
+        self.label = None
+        if label:
+            self.label = ax.text(0.02, 0.98, "", transform=ax.transAxes, va='top', ha='left', animated=True)
+            self.artists.append(self.label)
+
+    # Dipakai sebagai init_func FuncAnimation
+    def init(self):
+        return self.artists
+
+    # Perbarui data artist dan kembalikan artist yang berubah untuk blitting
+    def update(self, x, y, theta, x_path=None, y_path=None, text=None):
+        if self.path_line is not None and x_path is not None:
+            self.path_line.set_data(x_path, y_path)
+
+        if self.heading_line is not None:
+            dx = self.body_radius * np.cos(theta)
+            dy = self.body_radius * np.sin(theta)
+            self.heading_line.set_data([x - dx, x + dx], [y - dy, y + dy])
+
+        self.marker.set_data([x], [y])
+
+        if self.label is not None and text is not None:
+            self.label.set_text(text)
+
+        return self.artists
+
+    # Ubah batas sumbu. Background blitting hanya perlu digambar ulang penuh
+    # saat batas benar-benar berubah (termasuk label tick di luar axes).
+    def set_limits(self, xlim, ylim):
+        limits = (tuple(xlim), tuple(ylim))
+        if limits == self._limits:
+            return False
+
+        self._limits = limits
+        self.ax.set_xlim(*limits[0])
+        self.ax.set_ylim(*limits[1])
+        self.ax.figure.canvas.draw()
+        return True
+
+
+# Renderer armada dengan jumlah artist tetap, berapa pun jumlah robotnya:
+# semua penanda robot dalam satu PathCollection dan semua jejak dalam satu
+# LineCollection. Vertex path kedua koleksi adalah view ke array milik
+# renderer, jadi update() hanya menulis array itu secara vektor tanpa
+# membuat objek Path baru.
+#
+# Jejak setiap robot disimpan sebagai ring buffer trail + 1 slot ditambah
+# satu slot cermin di ujung (salinan slot 0) supaya polyline tetap
+# tersambung melewati batas ring. Slot sesudah sampel terbaru diisi NaN
+# sehingga garis terputus di antara sampel terbaru dan terlama.
+class FleetRenderer:
+    # Penanda segitiga searah hadap robot, dalam satuan point
+    MARKER = np.array([[0.5, 0.0], [-0.3, 0.3], [-0.15, 0.0], [-0.3, -0.3], [0.5, 0.0]])
+
+    def __init__(self, ax, x, y, theta, trail=200, marker_size=12.0, label=False, color='b'):
+        x, y, theta = (np.asarray(a, dtype=float) for a in np.broadcast_arrays(x, y, theta))
+        self.ax = ax
+        self.n = x.size
+        self.trail = trail
+        self.artists = []
+        self._limits = None
+
+        # Jejak: (N, trail + 2, 2); semua slot diawali posisi awal robot
+        self.trails = None
+        if trail:
+            self._ring = trail + 1
+            self.trails = np.empty((self.n, self._ring + 1, 2))
+            self.trails[..., 0] = x[:, None]
+            self.trails[..., 1] = y[:, None]
+            self._head = 0
+            self.trail_lines = LineCollection(list(self.trails), colors=color, linewidths=1.0, animated=True)
+            ax.add_collection(self.trail_lines, autolim=False)
+            self.artists.append(self.trail_lines)
+
+        # Penanda: offset = posisi robot (koordinat data), path = segitiga
+        # yang sudah diputar (satuan point, diskalakan oleh sizes)
+        self._marker_vertices = np.empty((self.n,) + self.MARKER.shape)
+        codes = np.full(len(self.MARKER), Path.LINETO, dtype=Path.code_type)
+        codes[0] = Path.MOVETO
+        codes[-1] = Path.CLOSEPOLY
+        paths = [Path(vertices, codes) for vertices in self._marker_vertices]
+        self.markers = PathCollection(paths, sizes=[marker_size ** 2], offsets=np.column_stack((x, y)),
+                                      offset_transform=ax.transData, transform=IdentityTransform(),
+                                      facecolors=color, edgecolors='none', animated=True)
+        ax.add_collection(self.markers, autolim=False)
+        self.artists.append(self.markers)
+        self._rotate(theta)
+
+        self.label = None
+        if label:
+            self.label = ax.text(0.02, 0.98, "", transform=ax.transAxes, va='top', ha='left', animated=True)
+            self.artists.append(self.label)
+
+    # Putar penanda sesuai heading di layar (skala sumbu x dan y bisa berbeda)
+    def _rotate(self, theta):
+        matrix = self.ax.transData.get_affine().get_matrix()
+        heading = np.arctan2(matrix[1, 1] * np.sin(theta), matrix[0, 0] * np.cos(theta))
+        c = np.cos(heading)[:, None]
+        s = np.sin(heading)[:, None]
+        mx, my = self.MARKER[:, 0], self.MARKER[:, 1]
+        self._marker_vertices[..., 0] = c * mx - s * my
+        self._marker_vertices[..., 1] = s * mx + c * my
+
+    def init(self):
+        return self.artists
+
+    # Tambahkan pose terbaru ke jejak dan pindahkan penanda
+    def update(self, x, y, theta, text=None):
+        if self.trails is not None:
+            self._head = (self._head + 1) % self._ring
+            head = self._head
+            self.trails[:, head, 0] = x
+            self.trails[:, head, 1] = y
+            self.trails[:, (head + 1) % self._ring] = np.nan
+            # Slot cermin mengikuti slot 0
+            if head == 0 or (head + 1) % self._ring == 0:
+                self.trails[:, -1] = self.trails[:, 0]
+            self.trail_lines.stale = True
+
+        self.markers.set_offsets(np.column_stack((x, y)))
+        self._rotate(np.asarray(theta, dtype=float))
+        self.markers.stale = True
+
+        if self.label is not None and text is not None:
+            self.label.set_text(text)
+        return self.artists
+
+    set_limits = RobotRenderer.set_limits
+
+
+# Bounding box jalur yang diperbarui secara berjalan, O(1) per sampel
+# (menggantikan min()/max() atas seluruh list setiap frame)
+class BoundsTracker:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.xmin = self.ymin = np.inf
+        self.xmax = self.ymax = -np.inf
+
+    def add(self, x, y):
+        if x < self.xmin:
+            self.xmin = x
+        if x > self.xmax:
+            self.xmax = x
+        if y < self.ymin:
+            self.ymin = y
+        if y > self.ymax:
+            self.ymax = y
+
+    # Tambah banyak sampel sekaligus (array)
+    def extend(self, xs, ys):
+        if len(xs):
+            self.add(np.min(xs), np.min(ys))
+            self.add(np.max(xs), np.max(ys))
+
+    @property
+    def empty(self):
+        return self.xmin > self.xmax
+
+
+# Autoscale view dengan histeresis: batas sumbu hanya diubah saat robot
+# mendekati tepi view lebih dari margin. Saat rescale, view diberi ruang
+# tambahan (headroom) sebanding ukurannya sehingga untuk jalur yang terus
+# menjauh jumlah rescale hanya tumbuh logaritmik, dan view tidak bergetar
+# setiap frame.
+class ViewAutoscaler:
+    def __init__(self, margin=1.0, headroom=0.25):
+        self.margin = margin
+        self.headroom = headroom
+        self.bounds = BoundsTracker()
+        self.xlim = None
+        self.ylim = None
+
+    def reset(self):
+        self.bounds.reset()
+        self.xlim = self.ylim = None
+
+    def _inside(self, x, y):
+        return (self.xlim[0] <= x - self.margin and x + self.margin <= self.xlim[1]
+                and self.ylim[0] <= y - self.margin and y + self.margin <= self.ylim[1])
+
+    # Tambahkan posisi baru; kembalikan (xlim, ylim) baru jika view harus
+    # diubah, atau None jika view lama masih cukup
+    def update(self, x, y):
+        self.bounds.add(x, y)
+        if self.xlim is not None and self._inside(x, y):
+            return None
+
+        b = self.bounds
+        xpad = self.headroom * (b.xmax - b.xmin)
+        ypad = self.headroom * (b.ymax - b.ymin)
+        self.xlim = (b.xmin - self.margin - xpad, b.xmax + self.margin + xpad)
+        self.ylim = (b.ymin - self.margin - ypad, b.ymax + self.margin + ypad)
+        return self.xlim, self.ylim
@@ -0,0 +1,89 @@
+import time
+import numpy as np
+from trajectory_buffer import FIELDS
+
+# Pemutaran ulang trajektori yang tersimpan tanpa mengintegrasikan ulang
+# model. Kolom waktu disalin sekali menjadi indeks kontigu, sehingga seek ke
+# timestamp mana pun cukup satu pencarian biner (O(log n)); pose di antara
+# dua sampel diinterpolasi linear. Sampel boleh berupa memmap dari
+# trajectory_file.TrajectoryFile.
+
+
+class TrajectoryReplay:
+    def __init__(self, samples, fields=FIELDS, speed=1.0, max_lag=0.25):
+        if len(samples) == 0:
+            raise ValueError("trajektori kosong")
+
+        self.samples = samples
+        self.fields = tuple(fields)
+        self._columns = [self.fields.index(name) for name in ("x", "y", "theta")]
+
+        # Indeks waktu (harus naik monoton)
+        self.times = np.ascontiguousarray(samples[:, self.fields.index("t")], dtype=float)
+        self.start_time = float(self.times[0])
+        self.end_time = float(self.times[-1])
+
+        self.speed = speed
+        self.max_lag = max_lag
+        self.playing = True
+        self.time = self.start_time
+        self._last_tick = None
+
+    @property
+    def duration(self):
+        return self.end_time - self.start_time
+
+    @property
+    def done(self):
+        return (self.speed >= 0 and self.time >= self.end_time) or (self.speed < 0 and self.time <= self.start_time)
+
+    # Indeks sampel terakhir dengan t <= time
+    def index_at(self, t):
+        return max(0, int(np.searchsorted(self.times, t, side="right")) - 1)
+
+    # Pose (x, y, theta) pada waktu t, diinterpolasi antar sampel
+    def pose_at(self, t):
+        t = min(max(t, self.start_time), self.end_time)
+        i = self.index_at(t)
+        a = self.samples[i, self._columns]
+        if i + 1 >= len(self.times) or self.times[i + 1] == self.times[i]:
+            return tuple(float(value) for value in a)
+
+        b = self.samples[i + 1, self._columns]
+        w = (t - self.times[i]) / (self.times[i + 1] - self.times[i])
+        return tuple(float(value) for value in a + w * (b - a))
+
+    # Pindah ke timestamp tertentu (dipakai juga untuk scrubbing)
+    def seek(self, t):
+        self.time = min(max(float(t), self.start_time), self.end_time)
+        self._last_tick = None
+
+    def set_speed(self, speed):
+        self.speed = speed
+
+    def play(self):
+        self.playing = True
+        self._last_tick = None
+
+    def pause(self):
+        self.playing = False
+
+    # Majukan waktu pemutaran sesuai waktu nyata dikali speed, lalu
+    # kembalikan pose saat ini
+    def tick(self):
+        now = time.perf_counter()
+        if self.playing and self._last_tick is not None:
+            elapsed = min(now - self._last_tick, self.max_lag)
+            self.seek(self.time + elapsed * self.speed)
+        self._last_tick = now
+        return self.pose_at(self.time)
+
+    # Sampel jalur (view) sampai waktu pemutaran saat ini, paling banyak n
+    # sampel terakhir
+    def trail(self, n=None):
+        stop = self.index_at(self.time) + 1
+        start = 0 if n is None else max(0, stop - n)
+        return self.samples[start:stop]
+
+    def column(self, name, rows):
+        return rows[:, self.fields.index(name)]
@@ -4,8 +4,19 @@ import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.animation import FuncAnimation
+from simulation import RobotSimulation, SimulationLoop
+from trajectory_buffer import TrajectoryBuffer
+from renderer import RobotRenderer
 
-def differential_drive_simulation(left_speed, left_radius, right_speed, right_radius, body_radius, initial_x, initial_y, initial_orientation):
+# Jumlah sampel jalur yang ditampilkan
+PATH_CAPACITY = 20000
+
+# Kelipatan waktu nyata untuk jam simulasi (None = secepat mungkin) dan
+# interval refresh tampilan dalam milidetik
+TIME_SCALE = 1.0
+FRAME_INTERVAL = 50
+
+def differential_drive_simulation(left_speed, left_radius, right_speed, right_radius, body_radius, initial_x, initial_y, initial_orientation, dt=0.1, total_time=10):
     # Konversi sudut ke radian
     initial_orientation_rad = np.radians(initial_orientation)
 
@@ -14,55 +25,47 @@ def differential_drive_simulation(left_speed, left_radius, right_speed, right_ra
     y = initial_y
     theta = initial_orientation_rad
 
-    # Inisialisasi list posisi x dan y untuk plotting jalur
-    x_plot = [x]
-    y_plot = [y]
-
-    # Waktu simulasi
-    total_time = 10  # Misalnya, simulasi berjalan selama 10 detik
-    dt = 0.1  # Interval waktu
-    times = np.arange(0, total_time, dt)
+    # Buffer trajektori berkapasitas tetap untuk plotting jalur
+    path = TrajectoryBuffer(PATH_CAPACITY)
 
     # Plotting
     fig, ax = plt.subplots()
     ax.set_aspect('equal', 'datalim')
+    ax.set_xlim(-10, 10)
+    ax.set_ylim(-10, 10)
+
+    # Artist robot dibuat sekali, setiap frame hanya datanya yang diperbarui
+    renderer = RobotRenderer(ax)
+
+    # Simulasi headless; jam simulasi dipisah dari frame rate animasi
+    # (dt = interval waktu, total_time = None berarti simulasi tanpa batas)
+    sim = RobotSimulation(left_speed, left_radius, right_speed, right_radius, body_radius, x, y, theta, path=path)
+    loop = SimulationLoop(sim, dt, time_scale=TIME_SCALE, horizon=total_time)
 
     # Fungsi untuk mengupdate posisi dan orientasi robot
     def update(frame):
         nonlocal x, y, theta
 
-        # Hitung kecepatan translasi (linear) masing-masing roda
-        v_left = left_speed * left_radius
-        v_right = right_speed * right_radius
-
-        # Hitung kecepatan translasi (linear) total dan kecepatan rotasi (angular) robot
-        v = (v_left + v_right) / 2
-        omega = (v_right - v_left) / body_radius
-
-        # Hitung perubahan posisi dan orientasi
-        dx = v * np.cos(theta) * dt
-        dy = v * np.sin(theta) * dt
-        dtheta = omega * dt
-
-        # Perbarui posisi dan orientasi
-        x += dx
-        y += dy
-        theta += dtheta
+        # Jalankan langkah fisika yang tertunda, lalu ambil salinan state
+        # terbaru yang konsisten (fisika bisa berjalan di thread latar)
+        loop.tick()
+        _, x, y, theta = loop.snapshot()
 
-        # Simpan posisi untuk plotting jalur
-        x_plot.append(x)
-        y_plot.append(y)
+        # Jalur digambar langsung dari view buffer; kolomnya hanya disalin
+        # di bawah lock bila thread latar bisa menulis buffer bersamaan
+        if loop.time_scale is None:
+            with loop.lock:
+                path_x = path.field('x').copy()
+                path_y = path.field('y').copy()
+        else:
+            path_x, path_y = path.field('x'), path.field('y')
 
         # Memplot posisi robot dan jalur yang diikuti
-        ax.clear()
-        ax.set_aspect('equal', 'datalim')
-        ax.plot(x_plot, y_plot, 'b-')
-        ax.plot(x, y, 'bo')
-        ax.set_xlim(-10, 10)
-        ax.set_ylim(-10, 10)
+        return renderer.update(x, y, theta, path_x, path_y)
 
     # Animasi
-    anim = FuncAnimation(fig, update, frames=times, repeat=False, blit=False)
+    anim = FuncAnimation(fig, update, frames=loop.frames(), init_func=renderer.init,
+                         interval=FRAME_INTERVAL, repeat=False, blit=True, cache_frame_data=False)
     return fig, anim
 
 def start_simulation():
@@ -91,45 +94,46 @@ def start_simulation():
     except ValueError:
         messagebox.showerror("Error", "Input harus berupa angka")
 
-# Membuat GUI
-window = tk.Tk()
-window.title("Simulasi Gerakan Mobile Robot Differential Drive")
+if __name__ == "__main__":
+    # Membuat GUI
+    window = tk.Tk()
+    window.title("Simulasi Gerakan Mobile Robot Differential Drive")
 
-# Membuat label dan entry untuk setiap parameter
-tk.Label(window, text="Kecepatan Roda Kiri:").grid(row=0, column=0)
-left_speed_entry = tk.Entry(window)
-left_speed_entry.grid(row=0, column=1)
+    # Membuat label dan entry untuk setiap parameter
+    tk.Label(window, text="Kecepatan Roda Kiri:").grid(row=0, column=0)
+    left_speed_entry = tk.Entry(window)
+    left_speed_entry.grid(row=0, column=1)
 
-tk.Label(window, text="Radius Roda Kiri:").grid(row=1, column=0)
-left_radius_entry = tk.Entry(window)
-left_radius_entry.grid(row=1, column=1)
+    tk.Label(window, text="Radius Roda Kiri:").grid(row=1, column=0)
+    left_radius_entry = tk.Entry(window)
+    left_radius_entry.grid(row=1, column=1)
 
-tk.Label(window, text="Kecepatan Roda Kanan:").grid(row=2, column=0)
-right_speed_entry = tk.Entry(window)
-right_speed_entry.grid(row=2, column=1)
+    tk.Label(window, text="Kecepatan Roda Kanan:").grid(row=2, column=0)
+    right_speed_entry = tk.Entry(window)
+    right_speed_entry.grid(row=2, column=1)
 
-tk.Label(window, text="Radius Roda Kanan:").grid(row=3, column=0)
-right_radius_entry = tk.Entry(window)
-right_radius_entry.grid(row=3, column=1)
+    tk.Label(window, text="Radius Roda Kanan:").grid(row=3, column=0)
+    right_radius_entry = tk.Entry(window)
+    right_radius_entry.grid(row=3, column=1)
 
-tk.Label(window, text="Radius Body:").grid(row=4, column=0)
-body_radius_entry = tk.Entry(window)
-body_radius_entry.grid(row=4, column=1)
+    tk.Label(window, text="Radius Body:").grid(row=4, column=0)
+    body_radius_entry = tk.Entry(window)
+    body_radius_entry.grid(row=4, column=1)
 
-tk.Label(window, text="Posisi X Awal:").grid(row=5, column=0)
-initial_x_entry = tk.Entry(window)
-initial_x_entry.grid(row=5, column=1)
+    tk.Label(window, text="Posisi X Awal:").grid(row=5, column=0)
+    initial_x_entry = tk.Entry(window)
+    initial_x_entry.grid(row=5, column=1)
 
-tk.Label(window, text="Posisi Y Awal:").grid(row=6, column=0)
-initial_y_entry = tk.Entry(window)
-initial_y_entry.grid(row=6, column=1)
+    tk.Label(window, text="Posisi Y Awal:").grid(row=6, column=0)
+    initial_y_entry = tk.Entry(window)
+    initial_y_entry.grid(row=6, column=1)
 
-tk.Label(window, text="Orientasi Awal (derajat):").grid(row=7, column=0)
-initial_orientation_entry = tk.Entry(window)
-initial_orientation_entry.grid(row=7, column=1)
+    tk.Label(window, text="Orientasi Awal (derajat):").grid(row=7, column=0)
+    initial_orientation_entry = tk.Entry(window)
+    initial_orientation_entry.grid(row=7, column=1)
 
-# Tombol untuk memulai simulasi
-start_button = tk.Button(window, text="Mulai Simulasi", command=start_simulation)
-start_button.grid(row=8, column=0, columnspan=2)
+    # Tombol untuk memulai simulasi
+    start_button = tk.Button(window, text="Mulai Simulasi", command=start_simulation)
+    start_button.grid(row=8, column=0, columnspan=2)
 
-window.mainloop()
+    window.mainloop()
@@ -4,14 +4,26 @@ import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.animation import FuncAnimation
+from simulation import RobotSimulation, SimulationLoop
+from trajectory_buffer import TrajectoryBuffer
+from renderer import RobotRenderer, ViewAutoscaler
+
+# Jumlah sampel jalur yang ditampilkan
+PATH_CAPACITY = 20000
+
+# Kelipatan waktu nyata untuk jam simulasi (None = secepat mungkin) dan
+# interval refresh tampilan dalam milidetik
+TIME_SCALE = 1.0
+FRAME_INTERVAL = 50
 
 # Variabel global untuk menyimpan objek animasi, widget canvas, posisi, dan orientasi terakhir
 anim_global = None
 canvas_widget = None
+loop_global = None
 last_position = None
 last_orientation = None
 
-def differential_drive_simulation(left_speed, left_radius, right_speed, right_radius, body_radius, initial_x, initial_y, initial_orientation):
+def differential_drive_simulation(left_speed, left_radius, right_speed, right_radius, body_radius, initial_x, initial_y, initial_orientation, dt=0.1, total_time=10):
     # Konversi sudut ke radian
     initial_orientation_rad = np.radians(initial_orientation)
 
@@ -26,55 +38,59 @@ def differential_drive_simulation(left_speed, left_radius, right_speed, right_ra
         y = last_position[1]
         theta = np.radians(last_orientation)
 
-    # Inisialisasi list posisi x dan y untuk plotting jalur
-    x_plot = [x]
-    y_plot = [y]
-
-    # Waktu simulasi
-    total_time = 10  # Misalnya, simulasi berjalan selama 10 detik
-    dt = 0.1  # Interval waktu
-    times = np.arange(0, total_time, dt)
+    # Buffer trajektori berkapasitas tetap untuk plotting jalur
+    path = TrajectoryBuffer(PATH_CAPACITY)
 
     # Plotting
     fig, ax = plt.subplots()
     ax.set_aspect('equal', adjustable='datalim')
     ax.invert_yaxis()  # Balik sumbu y agar sesuai dengan koordinat umum
 
-    # Fungsi untuk mengupdate posisi dan orientasi robot
-    def update(frame):
-        nonlocal x, y, theta
-
-        # Hitung kecepatan translasi (linear) masing-masing roda
-        v_left = left_speed * left_radius
-        v_right = right_speed * right_radius
+    # Artist robot dibuat sekali, setiap frame hanya datanya yang diperbarui
+    renderer = RobotRenderer(ax)
+    autoscaler = ViewAutoscaler(margin=1.0)
 
-        # Hitung kecepatan translasi (linear) total dan kecepatan rotasi (angular) robot
-        v = (v_left + v_right) / 2
-        omega = (v_right - v_left) / body_radius
+    # Simulasi headless; jam simulasi dipisah dari frame rate animasi
+    # (dt = interval waktu, total_time = None berarti simulasi tanpa batas)
+    sim = RobotSimulation(left_speed, left_radius, right_speed, right_radius, body_radius, x, y, theta, path=path)
+    loop = SimulationLoop(sim, dt, time_scale=TIME_SCALE, horizon=total_time)
 
-        # Hitung perubahan posisi dan orientasi
-        dx = v * np.cos(theta) * dt
-        dy = v * np.sin(theta) * dt
-        dtheta = omega * dt
+    # Simpan loop simulasi agar tombol stop/continue bisa menjeda jam simulasi;
+    # thread fisika latar dari loop sebelumnya dihentikan lebih dulu
+    global loop_global
+    if loop_global is not None:
+        loop_global.stop()
+    loop_global = loop
 
-        # Perbarui posisi dan orientasi
-        x += dx
-        y += dy
-        theta += dtheta
+    # Fungsi untuk mengupdate posisi dan orientasi robot
+    def update(frame):
+        nonlocal x, y, theta
 
-        # Simpan posisi untuk plotting jalur
-        x_plot.append(x)
-        y_plot.append(y)
+        # Jalankan langkah fisika yang tertunda, lalu ambil salinan state
+        # terbaru yang konsisten (fisika bisa berjalan di thread latar)
+        loop.tick()
+        _, x, y, theta = loop.snapshot()
+
+        # Jalur digambar langsung dari view buffer; kolomnya hanya disalin
+        # di bawah lock bila thread latar bisa menulis buffer bersamaan
+        if loop.time_scale is None:
+            with loop.lock:
+                path_x = path.field('x').copy()
+                path_y = path.field('y').copy()
+        else:
+            path_x, path_y = path.field('x'), path.field('y')
+
+        # Perbarui batas sumbu hanya jika robot mendekati tepi view
+        limits = autoscaler.update(x, y)
+        if limits is not None:
+            renderer.set_limits(*limits)
 
         # Memplot posisi robot dan jalur yang diikuti
-        ax.clear()
-        ax.plot(x_plot, y_plot, 'b-')
-        ax.plot(x, y, 'bo')
-        ax.set_xlim(min(x_plot) - 1, max(x_plot) + 1)
-        ax.set_ylim(min(y_plot) - 1, max(y_plot) + 1)
+        return renderer.update(x, y, theta, path_x, path_y)
 
     # Animasi
-    anim = FuncAnimation(fig, update, frames=times, repeat=False, blit=False)
+    anim = FuncAnimation(fig, update, frames=loop.frames(), init_func=renderer.init,
+                         interval=FRAME_INTERVAL, repeat=False, blit=True, cache_frame_data=False)
     return fig, anim
 
 def start_simulation():
@@ -116,6 +132,7 @@ def reset_simulation():
 
     anim_global.event_source.stop()
     anim_global = None
+    loop_global.stop()
 
     plt.close('all')
     canvas_widget.destroy()
@@ -144,6 +161,8 @@ def stop_simulation():
     last_position = (float(initial_x_entry.get()), float(initial_y_entry.get()))
     last_orientation = float(initial_orientation_entry.get())
 
+    # Hentikan juga thread fisika latar (mode TIME_SCALE = None)
+    loop_global.stop()
     anim_global.event_source.stop()
 
 def continue_simulation():
@@ -152,6 +171,8 @@ def continue_simulation():
         messagebox.showinfo("Info", "Tidak ada simulasi yang berhenti.")
         return
 
+    # Waktu nyata selama simulasi dihentikan tidak ikut disimulasikan
+    loop_global.pause()
     anim_global.event_source.start()
 
 def exit_program():
@@ -160,65 +181,66 @@ def exit_program():
         anim_global.event_source.stop()
     window.destroy()
 
-# Membuat GUI
-window = tk.Tk()
-window.title("Simulasi Gerakan Mobile Robot Differential Drive")
-window.attributes('-fullscreen', True)
+if __name__ == "__main__":
+    # Membuat GUI
+    window = tk.Tk()
+    window.title("Simulasi Gerakan Mobile Robot Differential Drive")
+    window.attributes('-fullscreen', True)
 
-# Frame untuk input
-input_frame = tk.Frame(window, padx=20, pady=20)
-input_frame.pack(side=tk.LEFT, fill=tk.Y)
+    # Frame untuk input
+    input_frame = tk.Frame(window, padx=20, pady=20)
+    input_frame.pack(side=tk.LEFT, fill=tk.Y)
 
-tk.Label(input_frame, text="Kecepatan Roda Kiri:").pack()
-left_speed_entry = tk.Entry(input_frame)
-left_speed_entry.pack()
+    tk.Label(input_frame, text="Kecepatan Roda Kiri:").pack()
+    left_speed_entry = tk.Entry(input_frame)
+    left_speed_entry.pack()
 
-tk.Label(input_frame, text="Radius Roda Kiri:").pack()
-left_radius_entry = tk.Entry(input_frame)
-left_radius_entry.pack()
+    tk.Label(input_frame, text="Radius Roda Kiri:").pack()
+    left_radius_entry = tk.Entry(input_frame)
+    left_radius_entry.pack()
 
-tk.Label(input_frame, text="Kecepatan Roda Kanan:").pack()
-right_speed_entry = tk.Entry(input_frame)
-right_speed_entry.pack()
+    tk.Label(input_frame, text="Kecepatan Roda Kanan:").pack()
+    right_speed_entry = tk.Entry(input_frame)
+    right_speed_entry.pack()
 
-tk.Label(input_frame, text="Radius Roda Kanan:").pack()
-right_radius_entry = tk.Entry(input_frame)
-right_radius_entry.pack()
+    tk.Label(input_frame, text="Radius Roda Kanan:").pack()
+    right_radius_entry = tk.Entry(input_frame)
+    right_radius_entry.pack()
 
-tk.Label(input_frame, text="Radius Body:").pack()
-body_radius_entry = tk.Entry(input_frame)
-body_radius_entry.pack()
+    tk.Label(input_frame, text="Radius Body:").pack()
+    body_radius_entry = tk.Entry(input_frame)
+    body_radius_entry.pack()
 
-tk.Label(input_frame, text="Posisi X Awal:").pack()
-initial_x_entry = tk.Entry(input_frame)
-initial_x_entry.pack()
+    tk.Label(input_frame, text="Posisi X Awal:").pack()
+    initial_x_entry = tk.Entry(input_frame)
+    initial_x_entry.pack()
 
-tk.Label(input_frame, text="Posisi Y Awal:").pack()
-initial_y_entry = tk.Entry(input_frame)
-initial_y_entry.pack()
+    tk.Label(input_frame, text="Posisi Y Awal:").pack()
+    initial_y_entry = tk.Entry(input_frame)
+    initial_y_entry.pack()
 
-tk.Label(input_frame, text="Orientasi Awal (derajat):").pack()
-initial_orientation_entry = tk.Entry(input_frame)
-initial_orientation_entry.pack()
+    tk.Label(input_frame, text="Orientasi Awal (derajat):").pack()
+    initial_orientation_entry = tk.Entry(input_frame)
+    initial_orientation_entry.pack()
 
-# Frame untuk plotting
-plot_frame = tk.Frame(window)
-plot_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+    # Frame untuk plotting
+    plot_frame = tk.Frame(window)
+    plot_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
 
-# Tombol untuk memulai simulasi, reset, stop, lanjutkan, dan keluar
-start_button = tk.Button(window, text="Mulai Simulasi", command=start_simulation)
-start_button.pack(side=tk.BOTTOM)
+    # Tombol untuk memulai simulasi, reset, stop, lanjutkan, dan keluar
+    start_button = tk.Button(window, text="Mulai Simulasi", command=start_simulation)
+    start_button.pack(side=tk.BOTTOM)
 
-reset_button = tk.Button(window, text="Reset", command=reset_simulation)
-reset_button.pack(side=tk.BOTTOM)
+    reset_button = tk.Button(window, text="Reset", command=reset_simulation)
+    reset_button.pack(side=tk.BOTTOM)
 
-stop_button = tk.Button(window, text="Stop", command=stop_simulation)
-stop_button.pack(side=tk.BOTTOM)
+    stop_button = tk.Button(window, text="Stop", command=stop_simulation)
+    stop_button.pack(side=tk.BOTTOM)
 
-continue_button = tk.Button(window, text="Lanjutkan Simulasi", command=continue_simulation)
-continue_button.pack(side=tk.BOTTOM)
+    continue_button = tk.Button(window, text="Lanjutkan Simulasi", command=continue_simulation)
+    continue_button.pack(side=tk.BOTTOM)
 
-exit_button = tk.Button(window, text="Keluar", command=exit_program)
-exit_button.pack(side=tk.BOTTOM)
+    exit_button = tk.Button(window, text="Keluar", command=exit_program)
+    exit_button.pack(side=tk.BOTTOM)
 
-window.mainloop()
+    window.mainloop()
@@ -4,11 +4,22 @@ import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.animation import FuncAnimation
-import pickle
+from simulation import RobotSimulation, SimulationLoop
+from trajectory_buffer import TrajectoryBuffer
+from renderer import RobotRenderer, ViewAutoscaler
+
+# Jumlah sampel jalur yang ditampilkan
+PATH_CAPACITY = 20000
+
+# Kelipatan waktu nyata untuk jam simulasi (None = secepat mungkin) dan
+# interval refresh tampilan dalam milidetik
+TIME_SCALE = 1.0
+FRAME_INTERVAL = 50
 
 # Variabel global untuk menyimpan objek animasi, widget canvas, posisi, dan orientasi terakhir
 anim_global = None
 canvas_widget = None
+loop_global = None
 last_position = None
 last_orientation = None
 
@@ -28,7 +39,7 @@ saved_values = {
 linear_speed = 0
 angular_speed = 0
 
-def differential_drive_simulation(left_speed, left_radius, right_speed, right_radius, body_radius, initial_x, initial_y, initial_orientation):
+def differential_drive_simulation(left_speed, left_radius, right_speed, right_radius, body_radius, initial_x, initial_y, initial_orientation, dt=0.1, total_time=10):
     # Konversi sudut ke radian
     initial_orientation_rad = np.radians(initial_orientation)
 
@@ -37,65 +48,65 @@ def differential_drive_simulation(left_speed, left_radius, right_speed, right_ra
     y = initial_y
     theta = initial_orientation_rad
 
-    # Inisialisasi list posisi x dan y untuk plotting jalur
-    x_plot = [x]
-    y_plot = [y]
-
-    # Waktu simulasi
-    total_time = 10  # Misalnya, simulasi berjalan selama 10 detik
-    dt = 0.1  # Interval waktu
-    times = np.arange(0, total_time, dt)
+    # Buffer trajektori berkapasitas tetap untuk plotting jalur
+    path = TrajectoryBuffer(PATH_CAPACITY)
 
     # Plotting
     fig, ax = plt.subplots()
     ax.set_aspect('equal', adjustable='datalim')
     ax.invert_yaxis()  # Balik sumbu y agar sesuai dengan koordinat umum
 
-    # Label untuk parameter
-    label_parameters = ax.text(1.05, 0.5, "", transform=ax.transAxes, va='center', ha='left')
-
-    # Fungsi untuk mengupdate posisi dan orientasi robot
-    def update(frame):
-        nonlocal x, y, theta, linear_speed, angular_speed
+    # Artist robot dibuat sekali, setiap frame hanya datanya yang diperbarui
+    renderer = RobotRenderer(ax, label=True)
+    autoscaler = ViewAutoscaler(margin=1.0)
 
-        # Hitung kecepatan translasi (linear) masing-masing roda
-        v_left = left_speed * left_radius
-        v_right = right_speed * right_radius
+    # Simulasi headless; jam simulasi dipisah dari frame rate animasi
+    # (dt = interval waktu, total_time = None berarti simulasi tanpa batas)
+    sim = RobotSimulation(left_speed, left_radius, right_speed, right_radius, body_radius, x, y, theta, path=path)
+    loop = SimulationLoop(sim, dt, time_scale=TIME_SCALE, horizon=total_time)
 
-        # Hitung kecepatan translasi (linear) total dan kecepatan rotasi (angular) robot
-        v = (v_left + v_right) / 2
-        omega = (v_right - v_left) / body_radius
+    # Simpan loop simulasi agar tombol stop/continue bisa menjeda jam simulasi;
+    # thread fisika latar dari loop sebelumnya dihentikan lebih dulu
+    global loop_global
+    if loop_global is not None:
+        loop_global.stop()
+    loop_global = loop
 
-        # Hitung perubahan posisi dan orientasi
-        dx = v * np.cos(theta) * dt
-        dy = v * np.sin(theta) * dt
-        dtheta = omega * dt
-
-        # Perbarui posisi dan orientasi
-        x += dx
-        y += dy
-        theta += dtheta
-
-        # Simpan posisi untuk plotting jalur
-        x_plot.append(x)
-        y_plot.append(y)
+    # Fungsi untuk mengupdate posisi dan orientasi robot
+    def update(frame):
+        nonlocal x, y, theta
+        global linear_speed, angular_speed
+
+        # Jalankan langkah fisika yang tertunda, lalu ambil salinan state
+        # terbaru yang konsisten (fisika bisa berjalan di thread latar)
+        loop.tick()
+        _, x, y, theta = loop.snapshot()
+
+        # Jalur digambar langsung dari view buffer; kolomnya hanya disalin
+        # di bawah lock bila thread latar bisa menulis buffer bersamaan
+        if loop.time_scale is None:
+            with loop.lock:
+                path_x = path.field('x').copy()
+                path_y = path.field('y').copy()
+        else:
+            path_x, path_y = path.field('x'), path.field('y')
 
         # Hitung kecepatan translasi linier dan kecepatan angular
-        linear_speed = v
-        angular_speed = omega
+        linear_speed = sim.v
+        angular_speed = sim.omega
 
-        # Memplot posisi robot dan jalur yang diikuti
-        ax.clear()
-        ax.plot(x_plot, y_plot, 'b-')
-        ax.plot(x, y, 'bo')
-        ax.set_xlim(min(x_plot) - 1, max(x_plot) + 1)
-        ax.set_ylim(min(y_plot) - 1, max(y_plot) + 1)
+        # Perbarui batas sumbu hanya jika robot mendekati tepi view
+        limits = autoscaler.update(x, y)
+        if limits is not None:
+            renderer.set_limits(*limits)
 
-        # Update label-parameter
-        label_parameters.set_text(f"Linear Speed: {linear_speed:.2f}\nAngular Speed: {angular_speed:.2f}\nX: {x:.2f}\nY: {y:.2f}\nPsi: {np.degrees(theta):.2f}")
+        # Memplot posisi robot, jalur yang diikuti, dan label parameter
+        text = f"Linear Speed: {linear_speed:.2f}\nAngular Speed: {angular_speed:.2f}\nX: {x:.2f}\nY: {y:.2f}\nPsi: {np.degrees(theta):.2f}"
+        return renderer.update(x, y, theta, path_x, path_y, text=text)
 
     # Animasi
-    anim = FuncAnimation(fig, update, frames=times, repeat=False, blit=False)
+    anim = FuncAnimation(fig, update, frames=loop.frames(), init_func=renderer.init,
+                         interval=FRAME_INTERVAL, repeat=False, blit=True, cache_frame_data=False)
     return fig, anim
 
 def start_simulation():
@@ -138,6 +149,8 @@ def start_simulation():
 def stop_simulation():
     global anim_global
     if anim_global is not None:
+        # Hentikan juga thread fisika latar (mode TIME_SCALE = None)
+        loop_global.stop()
         anim_global.event_source.stop()
         messagebox.showinfo("Info", "Simulasi dihentikan.")
     else:
@@ -147,6 +160,7 @@ def reset_simulation():
     global anim_global, last_position, last_orientation
     if anim_global is not None:
         anim_global.event_source.stop()
+        loop_global.stop()
         last_position = None
         last_orientation = None
         canvas_widget.destroy()
@@ -158,6 +172,8 @@ def reset_simulation():
 def continue_simulation():
     global anim_global
     if anim_global is not None:
+        # Waktu nyata selama simulasi dihentikan tidak ikut disimulasikan
+        loop_global.pause()
         anim_global.event_source.start()
         messagebox.showinfo("Info", "Simulasi dilanjutkan.")
     else:
@@ -204,97 +220,98 @@ def load_simulation():
     else:
         messagebox.showinfo("Info", "Tidak ada nilai simulasi yang tersimpan.")
 
-# Membuat GUI
-window = tk.Tk()
-window.title("Simulasi Robot Differential Drive")
-window.geometry("1000x600")
-
-# Frame untuk input
-input_frame = tk.Frame(window)
-input_frame.pack(side=tk.LEFT, padx=10, pady=10)
-
-# Label dan input untuk kecepatan roda kiri
-left_speed_label = tk.Label(input_frame, text="Kecepatan Roda Kiri:")
-left_speed_label.grid(row=0, column=0, padx=5, pady=5)
-left_speed_entry = tk.Entry(input_frame)
-left_speed_entry.grid(row=0, column=1, padx=5, pady=5)
-
-# Label dan input untuk radius roda kiri
-left_radius_label = tk.Label(input_frame, text="Radius Roda Kiri:")
-left_radius_label.grid(row=1, column=0, padx=5, pady=5)
-left_radius_entry = tk.Entry(input_frame)
-left_radius_entry.grid(row=1, column=1, padx=5, pady=5)
-
-# Label dan input untuk kecepatan roda kanan
-right_speed_label = tk.Label(input_frame, text="Kecepatan Roda Kanan:")
-right_speed_label.grid(row=2, column=0, padx=5, pady=5)
-right_speed_entry = tk.Entry(input_frame)
-right_speed_entry.grid(row=2, column=1, padx=5, pady=5)
-
-# Label dan input untuk radius roda kanan
-right_radius_label = tk.Label(input_frame, text="Radius Roda Kanan:")
-right_radius_label.grid(row=3, column=0, padx=5, pady=5)
-right_radius_entry = tk.Entry(input_frame)
-right_radius_entry.grid(row=3, column=1, padx=5, pady=5)
-
-# Label dan input untuk radius body robot
-body_radius_label = tk.Label(input_frame, text="Radius Body Robot:")
-body_radius_label.grid(row=4, column=0, padx=5, pady=5)
-body_radius_entry = tk.Entry(input_frame)
-body_radius_entry.grid(row=4, column=1, padx=5, pady=5)
-
-# Label dan input untuk posisi x awal
-initial_x_label = tk.Label(input_frame, text="Posisi X Awal:")
-initial_x_label.grid(row=5, column=0, padx=5, pady=5)
-initial_x_entry = tk.Entry(input_frame)
-initial_x_entry.grid(row=5, column=1, padx=5, pady=5)
-
-# Label dan input untuk posisi y awal
-initial_y_label = tk.Label(input_frame, text="Posisi Y Awal:")
-initial_y_label.grid(row=6, column=0, padx=5, pady=5)
-initial_y_entry = tk.Entry(input_frame)
-initial_y_entry.grid(row=6, column=1, padx=5, pady=5)
-
-# Label dan input untuk orientasi awal
-initial_orientation_label = tk.Label(input_frame, text="Orientasi Awal (derajat):")
-initial_orientation_label.grid(row=7, column=0, padx=5, pady=5)
-initial_orientation_entry = tk.Entry(input_frame)
-initial_orientation_entry.grid(row=7, column=1, padx=5, pady=5)
-
-# Frame untuk plot
-plot_frame = tk.Frame(window)
-plot_frame.pack(side=tk.RIGHT, padx=10, pady=10)
-
-# Button untuk memulai simulasi
-start_button = tk.Button(input_frame, text="Mulai Simulasi", command=start_simulation)
-start_button.grid(row=8, column=0, columnspan=2, padx=5, pady=5)
-
-# Button untuk menghentikan simulasi
-stop_button = tk.Button(input_frame, text="Stop Simulasi", command=stop_simulation)
-stop_button.grid(row=9, column=0, columnspan=2, padx=5, pady=5)
-
-# Button untuk mereset simulasi
-reset_button = tk.Button(input_frame, text="Reset Simulasi", command=reset_simulation)
-reset_button.grid(row=10, column=0, columnspan=2, padx=5, pady=5)
-
-# Button untuk melanjutkan simulasi
-continue_button = tk.Button(input_frame, text="Lanjutkan Simulasi", command=continue_simulation)
-continue_button.grid(row=11, column=0, columnspan=2, padx=5, pady=5)
-
-# Button untuk menyimpan parameter simulasi
-save_values_button = tk.Button(input_frame, text="Simpan Nilai", command=save_simulation)
-save_values_button.grid(row=12, column=0, columnspan=2, padx=5, pady=5)
-
-# Button untuk memuat parameter simulasi
-load_values_button = tk.Button(input_frame, text="Muat Nilai", command=load_simulation)
-load_values_button.grid(row=13, column=0, columnspan=2, padx=5, pady=5)
-
-# Button untuk keluar dari program
-exit_button = tk.Button(input_frame, text="Keluar", command=window.quit)
-exit_button.grid(row=14, column=0, columnspan=2, padx=5, pady=5)
-
-# Mengatur ukuran relatif terhadap layar
-window.grid_columnconfigure(1, weight=1)
-window.grid_rowconfigure(0, weight=1)
-
-window.mainloop()
+if __name__ == "__main__":
+    # Membuat GUI
+    window = tk.Tk()
+    window.title("Simulasi Robot Differential Drive")
+    window.geometry("1000x600")
+
+    # Frame untuk input
+    input_frame = tk.Frame(window)
+    input_frame.pack(side=tk.LEFT, padx=10, pady=10)
+
+    # Label dan input untuk kecepatan roda kiri
+    left_speed_label = tk.Label(input_frame, text="Kecepatan Roda Kiri:")
+    left_speed_label.grid(row=0, column=0, padx=5, pady=5)
+    left_speed_entry = tk.Entry(input_frame)
+    left_speed_entry.grid(row=0, column=1, padx=5, pady=5)
+
+    # Label dan input untuk radius roda kiri
+    left_radius_label = tk.Label(input_frame, text="Radius Roda Kiri:")
+    left_radius_label.grid(row=1, column=0, padx=5, pady=5)
+    left_radius_entry = tk.Entry(input_frame)
+    left_radius_entry.grid(row=1, column=1, padx=5, pady=5)
+
+    # Label dan input untuk kecepatan roda kanan
+    right_speed_label = tk.Label(input_frame, text="Kecepatan Roda Kanan:")
+    right_speed_label.grid(row=2, column=0, padx=5, pady=5)
+    right_speed_entry = tk.Entry(input_frame)
+    right_speed_entry.grid(row=2, column=1, padx=5, pady=5)
+
+    # Label dan input untuk radius roda kanan
+    right_radius_label = tk.Label(input_frame, text="Radius Roda Kanan:")
+    right_radius_label.grid(row=3, column=0, padx=5, pady=5)
+    right_radius_entry = tk.Entry(input_frame)
+    right_radius_entry.grid(row=3, column=1, padx=5, pady=5)
+
+    # Label dan input untuk radius body robot
+    body_radius_label = tk.Label(input_frame, text="Radius Body Robot:")
+    body_radius_label.grid(row=4, column=0, padx=5, pady=5)
+    body_radius_entry = tk.Entry(input_frame)
+    body_radius_entry.grid(row=4, column=1, padx=5, pady=5)
+
+    # Label dan input untuk posisi x awal
+    initial_x_label = tk.Label(input_frame, text="Posisi X Awal:")
+    initial_x_label.grid(row=5, column=0, padx=5, pady=5)
+    initial_x_entry = tk.Entry(input_frame)
+    initial_x_entry.grid(row=5, column=1, padx=5, pady=5)
+
+    # Label dan input untuk posisi y awal
+    initial_y_label = tk.Label(input_frame, text="Posisi Y Awal:")
+    initial_y_label.grid(row=6, column=0, padx=5, pady=5)
+    initial_y_entry = tk.Entry(input_frame)
+    initial_y_entry.grid(row=6, column=1, padx=5, pady=5)
+
+    # Label dan input untuk orientasi awal
+    initial_orientation_label = tk.Label(input_frame, text="Orientasi Awal (derajat):")
+    initial_orientation_label.grid(row=7, column=0, padx=5, pady=5)
+    initial_orientation_entry = tk.Entry(input_frame)
+    initial_orientation_entry.grid(row=7, column=1, padx=5, pady=5)
+
+    # Frame untuk plot
+    plot_frame = tk.Frame(window)
+    plot_frame.pack(side=tk.RIGHT, padx=10, pady=10)
+
+    # Button untuk memulai simulasi
+    start_button = tk.Button(input_frame, text="Mulai Simulasi", command=start_simulation)
+    start_button.grid(row=8, column=0, columnspan=2, padx=5, pady=5)
+
+    # Button untuk menghentikan simulasi
+    stop_button = tk.Button(input_frame, text="Stop Simulasi", command=stop_simulation)
+    stop_button.grid(row=9, column=0, columnspan=2, padx=5, pady=5)
+
+    # Button untuk mereset simulasi
+    reset_button = tk.Button(input_frame, text="Reset Simulasi", command=reset_simulation)
+    reset_button.grid(row=10, column=0, columnspan=2, padx=5, pady=5)
+
+    # Button untuk melanjutkan simulasi
+    continue_button = tk.Button(input_frame, text="Lanjutkan Simulasi", command=continue_simulation)
+    continue_button.grid(row=11, column=0, columnspan=2, padx=5, pady=5)
+
+    # Button untuk menyimpan parameter simulasi
+    save_values_button = tk.Button(input_frame, text="Simpan Nilai", command=save_simulation)
+    save_values_button.grid(row=12, column=0, columnspan=2, padx=5, pady=5)
+
+    # Button untuk memuat parameter simulasi
+    load_values_button = tk.Button(input_frame, text="Muat Nilai", command=load_simulation)
+    load_values_button.grid(row=13, column=0, columnspan=2, padx=5, pady=5)
+
+    # Button untuk keluar dari program
+    exit_button = tk.Button(input_frame, text="Keluar", command=window.quit)
+    exit_button.grid(row=14, column=0, columnspan=2, padx=5, pady=5)
+
+    # Mengatur ukuran relatif terhadap layar
+    window.grid_columnconfigure(1, weight=1)
+    window.grid_rowconfigure(0, weight=1)
+
+    window.mainloop()
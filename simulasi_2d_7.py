@@ -1,14 +1,33 @@
 import tkinter as tk
 from tkinter import messagebox, filedialog
 import matplotlib.pyplot as plt
+import os
+import tempfile
 import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.animation import FuncAnimation
-import pickle
+from simulation import RobotSimulation, SimulationLoop
+from trajectory_buffer import TrajectoryBuffer
+from renderer import RobotRenderer, ViewAutoscaler
+import trajectory_file
+from recorder import TrajectoryRecorder
+from replay import TrajectoryReplay
+
+# Jumlah sampel jalur yang ditampilkan
+PATH_CAPACITY = 20000
+
+# Kelipatan waktu nyata untuk jam simulasi (None = secepat mungkin) dan
+# interval refresh tampilan dalam milidetik
+TIME_SCALE = 1.0
+FRAME_INTERVAL = 50
 
 # Variabel global untuk menyimpan objek animasi, widget canvas, posisi, dan orientasi terakhir
 anim_global = None
 canvas_widget = None
+sim_global = None
+loop_global = None
+recording_global = None
+replay_controls = None
 last_position = None
 last_orientation = None
 
@@ -24,7 +43,7 @@ saved_values = {
     "initial_orientation": None
 }
 
-def differential_drive_simulation(left_speed, left_radius, right_speed, right_radius, body_radius, initial_x, initial_y, initial_orientation):
+def differential_drive_simulation(left_speed, left_radius, right_speed, right_radius, body_radius, initial_x, initial_y, initial_orientation, dt=0.1, total_time=10):
     # Konversi sudut ke radian
     initial_orientation_rad = np.radians(initial_orientation)
 
@@ -39,57 +58,111 @@ def differential_drive_simulation(left_speed, left_radius, right_speed, right_ra
         y = last_position[1]
         theta = np.radians(last_orientation)
 
-    # Inisialisasi list posisi x dan y untuk plotting jalur
-    x_plot = [x]
-    y_plot = [y]
+    # Buffer trajektori berkapasitas tetap untuk plotting jalur
+    path = TrajectoryBuffer(PATH_CAPACITY)
 
-    # Waktu simulasi
-    total_time = 10  # Misalnya, simulasi berjalan selama 10 detik
-    dt = 0.1  # Interval waktu
-    times = np.arange(0, total_time, dt)
+    # Seluruh sampel direkam ke file sementara agar tombol Save menyimpan
+    # trajektori lengkap, bukan hanya jendela buffer tampilan. Perekam
+    # menulis dan mengompresi di thread sendiri, jadi event loop Tk tidak
+    # pernah menunggu disk.
+    discard_recording()
+    handle, recording_path = tempfile.mkstemp(suffix=".rec")
+    os.close(handle)
+    recording = TrajectoryRecorder(recording_path)
 
     # Plotting
     fig, ax = plt.subplots()
     ax.set_aspect('equal', adjustable='datalim')
     ax.invert_yaxis()  # Balik sumbu y agar sesuai dengan koordinat umum
 
+    # Artist robot dibuat sekali, setiap frame hanya datanya yang diperbarui
+    renderer = RobotRenderer(ax)
+    autoscaler = ViewAutoscaler(margin=1.0)
+
+    # Simulasi headless; jam simulasi dipisah dari frame rate animasi
+    # (dt = interval waktu, total_time = None berarti simulasi tanpa batas)
+    sim = RobotSimulation(left_speed, left_radius, right_speed, right_radius, body_radius, x, y, theta, path=path,
+                          recorder=recording)
+    loop = SimulationLoop(sim, dt, time_scale=TIME_SCALE, horizon=total_time)
+
+    # Simpan objek simulasi agar trajektorinya bisa disimpan ke file
+    global sim_global, loop_global, recording_global
+    sim_global = sim
+    loop_global = loop
+    recording_global = recording
+
     # Fungsi untuk mengupdate posisi dan orientasi robot
     def update(frame):
         nonlocal x, y, theta
 
-        # Hitung kecepatan translasi (linear) masing-masing roda
-        v_left = left_speed * left_radius
-        v_right = right_speed * right_radius
+        # Jalankan langkah fisika yang tertunda, lalu ambil salinan state
+        # terbaru yang konsisten (fisika bisa berjalan di thread latar)
+        loop.tick()
+        _, x, y, theta = loop.snapshot()
+
+        # Jalur digambar langsung dari view buffer; kolomnya hanya disalin
+        # di bawah lock bila thread latar bisa menulis buffer bersamaan
+        if loop.time_scale is None:
+            with loop.lock:
+                path_x = path.field('x').copy()
+                path_y = path.field('y').copy()
+        else:
+            path_x, path_y = path.field('x'), path.field('y')
 
-        # Hitung kecepatan translasi (linear) total dan kecepatan rotasi (angular) robot
-        v = (v_left + v_right) / 2
-        omega = (v_right - v_left) / body_radius
+        # Perbarui batas sumbu hanya jika robot mendekati tepi view
+        limits = autoscaler.update(x, y)
+        if limits is not None:
+            renderer.set_limits(*limits)
 
-        # Hitung perubahan posisi dan orientasi
-        dx = v * np.cos(theta) * dt
-        dy = v * np.sin(theta) * dt
-        dtheta = omega * dt
+        # Memplot posisi robot dan jalur yang diikuti
+        return renderer.update(x, y, theta, path_x, path_y)
 
-        # Perbarui posisi dan orientasi
-        x += dx
-        y += dy
-        theta += dtheta
+    # Animasi
+    anim = FuncAnimation(fig, update, frames=loop.frames(), init_func=renderer.init,
+                         interval=FRAME_INTERVAL, repeat=False, blit=True, cache_frame_data=False)
+    return fig, anim
 
-        # Simpan posisi untuk plotting jalur
-        x_plot.append(x)
-        y_plot.append(y)
+def replay_simulation(replay, on_tick=None):
+    # Plotting
+    fig, ax = plt.subplots()
+    ax.set_aspect('equal', adjustable='datalim')
 
-        # Memplot posisi robot dan jalur yang diikuti
-        ax.clear()
-        ax.plot(x_plot, y_plot, 'b-')
-        ax.plot(x, y, 'bo')
-        ax.set_xlim(min(x_plot) - 1, max(x_plot) + 1)
-        ax.set_ylim(min(y_plot) - 1, max(y_plot) + 1)
+    # Artist robot dibuat sekali, setiap frame hanya datanya yang diperbarui
+    renderer = RobotRenderer(ax, label=True)
+    autoscaler = ViewAutoscaler(margin=1.0)
 
-    # Animasi
-    anim = FuncAnimation(fig, update, frames=times, repeat=False, blit=False)
+    # Fungsi untuk menampilkan pose rekaman pada waktu pemutaran saat ini
+    def update(frame):
+        x, y, theta = replay.tick()
+        trail = replay.trail(PATH_CAPACITY)
+        if on_tick is not None:
+            on_tick(replay.time)
+
+        # Perbarui batas sumbu hanya jika robot mendekati tepi view
+        limits = autoscaler.update(x, y)
+        if limits is not None:
+            renderer.set_limits(*limits)
+
+        text = f"Replay t: {replay.time:.2f} / {replay.end_time:.2f}\nKecepatan: {replay.speed:g}x"
+        return renderer.update(x, y, theta, replay.column('x', trail), replay.column('y', trail), text=text)
+
+    # Animasi berjalan terus agar rekaman tetap bisa di-scrub setelah selesai
+    anim = FuncAnimation(fig, update, frames=None, init_func=renderer.init,
+                         interval=FRAME_INTERVAL, blit=True, cache_frame_data=False)
     return fig, anim
 
+# Hentikan simulasi aktif lalu tutup dan hapus file rekaman sementaranya
+def discard_recording():
+    global sim_global, loop_global, recording_global
+    if loop_global is not None:
+        loop_global.stop()
+    if recording_global is not None:
+        recording_global.close()
+        os.remove(recording_global.path)
+    sim_global = None
+    loop_global = None
+    recording_global = None
+
 def start_simulation():
     global anim_global
     if anim_global is not None:
@@ -128,16 +201,20 @@ def start_simulation():
         messagebox.showerror("Error", "Input harus berupa angka")
 
 def reset_simulation():
-    global anim_global, canvas_widget, last_position, last_orientation
+    global anim_global, canvas_widget, last_position, last_orientation, replay_controls
     if anim_global is None:
         messagebox.showinfo("Info", "Tidak ada simulasi yang berjalan.")
         return
 
     anim_global.event_source.stop()
     anim_global = None
+    discard_recording()
 
     plt.close('all')
     canvas_widget.destroy()
+    if replay_controls is not None:
+        replay_controls.destroy()
+        replay_controls = None
 
     # Reset nilai input
     left_speed_entry.delete(0, tk.END)
@@ -163,6 +240,9 @@ def stop_simulation():
     last_position = (float(initial_x_entry.get()), float(initial_y_entry.get()))
     last_orientation = float(initial_orientation_entry.get())
 
+    # Hentikan juga thread fisika latar (mode TIME_SCALE = None)
+    if loop_global is not None:
+        loop_global.stop()
     anim_global.event_source.stop()
 
 def continue_simulation():
@@ -171,6 +251,9 @@ def continue_simulation():
         messagebox.showinfo("Info", "Tidak ada simulasi yang berhenti.")
         return
 
+    # Waktu nyata selama simulasi dihentikan tidak ikut disimulasikan
+    if loop_global is not None:
+        loop_global.pause()
     anim_global.event_source.start()
 
 def save_simulation():
@@ -181,19 +264,109 @@ def save_simulation():
 
     filename = filedialog.asksaveasfilename(defaultextension=".sim", filetypes=[("Simulation files", "*.sim")])
     if filename:
-        with open(filename, 'wb') as file:
-            pickle.dump((saved_values, last_position, last_orientation), file)
-        messagebox.showinfo("Info", "Simulasi berhasil disimpan.")
+        if recording_global is None:
+            messagebox.showinfo("Info", "Tidak ada trajektori simulasi untuk disimpan.")
+            return
+
+        # Simpan parameter dari entry, posisi terakhir, dan seluruh trajektori
+        # yang sudah disimulasikan
+        read_entry_values()
+        recording_global.export(filename, parameters=saved_values,
+                                last_position=last_position, last_orientation=last_orientation)
+        if recording_global.dropped:
+            messagebox.showwarning("Peringatan", f"Simulasi disimpan, tetapi {recording_global.dropped} sampel "
+                                   "terlewat karena antrean perekam penuh.")
+        else:
+            messagebox.showinfo("Info", "Simulasi berhasil disimpan.")
 
 def load_simulation():
     global saved_values, last_position, last_orientation
+    # Tolak lebih dulu agar state input tidak berubah bila simulasi atau
+    # replay masih berjalan
+    if anim_global is not None:
+        messagebox.showinfo("Info", "Simulasi sudah berjalan.")
+        return
+
     filename = filedialog.askopenfilename(defaultextension=".sim", filetypes=[("Simulation files", "*.sim")])
     if filename:
-        with open(filename, 'rb') as file:
-            saved_values, last_position, last_orientation = pickle.load(file)
+        try:
+            trajectory = trajectory_file.TrajectoryFile(filename)
+            header = trajectory.header
+            parameters = dict(saved_values, **header["parameters"])
+            position = tuple(header["last_position"]) if header.get("last_position") is not None else None
+            orientation = header.get("last_orientation")
+        except (ValueError, KeyError, TypeError) as error:
+            messagebox.showerror("Error", f"File simulasi tidak valid: {error}")
+            return
+
+        # File valid: baru sekarang state diperbarui
+        saved_values = parameters
+        last_position = position
+        last_orientation = orientation
         messagebox.showinfo("Info", "Simulasi berhasil dimuat.")
         update_entry_values()
-        start_simulation()  # Mulai simulasi dengan nilai yang dimuat
+
+        # Putar ulang trajektori yang tersimpan; file tanpa sampel disimulasikan ulang
+        if len(trajectory) > 0:
+            start_replay(trajectory)
+        else:
+            start_simulation()  # Mulai simulasi dengan nilai yang dimuat
+
+def start_replay(trajectory):
+    global anim_global, canvas_widget, replay_controls
+    if anim_global is not None:
+        messagebox.showinfo("Info", "Simulasi sudah berjalan.")
+        return
+
+    # Posisi slider waktu mengikuti waktu pemutaran; mengubah variabel yang
+    # terhubung tidak memanggil command slider, jadi tidak memicu seek
+    replay = TrajectoryReplay(trajectory.samples, trajectory.fields)
+    time_value = tk.DoubleVar(value=replay.start_time)
+    fig, anim = replay_simulation(replay, on_tick=time_value.set)
+    canvas = FigureCanvasTkAgg(fig, master=plot_frame)
+    canvas_widget = canvas.get_tk_widget()
+    canvas_widget.grid(row=0, column=1, rowspan=6)
+
+    # Kontrol scrubbing dan kecepatan pemutaran
+    replay_controls = tk.Frame(plot_frame)
+    replay_controls.grid(row=6, column=1, sticky="ew")
+
+    time_scale = tk.Scale(replay_controls, label="Waktu (detik)", orient=tk.HORIZONTAL, length=400,
+                          from_=replay.start_time, to=replay.end_time, resolution=0.01, variable=time_value,
+                          command=lambda value: replay.seek(float(value)))
+    time_scale.grid(row=0, column=0, columnspan=3)
+
+    speed_scale = tk.Scale(replay_controls, label="Kecepatan", orient=tk.HORIZONTAL,
+                           from_=-4, to=4, resolution=0.25,
+                           command=lambda value: replay.set_speed(float(value)))
+    speed_scale.set(replay.speed)
+    speed_scale.grid(row=1, column=0)
+
+    tk.Button(replay_controls, text="Play", command=replay.play).grid(row=1, column=1, padx=5)
+    tk.Button(replay_controls, text="Pause", command=replay.pause).grid(row=1, column=2, padx=5)
+
+    # Simpan objek animasi dalam variabel global; mode replay tidak punya simulasi aktif
+    anim_global = anim
+    discard_recording()
+    anim._start()
+
+def read_entry_values():
+    # Salin nilai entry yang valid ke saved_values
+    entries = {
+        "left_speed": left_speed_entry,
+        "left_radius": left_radius_entry,
+        "right_speed": right_speed_entry,
+        "right_radius": right_radius_entry,
+        "body_radius": body_radius_entry,
+        "initial_x": initial_x_entry,
+        "initial_y": initial_y_entry,
+        "initial_orientation": initial_orientation_entry
+    }
+    for name, entry in entries.items():
+        try:
+            saved_values[name] = float(entry.get())
+        except ValueError:
+            pass
 
 def clear_saved_values():
     global saved_values
@@ -231,79 +404,81 @@ def exit_program():
     global anim_global
     if anim_global is not None:
         anim_global.event_source.stop()
+    discard_recording()
     window.destroy()
 
-# Membuat GUI
-window = tk.Tk()
-window.title("Simulasi Gerakan Mobile Robot Differential Drive")
+if __name__ == "__main__":
+    # Membuat GUI
+    window = tk.Tk()
+    window.title("Simulasi Gerakan Mobile Robot Differential Drive")
 
-# Frame untuk input
-input_frame = tk.Frame(window)
-input_frame.grid(row=0, column=0)
+    # Frame untuk input
+    input_frame = tk.Frame(window)
+    input_frame.grid(row=0, column=0)
 
-tk.Label(input_frame, text="Kecepatan Roda Kiri:").grid(row=0, column=0, sticky="w")
-left_speed_entry = tk.Entry(input_frame)
-left_speed_entry.grid(row=0, column=1)
+    tk.Label(input_frame, text="Kecepatan Roda Kiri:").grid(row=0, column=0, sticky="w")
+    left_speed_entry = tk.Entry(input_frame)
+    left_speed_entry.grid(row=0, column=1)
 
-tk.Label(input_frame, text="Radius Roda Kiri:").grid(row=1, column=0, sticky="w")
-left_radius_entry = tk.Entry(input_frame)
-left_radius_entry.grid(row=1, column=1)
+    tk.Label(input_frame, text="Radius Roda Kiri:").grid(row=1, column=0, sticky="w")
+    left_radius_entry = tk.Entry(input_frame)
+    left_radius_entry.grid(row=1, column=1)
 
-tk.Label(input_frame, text="Kecepatan Roda Kanan:").grid(row=2, column=0, sticky="w")
-right_speed_entry = tk.Entry(input_frame)
-right_speed_entry.grid(row=2, column=1)
+    tk.Label(input_frame, text="Kecepatan Roda Kanan:").grid(row=2, column=0, sticky="w")
+    right_speed_entry = tk.Entry(input_frame)
+    right_speed_entry.grid(row=2, column=1)
 
-tk.Label(input_frame, text="Radius Roda Kanan:").grid(row=3, column=0, sticky="w")
-right_radius_entry = tk.Entry(input_frame)
-right_radius_entry.grid(row=3, column=1)
+    tk.Label(input_frame, text="Radius Roda Kanan:").grid(row=3, column=0, sticky="w")
+    right_radius_entry = tk.Entry(input_frame)
+    right_radius_entry.grid(row=3, column=1)
 
-tk.Label(input_frame, text="Radius Body:").grid(row=4, column=0, sticky="w")
-body_radius_entry = tk.Entry(input_frame)
-body_radius_entry.grid(row=4, column=1)
+    tk.Label(input_frame, text="Radius Body:").grid(row=4, column=0, sticky="w")
+    body_radius_entry = tk.Entry(input_frame)
+    body_radius_entry.grid(row=4, column=1)
 
-tk.Label(input_frame, text="Posisi X Awal:").grid(row=5, column=0, sticky="w")
-initial_x_entry = tk.Entry(input_frame)
-initial_x_entry.grid(row=5, column=1)
+    tk.Label(input_frame, text="Posisi X Awal:").grid(row=5, column=0, sticky="w")
+    initial_x_entry = tk.Entry(input_frame)
+    initial_x_entry.grid(row=5, column=1)
 
-tk.Label(input_frame, text="Posisi Y Awal:").grid(row=6, column=0, sticky="w")
-initial_y_entry = tk.Entry(input_frame)
-initial_y_entry.grid(row=6, column=1)
+    tk.Label(input_frame, text="Posisi Y Awal:").grid(row=6, column=0, sticky="w")
+    initial_y_entry = tk.Entry(input_frame)
+    initial_y_entry.grid(row=6, column=1)
 
-tk.Label(input_frame, text="Orientasi Awal (derajat):").grid(row=7, column=0, sticky="w")
-initial_orientation_entry = tk.Entry(input_frame)
-initial_orientation_entry.grid(row=7, column=1)
+    tk.Label(input_frame, text="Orientasi Awal (derajat):").grid(row=7, column=0, sticky="w")
+    initial_orientation_entry = tk.Entry(input_frame)
+    initial_orientation_entry.grid(row=7, column=1)
 
-# Frame untuk plotting
-plot_frame = tk.Frame(window)
-plot_frame.grid(row=0, column=1, rowspan=8)
+    # Frame untuk plotting
+    plot_frame = tk.Frame(window)
+    plot_frame.grid(row=0, column=1, rowspan=8)
 
-# Frame untuk tombol
-button_frame = tk.Frame(window)
-button_frame.grid(row=8, column=0, columnspan=2)
+    # Frame untuk tombol
+    button_frame = tk.Frame(window)
+    button_frame.grid(row=8, column=0, columnspan=2)
 
-start_button = tk.Button(button_frame, text="Mulai Simulasi", command=start_simulation)
-start_button.grid(row=0, column=0, padx=5, pady=5)
+    start_button = tk.Button(button_frame, text="Mulai Simulasi", command=start_simulation)
+    start_button.grid(row=0, column=0, padx=5, pady=5)
 
-reset_button = tk.Button(button_frame, text="Reset", command=reset_simulation)
-reset_button.grid(row=0, column=1, padx=5, pady=5)
+    reset_button = tk.Button(button_frame, text="Reset", command=reset_simulation)
+    reset_button.grid(row=0, column=1, padx=5, pady=5)
 
-stop_button = tk.Button(button_frame, text="Stop", command=stop_simulation)
-stop_button.grid(row=0, column=2, padx=5, pady=5)
+    stop_button = tk.Button(button_frame, text="Stop", command=stop_simulation)
+    stop_button.grid(row=0, column=2, padx=5, pady=5)
 
-continue_button = tk.Button(button_frame, text="Lanjutkan Simulasi", command=continue_simulation)
-continue_button.grid(row=0, column=3, padx=5, pady=5)
+    continue_button = tk.Button(button_frame, text="Lanjutkan Simulasi", command=continue_simulation)
+    continue_button.grid(row=0, column=3, padx=5, pady=5)
 
-save_button = tk.Button(button_frame, text="Save", command=save_simulation)
-save_button.grid(row=0, column=4, padx=5, pady=5)
+    save_button = tk.Button(button_frame, text="Save", command=save_simulation)
+    save_button.grid(row=0, column=4, padx=5, pady=5)
 
-load_button = tk.Button(button_frame, text="Load", command=load_simulation)
-load_button.grid(row=0, column=5, padx=5, pady=5)
+    load_button = tk.Button(button_frame, text="Load", command=load_simulation)
+    load_button.grid(row=0, column=5, padx=5, pady=5)
 
-exit_button = tk.Button(button_frame, text="Keluar", command=exit_program)
-exit_button.grid(row=0, column=6, padx=5, pady=5)
+    exit_button = tk.Button(button_frame, text="Keluar", command=exit_program)
+    exit_button.grid(row=0, column=6, padx=5, pady=5)
 
-# Mengatur ukuran relatif terhadap layar
-window.grid_columnconfigure(1, weight=1)
-window.grid_rowconfigure(0, weight=1)
+    # Mengatur ukuran relatif terhadap layar
+    window.grid_columnconfigure(1, weight=1)
+    window.grid_rowconfigure(0, weight=1)
 
-window.mainloop()
+    window.mainloop()
@@ -0,0 +1,192 @@
+import threading
+import time
+import numpy as np
+from kinematics import wheel_to_unicycle, trajectory
+from integrators import get_integrator
+
+# Simulasi satu robot differential drive tanpa GUI, beserta loop waktu tetap
+# yang memisahkan jam simulasi dari frame rate animasi.
+
+
+class RobotSimulation:
+    def __init__(self, left_speed, left_radius, right_speed, right_radius, body_radius,
+                 x=0.0, y=0.0, theta=0.0, path=None, integrator="exact", recorder=None):
+        self.left_speed = left_speed
+        self.left_radius = left_radius
+        self.right_speed = right_speed
+        self.right_radius = right_radius
+        self.body_radius = body_radius
+        self.v, self.omega = wheel_to_unicycle(left_speed, left_radius, right_speed, right_radius, body_radius)
+
+        # Pose dan waktu simulasi (theta dalam radian)
+        self.x = x
+        self.y = y
+        self.theta = theta
+        self.t = 0.0
+
+        # Integrator (nama di integrators.INTEGRATORS atau callable)
+        self.integrator_name = integrator if isinstance(integrator, str) else None
+        self.integrator = get_integrator(integrator)
+
+        # Buffer trajektori opsional (TrajectoryBuffer), diisi setiap langkah
+        self.path = path
+        if path is not None:
+            path.append(self.t, x, y, theta, self.v, self.omega)
+
+        # Perekam opsional (recorder.TrajectoryRecorder), menerima blok sampel
+        self.recorder = recorder
+        if recorder is not None:
+            recorder.record((self.t, x, y, theta, self.v, self.omega))
+
+    # Ganti kecepatan roda (misalnya dari controller) dan hitung ulang v, omega
+    def set_wheel_speeds(self, left_speed, right_speed):
+        self.left_speed = left_speed
+        self.right_speed = right_speed
+        self.v, self.omega = wheel_to_unicycle(left_speed, self.left_radius, right_speed, self.right_radius,
+                                               self.body_radius)
+
+    # Jalankan sejumlah langkah dt sekaligus dan tulis sampelnya ke buffer
+    # jalur sebagai satu blok. Untuk integrator "exact" semua sampel dihitung
+    # dalam satu panggilan trajectory() karena kecepatan roda konstan;
+    # integrator lain dijalankan langkah demi langkah.
+    def run(self, dt, steps=1):
+        if steps <= 0:
+            return None
+
+        times = dt * np.arange(1, steps + 1)
+        if self.integrator_name == "exact":
+            xs, ys, thetas = trajectory(self.x, self.y, self.theta, self.v, self.omega, times)
+        else:
+            xs = np.empty(steps)
+            ys = np.empty(steps)
+            thetas = np.empty(steps)
+            x, y, theta = self.x, self.y, self.theta
+            for i in range(steps):
+                x, y, theta = self.integrator(x, y, theta, self.v, self.omega, dt)
+                xs[i], ys[i], thetas[i] = x, y, theta
+
+        if self.path is not None or self.recorder is not None:
+            samples = np.vstack((self.t + times, xs, ys, thetas,
+                                 np.full(steps, self.v), np.full(steps, self.omega)))
+            if self.path is not None:
+                self.path.extend(samples)
+            if self.recorder is not None:
+                self.recorder.record(samples, copy=False)
+
+        t0 = self.t
+        self.x, self.y, self.theta = float(xs[-1]), float(ys[-1]), float(thetas[-1])
+        self.t += steps * dt
+        return t0 + times, xs, ys, thetas
+
+    def step(self, dt):
+        self.run(dt, 1)
+
+
+# Loop simulasi dengan langkah waktu tetap. Display memanggil tick() pada
+# refresh rate-nya sendiri; tick() menjalankan semua langkah fisika yang
+# tertunda menurut waktu nyata dikali time_scale. Bila redraw lambat, frame
+# yang dibuang, bukan fisikanya yang melambat. time_scale=None berarti
+# "secepat mungkin": fisika berjalan di thread latar dan display hanya
+# mengambil state terbaru.
+class SimulationLoop:
+    def __init__(self, sim, dt, time_scale=1.0, horizon=None, max_lag=0.25, batch_steps=1000):
+        if dt <= 0:
+            raise ValueError("dt harus lebih besar dari 0")
+        if horizon is not None and horizon < 0:
+            raise ValueError("horizon tidak boleh negatif")
+
+        self.sim = sim
+        self.dt = dt
+        self.time_scale = time_scale
+        self.horizon = horizon
+        self.max_lag = max_lag  # batas waktu nyata yang dikejar per tick (mis. setelah jeda)
+        self.batch_steps = batch_steps
+
+        self.lock = threading.Lock()
+        self._accumulator = 0.0
+        self._last_tick = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    @property
+    def done(self):
+        return self.horizon is not None and self.sim.t >= self.horizon - 0.5 * self.dt
+
+    # Batasi jumlah langkah supaya tidak melewati horizon
+    def _clamp(self, steps):
+        if self.horizon is None:
+            return steps
+        remaining = int(round((self.horizon - self.sim.t) / self.dt))
+        return max(0, min(steps, remaining))
+
+    def advance(self, steps):
+        with self.lock:
+            steps = self._clamp(steps)
+            self.sim.run(self.dt, steps)
+        return steps
+
+    # Jalankan simulasi headless sebagai stream blok sampel (t, x, y, theta)
+    # berukuran paling banyak chunk_steps. Vektor waktu tidak pernah dibuat
+    # utuh, jadi horizon berjam-jam dengan dt 1 ms tetap hemat memori; tanpa
+    # horizon stream berjalan terus sampai konsumennya berhenti.
+    def chunks(self, chunk_steps=10000):
+        while not self.done:
+            with self.lock:
+                block = self.sim.run(self.dt, self._clamp(chunk_steps))
+            if block is None:
+                break
+            yield block
+
+    def tick(self):
+        if self.time_scale is None:
+            if self._thread is None:
+                self.start()
+            return 0
+
+        now = time.perf_counter()
+        if self._last_tick is None:
+            self._last_tick = now
+            return 0
+
+        elapsed = min(now - self._last_tick, self.max_lag)
+        self._last_tick = now
+        self._accumulator += elapsed * self.time_scale
+        steps = int(self._accumulator / self.dt)
+        self._accumulator -= steps * self.dt
+        return self.advance(steps)
+
+    # Lewati waktu nyata yang hilang selama animasi dijeda
+    def pause(self):
+        self._last_tick = None
+
+    # Mode secepat mungkin di thread latar
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_background, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run_background(self):
+        while not self._stop_event.is_set() and not self.done:
+            self.advance(self.batch_steps)
+
+    # Salinan state terbaru yang konsisten: (t, x, y, theta)
+    def snapshot(self):
+        with self.lock:
+            return self.sim.t, self.sim.x, self.sim.y, self.sim.theta
+
+    # Sumber frame untuk FuncAnimation (generator, tanpa array waktu):
+    # berhenti setelah horizon tercapai, atau tidak pernah jika horizon None
+    def frames(self):
+        frame = 0
+        while not self.done:
+            yield frame
+            frame += 1
@@ -0,0 +1,178 @@
+import argparse
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from kinematics import wheel_to_unicycle, trajectory
+
+# Sweep parameter simulasi differential drive secara headless. Kombinasi
+# parameter dibagi ke beberapa proses (default semua core), setiap proses
+# menghitung satu blok konfigurasi sekaligus secara vektor, lalu hasilnya
+# (trajektori dan metrik ringkasan) ditulis ke satu file .npz kolumnar.
+#
+# Contoh:
+#   python sweep.py --left-speed 0:10:101 --right-speed 0:10:101 -o hasil.npz
+#   python sweep.py --config konfigurasi.csv -o hasil.npz
+
+PARAMETERS = ("left_speed", "left_radius", "right_speed", "right_radius", "body_radius",
+              "initial_x", "initial_y", "initial_orientation")
+
+DEFAULTS = {
+    "left_speed": 1.0,
+    "left_radius": 1.0,
+    "right_speed": 1.0,
+    "right_radius": 1.0,
+    "body_radius": 1.0,
+    "initial_x": 0.0,
+    "initial_y": 0.0,
+    "initial_orientation": 0.0,
+}
+
+
+# Ubah teks rentang menjadi array nilai: "a" (satu nilai), "a,b,c" (daftar),
+# atau "start:stop:num" (linspace, stop ikut dihitung)
+def parse_range(text):
+    text = str(text).strip()
+    if ":" in text:
+        parts = text.split(":")
+        if len(parts) != 3:
+            raise ValueError(f"rentang harus berbentuk start:stop:num, bukan {text!r}")
+        return np.linspace(float(parts[0]), float(parts[1]), int(parts[2]))
+    return np.array([float(value) for value in text.split(",")])
+
+
+# Semua kombinasi (produk kartesius) dari rentang tiap parameter
+def grid_configs(ranges):
+    values = [np.asarray(ranges[name], dtype=float) for name in PARAMETERS]
+    mesh = np.meshgrid(*values, indexing="ij")
+    return {name: m.ravel() for name, m in zip(PARAMETERS, mesh)}
+
+
+# Baca konfigurasi dari CSV; kolom yang tidak ada memakai nilai default
+def read_configs(path, defaults=DEFAULTS):
+    rows = {name: [] for name in PARAMETERS}
+    with open(path, newline="") as file:
+        for row in csv.DictReader(file):
+            for name in PARAMETERS:
+                value = row.get(name)
+                rows[name].append(float(value) if value not in (None, "") else float(defaults[name]))
+    return {name: np.array(values) for name, values in rows.items()}
+
+
+# Simulasikan satu blok konfigurasi; dijalankan di proses worker
+def simulate_chunk(configs, dt, total_time, integrator="exact"):
+    v, omega = wheel_to_unicycle(configs["left_speed"], configs["left_radius"],
+                                 configs["right_speed"], configs["right_radius"],
+                                 configs["body_radius"])
+    x0 = configs["initial_x"]
+    y0 = configs["initial_y"]
+    theta0 = np.radians(configs["initial_orientation"])
+    steps = int(round(total_time / dt))
+    times = dt * np.arange(steps + 1)
+
+    if integrator == "exact":
+        x, y, theta = trajectory(x0[:, None], y0[:, None], theta0[:, None], v[:, None], omega[:, None], times)
+    else:
+        from fleet import FleetSimulator
+
+        # Semua konfigurasi dalam blok diintegrasikan bersama sebagai satu armada
+        fleet = FleetSimulator(x0, y0, theta0, configs["left_speed"], configs["left_radius"],
+                               configs["right_speed"], configs["right_radius"], configs["body_radius"],
+                               integrator=integrator)
+        x = np.empty((len(x0), steps + 1))
+        y = np.empty_like(x)
+        theta = np.empty_like(x)
+        x[:, 0], y[:, 0], theta[:, 0] = x0, y0, theta0
+        for i in range(1, steps + 1):
+            fleet.step(dt)
+            x[:, i], y[:, i], theta[:, i] = fleet.x, fleet.y, fleet.theta
+
+    segment = np.hypot(np.diff(x, axis=1), np.diff(y, axis=1))
+    metrics = {
+        "v": v,
+        "omega": omega,
+        "final_x": x[:, -1],
+        "final_y": y[:, -1],
+        "final_theta": theta[:, -1],
+        "path_length": segment.sum(axis=1),
+        "displacement": np.hypot(x[:, -1] - x0, y[:, -1] - y0),
+        "min_x": x.min(axis=1),
+        "max_x": x.max(axis=1),
+        "min_y": y.min(axis=1),
+        "max_y": y.max(axis=1),
+    }
+    return {"x": x, "y": y, "theta": theta}, metrics
+
+
+def _split(configs, chunks):
+    n = len(configs[PARAMETERS[0]])
+    bounds = np.linspace(0, n, chunks + 1).astype(int)
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if stop > start:
+            yield {name: values[start:stop] for name, values in configs.items()}
+
+
+# Jalankan sweep dan kembalikan dict kolom yang siap ditulis
+def run_sweep(configs, dt=0.1, total_time=10.0, integrator="exact", workers=None,
+              keep_trajectories=True, chunks_per_worker=4):
+    n = len(configs[PARAMETERS[0]])
+    if n == 0:
+        raise ValueError("tidak ada konfigurasi untuk dijalankan")
+    workers = workers or os.cpu_count() or 1
+    chunks = list(_split(configs, max(1, min(n, workers * chunks_per_worker))))
+
+    args = (itertools.repeat(dt), itertools.repeat(total_time), itertools.repeat(integrator))
+    if workers == 1:
+        results = list(map(simulate_chunk, chunks, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(simulate_chunk, chunks, *args))
+
+    columns = {name: np.asarray(configs[name], dtype=float) for name in PARAMETERS}
+    for name in results[0][1]:
+        columns[name] = np.concatenate([metrics[name] for _, metrics in results])
+
+    if keep_trajectories:
+        columns["t"] = dt * np.arange(int(round(total_time / dt)) + 1)
+        for name in ("x", "y", "theta"):
+            columns[name] = np.concatenate([trajectories[name] for trajectories, _ in results])
+    return columns
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep parameter simulasi robot differential drive")
+    parser.add_argument("--config", help="CSV konfigurasi (kolom: %s)" % ", ".join(PARAMETERS))
+    for name in PARAMETERS:
+        parser.add_argument("--" + name.replace("_", "-"), default=None,
+                            help=f"nilai, daftar a,b,c, atau start:stop:num (default {DEFAULTS[name]})")
+    parser.add_argument("--dt", type=float, default=0.1, help="interval waktu (detik)")
+    parser.add_argument("--total-time", type=float, default=10.0, help="lama simulasi (detik)")
+    parser.add_argument("--integrator", default="exact", help="exact, euler, rk4, atau rk45")
+    parser.add_argument("--workers", type=int, default=None, help="jumlah proses (default: semua core)")
+    parser.add_argument("--no-trajectories", action="store_true", help="hanya simpan metrik ringkasan")
+    parser.add_argument("-o", "--output", default="sweep.npz", help="file keluaran .npz")
+    args = parser.parse_args(argv)
+
+    if args.config:
+        defaults = dict(DEFAULTS)
+        for name in PARAMETERS:
+            value = getattr(args, name)
+            if value is not None:
+                defaults[name] = float(value)
+        configs = read_configs(args.config, defaults)
+    else:
+        ranges = {}
+        for name in PARAMETERS:
+            value = getattr(args, name)
+            ranges[name] = parse_range(value) if value is not None else np.array([DEFAULTS[name]])
+        configs = grid_configs(ranges)
+
+    columns = run_sweep(configs, dt=args.dt, total_time=args.total_time, integrator=args.integrator,
+                        workers=args.workers, keep_trajectories=not args.no_trajectories)
+    np.savez(args.output, **columns)
+    print(f"{len(columns['final_x'])} konfigurasi disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
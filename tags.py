@@ -0,0 +1,117 @@
+from functools import lru_cache
+import numpy as np
+
+# Famili tag fiducial bergaya AprilTag: grid bit data DATA_BITS x DATA_BITS
+# dikelilingi border hitam satu sel dan quiet zone putih satu sel. Kode dipilih
+# secara greedy (lexicode acak dengan seed tetap) sehingga jarak Hamming antar
+# kode, termasuk semua rotasi 90 derajatnya, minimal MIN_DISTANCE. Kode tidak
+# sama dengan famili AprilTag resmi, tetapi strukturnya sama sehingga pipeline
+# deteksi yang sama berlaku.
+#
+# Konvensi orientasi tekstur: kolom bertambah searah sumbu +u tag (arah hadap
+# robot), baris 0 berada di sisi +v (kiri robot).
+
+DATA_BITS = 6
+MIN_DISTANCE = 10
+FAMILY_SIZE = 256
+TAG_CELLS = DATA_BITS + 4  # quiet zone + border di kedua sisi
+FAMILY_SEED = 36010
+
+_BIT_SHIFTS = np.arange(DATA_BITS * DATA_BITS - 1, -1, -1, dtype=np.uint64)
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+# Jumlah bit 1 untuk setiap elemen array uint64
+def popcount(values):
+    values = np.asarray(values, dtype=np.uint64)
+    octets = np.ascontiguousarray(values).reshape(-1).view(np.uint8)
+    return _POPCOUNT8[octets].reshape(values.shape + (8,)).sum(axis=-1, dtype=np.int64)
+
+
+def code_to_bits(code):
+    return ((np.uint64(code) >> _BIT_SHIFTS) & np.uint64(1)).astype(bool).reshape(DATA_BITS, DATA_BITS)
+
+
+def bits_to_code(bits):
+    flat = np.asarray(bits, dtype=np.uint64).reshape(-1)
+    return int(np.sum(flat << _BIT_SHIFTS))
+
+
+# Kode setelah grid bit diputar 90 derajat berlawanan jarum jam sebanyak k kali
+def rotate_code(code, k=1):
+    return bits_to_code(np.rot90(code_to_bits(code), k))
+
+
+@lru_cache(maxsize=None)
+def tag_family(size=FAMILY_SIZE, min_distance=MIN_DISTANCE, seed=FAMILY_SEED):
+    rng = np.random.default_rng(seed)
+    mask = (1 << (DATA_BITS * DATA_BITS)) - 1
+    nbits = DATA_BITS * DATA_BITS
+
+    codes = []
+    used = np.empty(0, dtype=np.uint64)  # semua rotasi kode yang sudah dipilih
+    while len(codes) < size:
+        for candidate in rng.integers(0, mask, size=4096, dtype=np.uint64, endpoint=True):
+            # Hindari kode yang hampir seluruhnya hitam atau putih
+            ones = int(popcount(candidate))
+            if ones < min_distance or ones > nbits - min_distance:
+                continue
+
+            rotations = np.array([rotate_code(int(candidate), k) for k in range(4)], dtype=np.uint64)
+            # Keempat rotasi kode itu sendiri harus bisa dibedakan
+            if popcount(rotations[1:] ^ rotations[0]).min() < min_distance:
+                continue
+            if used.size and popcount(used[:, None] ^ rotations[None, :]).min() < min_distance:
+                continue
+
+            codes.append(int(candidate))
+            used = np.concatenate((used, rotations))
+            if len(codes) == size:
+                break
+    return tuple(codes)
+
+
+def tag_bits(tag_id):
+    return code_to_bits(tag_family()[tag_id])
+
+
+# Tekstur tag (TAG_CELLS x TAG_CELLS), 0 = hitam, 1 = putih
+def tag_texture(tag_id):
+    texture = np.ones((TAG_CELLS, TAG_CELLS), dtype=np.float32)
+    texture[1:-1, 1:-1] = 0.0
+    texture[2:-2, 2:-2] = tag_bits(tag_id)
+    return texture
+
+
+# Tabel semua kode beserta rotasinya untuk decoding
+@lru_cache(maxsize=None)
+def _decode_table():
+    family = tag_family()
+    codes = np.array([rotate_code(code, k) for code in family for k in range(4)], dtype=np.uint64)
+    ids = np.repeat(np.arange(len(family)), 4)
+    rotations = np.tile(np.arange(4), len(family))
+    return codes, ids, rotations
+
+
+# Cocokkan banyak kode sekaligus dengan famili. Kembalikan array (tag_id,
+# rotation, hamming); tag_id -1 bila jarak terdekat melebihi max_hamming.
+def decode_codes(codes, max_hamming=None):
+    if max_hamming is None:
+        max_hamming = (MIN_DISTANCE - 1) // 2
+    table, ids, rotations = _decode_table()
+    codes = np.asarray(codes, dtype=np.uint64).reshape(-1)
+    distance = popcount(codes[:, None] ^ table[None, :])
+    best = np.argmin(distance, axis=1)
+    hamming = distance[np.arange(codes.size), best]
+    tag_ids = np.where(hamming <= max_hamming, ids[best], -1)
+    return tag_ids, rotations[best], hamming
+
+
+# Cocokkan grid bit hasil sampling dengan famili. Kembalikan (tag_id,
+# rotation, hamming) dengan bits == rot90(tag_bits(tag_id), rotation), atau
+# None bila jarak terdekat melebihi max_hamming.
+def decode_bits(bits, max_hamming=None):
+    tag_ids, rotations, hamming = decode_codes([bits_to_code(bits)], max_hamming)
+    if tag_ids[0] < 0:
+        return None
+    return int(tag_ids[0]), int(rotations[0]), int(hamming[0])
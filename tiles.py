@@ -0,0 +1,175 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from detection import TagDetector
+
+# Eksekutor pemrosesan frame per tile. Frame dibagi menjadi tile yang saling
+# tumpang tindih, fungsi per tile dijalankan paralel di thread pool atau
+# process pool, lalu hasil semua tile digabung dan duplikat di sambungan
+# tile (objek yang utuh di dua tile) dibuang.
+#
+# Fungsi tile dipanggil sebagai func(tile, row0, col0) dan mengembalikan
+# daftar hasil dalam koordinat frame. Untuk mode "process" fungsi harus bisa
+# di-pickle (fungsi level modul atau objek seperti DetectTile); frame
+# diletakkan di multiprocessing.shared_memory sehingga worker hanya
+# menerima nama blok memori dan batas tile, bukan salinan piksel.
+#
+# overlap harus lebih besar dari objek terbesar (misalnya sisi tag beserta
+# quiet zone) supaya setiap objek utuh di paling sedikit satu tile.
+
+
+# Batas tile (row0, row1, col0, col1) yang menutup seluruh frame
+def tile_bounds(shape, tile_size=512, overlap=64):
+    height, width = shape[:2]
+    tile_h, tile_w = (tile_size, tile_size) if np.isscalar(tile_size) else tile_size
+    if overlap >= min(tile_h, tile_w):
+        raise ValueError("overlap harus lebih kecil dari ukuran tile")
+
+    def starts(size, tile):
+        if size <= tile:
+            return [0]
+        positions = list(range(0, size - tile + 1, tile - overlap))
+        if positions[-1] + tile < size:
+            positions.append(size - tile)
+        return positions
+
+    return [(row0, min(row0 + tile_h, height), col0, min(col0 + tile_w, width))
+            for row0 in starts(height, tile_h) for col0 in starts(width, tile_w)]
+
+
+# Fungsi tile: deteksi tag lengkap di dalam tile
+class DetectTile:
+    def __init__(self, detector=None):
+        self.detector = detector if detector is not None else TagDetector()
+
+    def __call__(self, tile, row0, col0):
+        return [detection.shifted(col0, row0) for detection in self.detector.detect(tile)]
+
+
+# Fungsi tile: hanya threshold dan pencarian quad (tanpa decoding). Quad
+# yang menyentuh tepi tile terpotong dan dibuang; berkat overlap, objek
+# yang sama utuh di tile tetangganya.
+class QuadTile:
+    def __init__(self, detector=None):
+        self.detector = detector if detector is not None else TagDetector()
+
+    def __call__(self, tile, row0, col0):
+        quads = self.detector.quads(tile)
+        height, width = tile.shape
+        whole = ((quads.min(axis=1) >= 1) & (quads[..., 0].max(axis=1) <= width - 2)[:, None]
+                 & (quads[..., 1].max(axis=1) <= height - 2)[:, None]).all(axis=1)
+        return list(quads[whole] + (col0, row0))
+
+
+# Buang deteksi ganda: tag yang sama dengan pusat berjarak kurang dari
+# radius (default seperempat sisi quad) dianggap objek yang sama
+def merge_detections(detections, radius=None):
+    kept = []
+    for detection in detections:
+        limit = radius
+        if limit is None:
+            limit = 0.25 * np.hypot(*(detection.corners[1] - detection.corners[0]))
+        duplicate = any(other.tag_id == detection.tag_id
+                        and np.hypot(*(other.center - detection.center)) < limit for other in kept)
+        if not duplicate:
+            kept.append(detection)
+    return kept
+
+
+# Buang quad ganda (pusat berjarak kurang dari radius piksel)
+def merge_quads(quads, radius=2.0):
+    kept = []
+    for quad in quads:
+        center = quad.mean(axis=0)
+        if all(np.hypot(*(other.mean(axis=0) - center)) >= radius for other in kept):
+            kept.append(quad)
+    return np.array(kept).reshape(-1, 4, 2)
+
+
+# State worker process: fungsi tile dan blok shared memory yang sudah dibuka
+_worker_func = None
+_worker_frames = {}
+
+
+def _init_worker(func):
+    global _worker_func
+    _worker_func = func
+
+
+def _run_tile(name, shape, dtype, bounds):
+    if name not in _worker_frames:
+        # Hanya satu blok frame yang dipakai per eksekutor; tutup yang lama
+        for block, _ in _worker_frames.values():
+            block.close()
+        _worker_frames.clear()
+        block = shared_memory.SharedMemory(name=name)
+        _worker_frames[name] = (block, np.ndarray(shape, dtype=dtype, buffer=block.buf))
+    frame = _worker_frames[name][1]
+    row0, row1, col0, col1 = bounds
+    return _worker_func(frame[row0:row1, col0:col1], row0, col0)
+
+
+class TiledExecutor:
+    def __init__(self, func=None, tile_size=512, overlap=64, workers=None, mode="thread", merge=merge_detections):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"mode tidak dikenal: {mode!r} (pilihan: thread, process)")
+        self.func = func if func is not None else DetectTile()
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.workers = workers or os.cpu_count() or 1
+        self.mode = mode
+        self.merge = merge
+
+        if mode == "thread":
+            self.pool = ThreadPoolExecutor(max_workers=self.workers)
+        else:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                            initargs=(self.func,))
+        self.shared = None
+        self.buffer = None
+
+    # Buffer frame di shared memory (mode process). Producer boleh menulis
+    # frame langsung ke array ini supaya run() tidak perlu menyalin.
+    def frame_buffer(self, shape, dtype=np.uint8):
+        dtype = np.dtype(dtype)
+        if self.buffer is None or self.buffer.shape != tuple(shape) or self.buffer.dtype != dtype:
+            self._release()
+            size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+            self.shared = shared_memory.SharedMemory(create=True, size=size)
+            self.buffer = np.ndarray(shape, dtype=dtype, buffer=self.shared.buf)
+        return self.buffer
+
+    def run(self, frame):
+        frame = np.asarray(frame)
+        bounds = tile_bounds(frame.shape, self.tile_size, self.overlap)
+
+        if self.mode == "thread":
+            futures = [self.pool.submit(self.func, frame[row0:row1, col0:col1], row0, col0)
+                       for row0, row1, col0, col1 in bounds]
+        else:
+            buffer = self.frame_buffer(frame.shape, frame.dtype)
+            if frame is not buffer:
+                buffer[...] = frame
+            futures = [self.pool.submit(_run_tile, self.shared.name, buffer.shape, buffer.dtype.str, b)
+                       for b in bounds]
+
+        results = [item for future in futures for item in future.result()]
+        return self.merge(results) if self.merge is not None else results
+
+    def _release(self):
+        if self.shared is not None:
+            self.buffer = None
+            self.shared.close()
+            self.shared.unlink()
+            self.shared = None
+
+    def close(self):
+        self.pool.shutdown()
+        self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,177 @@
+import numpy as np
+from kinematics import trajectory
+from detection import TAG_SPAN, TagDetector, to_uint8
+from tags import TAG_CELLS
+
+# Front end pelacakan tag untuk kamera langit-langit. Setiap robot bergerak
+# menurut model differential drive (unicycle), jadi pose tag di frame
+# berikutnya bisa diprediksi dari pose dan kecepatan yang teramati. Deteksi
+# hanya dijalankan di jendela (ROI) sekitar pose prediksi; ukuran jendela
+# = ukuran tag + margin yang tumbuh dengan lamanya track tidak teramati.
+# Seluruh frame dipindai ulang secara berkala (untuk robot baru) dan segera
+# setelah ada track yang hilang.
+#
+# Pose di ruang gambar memakai sumbu y ke atas (v = -baris), sama dengan
+# Detection.angle, sehingga rumus unicycle di kinematics berlaku langsung.
+
+
+# Selisih sudut dibungkus ke [-pi, pi)
+def _wrap(angle):
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+
+class Track:
+    def __init__(self, detection, t):
+        self.tag_id = detection.tag_id
+        self.v = 0.0       # piksel/detik searah hadap tag
+        self.omega = 0.0   # rad/detik
+        self.missed = 0
+        self.observe(detection, t, initial=True)
+
+    # Perbarui pose; kecepatan diestimasi dari dua pengamatan berurutan lalu
+    # dihaluskan eksponensial
+    def observe(self, detection, t, smoothing=0.5, initial=False):
+        x, y = detection.center[0], -detection.center[1]
+        if not initial and t > self.t:
+            dt = t - self.t
+            heading = self.angle + 0.5 * _wrap(detection.angle - self.angle)
+            v = ((x - self.x) * np.cos(heading) + (y - self.y) * np.sin(heading)) / dt
+            omega = _wrap(detection.angle - self.angle) / dt
+            self.v += smoothing * (v - self.v)
+            self.omega += smoothing * (omega - self.omega)
+
+        self.x, self.y, self.angle = x, y, detection.angle
+        self.t = t
+        self.detection = detection
+        self.missed = 0
+
+        # Diagonal quad (piksel), batas bawah ukuran jendela
+        corners = detection.corners
+        self.size = max(np.hypot(*(corners[2] - corners[0])), np.hypot(*(corners[3] - corners[1])))
+
+    # Pusat prediksi (kolom, baris) dan sudut pada waktu t
+    def predict(self, t):
+        x, y, angle = trajectory(self.x, self.y, self.angle, self.v, self.omega, t - self.t)
+        return float(x), float(-y), float(angle)
+
+
+class TagTracker:
+    # margin: cadangan tetap (piksel) di sekitar tag; growth: tambahan margin
+    # per detik sejak pengamatan terakhir (percepatan yang tidak dimodelkan).
+    # Jendela juga diperbesar setiap kali track terlewat.
+    def __init__(self, detector=None, rescan_interval=30, margin=4.0, growth=60.0, max_missed=2,
+                 smoothing=0.5):
+        self.detector = detector if detector is not None else TagDetector()
+        self.rescan_interval = rescan_interval
+        self.margin = margin
+        self.growth = growth
+        self.max_missed = max_missed
+        self.smoothing = smoothing
+
+        self.tracks = {}
+        self.frame_index = 0
+        self.pixels = 0          # piksel yang diproses pada frame terakhir
+        self.full_scan = False   # apakah frame terakhir dipindai penuh
+        self._rescan = True
+
+    # Jendela (row0, row1, col0, col1) untuk satu track pada waktu t
+    def window(self, track, t, shape):
+        col, row, _ = track.predict(t)
+        elapsed = max(t - track.t, 0.0)
+        # Setengah diagonal persegi hitam dikali TAG_CELLS / TAG_SPAN supaya
+        # quiet zone ikut masuk jendela
+        half = 0.5 * track.size * TAG_CELLS / TAG_SPAN + self.margin + self.growth * elapsed + 0.5 * track.size * track.missed
+        height, width = shape
+        row0 = max(int(row - half), 0)
+        row1 = min(int(np.ceil(row + half)) + 1, height)
+        col0 = max(int(col - half), 0)
+        col1 = min(int(np.ceil(col + half)) + 1, width)
+        return row0, row1, col0, col1
+
+    def _scan(self, frame):
+        detections = self.detector.detect(frame)
+        self.pixels = frame.size
+        self.full_scan = True
+        return detections
+
+    # Deteksi hanya di jendela track. Semua jendela (dipad dengan nilai
+    # tepinya) disusun menjadi satu mosaik dengan shelf packing, sehingga
+    # pipeline deteksi cukup dipanggil sekali per frame; padding memisahkan
+    # jendela supaya threshold adaptif satu jendela tidak terpengaruh
+    # jendela tetangganya.
+    def _gated(self, frame, t):
+        self.full_scan = False
+        windows = [self.window(track, t, frame.shape) for track in self.tracks.values()]
+        windows = np.array([w for w in windows if w[1] - w[0] >= 2 and w[3] - w[2] >= 2], dtype=np.intp)
+        if len(windows) == 0:
+            self.pixels = 0
+            return []
+
+        pad = self.detector.block_size // 2 + 1
+        heights = windows[:, 1] - windows[:, 0] + 2 * pad
+        widths = windows[:, 3] - windows[:, 2] + 2 * pad
+        limit = max(int(widths.max()), int(np.sqrt((heights * widths).sum()) * 1.1))
+
+        # Shelf packing: jendela tertinggi lebih dulu, baris baru bila penuh
+        tops = np.empty(len(windows), dtype=np.intp)
+        lefts = np.empty(len(windows), dtype=np.intp)
+        x = y = shelf = 0
+        for k in np.argsort(-heights, kind="stable"):
+            if x + widths[k] > limit:
+                x, y, shelf = 0, y + shelf, 0
+            tops[k], lefts[k] = y, x
+            x += widths[k]
+            shelf = max(shelf, heights[k])
+
+        mosaic = np.full((y + shelf, limit), 255, dtype=frame.dtype)
+        for (row0, row1, col0, col1), top, left in zip(windows, tops, lefts):
+            mosaic[top:top + row1 - row0 + 2 * pad, left:left + col1 - col0 + 2 * pad] = np.pad(
+                frame[row0:row1, col0:col1], pad, mode="edge")
+        self.pixels = mosaic.size
+
+        found = {}
+        tops += pad
+        lefts += pad
+        for detection in self.detector.detect(mosaic):
+            # Kembalikan ke koordinat frame lewat jendela yang memuat semua
+            # sudutnya; deteksi di padding dibuang
+            corners = detection.corners
+            inside = ((corners[:, 0].min() >= lefts - 0.5) & (corners[:, 0].max() <= lefts + widths - 2 * pad - 0.5)
+                      & (corners[:, 1].min() >= tops - 0.5) & (corners[:, 1].max() <= tops + heights - 2 * pad - 0.5))
+            if not inside.any():
+                continue
+            k = int(np.argmax(inside))
+            row0, _, col0, _ = windows[k]
+            # Jendela robot yang berdekatan bisa saling tumpang tindih;
+            # simpan satu deteksi per tag
+            found.setdefault(detection.tag_id, detection.shifted(col0 - lefts[k], row0 - tops[k]))
+        return list(found.values())
+
+    # Proses satu frame pada waktu t (detik) dan kembalikan daftar Detection
+    def update(self, frame, t):
+        frame = to_uint8(frame)
+        rescan = (self._rescan or not self.tracks
+                  or (self.rescan_interval and self.frame_index % self.rescan_interval == 0))
+        detections = self._scan(frame) if rescan else self._gated(frame, t)
+        self.frame_index += 1
+
+        seen = set()
+        for detection in detections:
+            seen.add(detection.tag_id)
+            track = self.tracks.get(detection.tag_id)
+            if track is None:
+                self.tracks[detection.tag_id] = Track(detection, t)
+            else:
+                track.observe(detection, t, self.smoothing)
+
+        # Track yang terlewat terlalu sering dibuang dan memicu pindai penuh
+        # pada frame berikutnya
+        self._rescan = False
+        for tag_id in list(self.tracks):
+            if tag_id not in seen:
+                track = self.tracks[tag_id]
+                track.missed += 1
+                if track.missed > self.max_missed:
+                    del self.tracks[tag_id]
+                    self._rescan = True
+        return detections
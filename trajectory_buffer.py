@@ -0,0 +1,136 @@
+import numpy as np
+
+# Penyimpanan trajektori berkapasitas tetap. Setiap sampel berisi kolom
+# FIELDS dan disimpan dua kali (ring buffer bercermin), sehingga N sampel
+# terakhir selalu berupa slice kontigu: renderer dan exporter bisa membaca
+# view tanpa menyalin data, dan memori tidak bertambah selama run berjalan.
+
+FIELDS = ("t", "x", "y", "theta", "v", "omega")
+FIELD_INDEX = {name: i for i, name in enumerate(FIELDS)}
+
+
+class TrajectoryBuffer:
+    def __init__(self, capacity, history_capacity=None, history_every=10):
+        if capacity <= 0:
+            raise ValueError("capacity harus lebih besar dari 0")
+
+        self.capacity = capacity
+        self.data = np.zeros((len(FIELDS), 2 * capacity))
+        self.total = 0  # jumlah sampel yang pernah ditambahkan
+
+        # Riwayat jangka panjang yang didesimasi (opsional)
+        self.history = None
+        if history_capacity:
+            self.history = DecimatedHistory(history_capacity, history_every)
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def clear(self):
+        self.total = 0
+        if self.history is not None:
+            self.history.clear()
+
+    def append(self, t, x, y, theta, v, omega):
+        i = self.total % self.capacity
+        column = (t, x, y, theta, v, omega)
+        self.data[:, i] = column
+        self.data[:, i + self.capacity] = column
+        self.total += 1
+
+        if self.history is not None:
+            self.history.append(column)
+
+    # Tambah banyak sampel sekaligus; samples berbentuk (len(FIELDS), m)
+    def extend(self, samples):
+        samples = np.asarray(samples, dtype=float)
+        m = samples.shape[1]
+        if m == 0:
+            return
+
+        if self.history is not None:
+            self.history.extend(samples)
+
+        # Hanya sampel yang masih muat di buffer yang perlu ditulis
+        skip = max(0, m - self.capacity)
+        index = (self.total + skip + np.arange(m - skip)) % self.capacity
+        self.data[:, index] = samples[:, skip:]
+        self.data[:, index + self.capacity] = samples[:, skip:]
+        self.total += m
+
+    # View (len(FIELDS), n) dari n sampel terakhir, urut dari yang terlama
+    def window(self, n=None):
+        count = len(self)
+        n = count if n is None else min(n, count)
+        end = self.total % self.capacity + self.capacity
+        return self.data[:, end - n:end]
+
+    # View 1-D satu kolom untuk n sampel terakhir
+    def field(self, name, n=None):
+        return self.window(n)[FIELD_INDEX[name]]
+
+    # Sampel terakhir sebagai dict
+    def latest(self):
+        if self.total == 0:
+            return None
+        return dict(zip(FIELDS, self.window(1)[:, 0]))
+
+
+# Riwayat jangka panjang dengan memori terbatas: menyimpan setiap sampel ke-k.
+# Saat penuh, isinya dipadatkan (setiap sampel kedua dibuang) dan k digandakan,
+# sehingga seluruh run tetap tercakup dengan resolusi yang makin kasar.
+class DecimatedHistory:
+    def __init__(self, capacity, every=10):
+        if capacity < 2:
+            raise ValueError("capacity riwayat minimal 2")
+
+        self.capacity = capacity
+        self.every = every
+        self.data = np.zeros((len(FIELDS), capacity))
+        self.clear()
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+        self.seen = 0
+        self.stride = self.every
+
+    def _compact(self):
+        kept = (self.count + 1) // 2
+        self.data[:, :kept] = self.data[:, 0:self.count:2]
+        self.count = kept
+        self.stride *= 2
+
+    def append(self, column):
+        if self.seen % self.stride == 0:
+            if self.count == self.capacity:
+                self._compact()
+            if self.seen % self.stride == 0:
+                self.data[:, self.count] = column
+                self.count += 1
+        self.seen += 1
+
+    def extend(self, samples):
+        m = samples.shape[1]
+        j = 0
+        while True:
+            # Indeks sampel berikutnya yang jatuh tepat pada kelipatan stride
+            j += (-(self.seen + j)) % self.stride
+            if j >= m:
+                break
+            if self.count == self.capacity:
+                self._compact()
+                continue
+
+            picks = samples[:, j:m:self.stride][:, :self.capacity - self.count]
+            k = picks.shape[1]
+            self.data[:, self.count:self.count + k] = picks
+            self.count += k
+            j += k * self.stride
+        self.seen += m
+
+    # View (len(FIELDS), count) tanpa salinan
+    def view(self):
+        return self.data[:, :self.count]
@@ -0,0 +1,159 @@
+import bisect
+import json
+import os
+import numpy as np
+from trajectory_buffer import FIELDS
+
+# Format file trajektori (.sim) pengganti pickle.
+#
+#   offset 0   MAGIC (8 byte)
+#   offset 8   versi skema, uint32 little-endian
+#   offset 12  panjang header JSON dalam byte (termasuk padding), uint32
+#   offset 16  header JSON UTF-8: {"schema_version", "fields", "dtype",
+#              "parameters", ...}, dipad spasi sampai kelipatan DATA_ALIGN
+#   sesudahnya sampel float64 little-endian, satu baris per sampel dengan
+#              kolom sesuai "fields" (default t, x, y, theta, v, omega)
+#
+# Header dengan "encoding" selain "raw" menandai data yang disimpan dalam
+# chunk terkompresi (lihat recorder.py) dan tidak bisa di-memmap.
+#
+# Jumlah sampel dihitung dari ukuran file, jadi file bisa terus ditambah
+# (append) selama run tanpa menulis ulang header, dan bagian data bisa
+# dibuka langsung dengan np.memmap.
+
+MAGIC = b"DDSIM\x00\x00\x00"
+SCHEMA_VERSION = 1
+DTYPE = "<f8"
+DATA_ALIGN = 64
+_PREFIX = 16
+
+
+class TrajectoryFormatError(ValueError):
+    pass
+
+
+# Tulis MAGIC, versi, dan header JSON ke file yang terbuka (mode biner)
+def write_header(file, parameters=None, fields=FIELDS, **extra):
+    file.write(_encode_header(parameters, fields, extra))
+
+
+def _encode_header(parameters, fields, extra):
+    header = {
+        "schema_version": SCHEMA_VERSION,
+        "fields": list(fields),
+        "dtype": DTYPE,
+        "parameters": parameters or {},
+    }
+    header.update(extra)
+    text = json.dumps(header).encode("utf-8")
+    length = -(-(_PREFIX + len(text)) // DATA_ALIGN) * DATA_ALIGN - _PREFIX
+    text = text.ljust(length, b" ")
+    return MAGIC + np.array([SCHEMA_VERSION, length], dtype="<u4").tobytes() + text
+
+
+# Baca header; kembalikan (dict header, offset awal data)
+def read_header(path):
+    with open(path, "rb") as file:
+        prefix = file.read(_PREFIX)
+        if len(prefix) < _PREFIX or prefix[:8] != MAGIC:
+            raise TrajectoryFormatError(f"{path} bukan file trajektori")
+        version, length = np.frombuffer(prefix[8:], dtype="<u4")
+        if version > SCHEMA_VERSION:
+            raise TrajectoryFormatError(f"versi skema {version} belum didukung (maksimal {SCHEMA_VERSION})")
+        header = json.loads(file.read(int(length)).decode("utf-8"))
+    return header, _PREFIX + int(length)
+
+
+# Penulis file trajektori yang bisa ditambah selama simulasi berjalan
+class TrajectoryWriter:
+    def __init__(self, path, parameters=None, fields=FIELDS, **extra):
+        self.path = path
+        self.fields = tuple(fields)
+        self.count = 0
+        self.file = open(path, "wb")
+        write_header(self.file, parameters, self.fields, **extra)
+
+    # samples: array (len(fields), m) seperti TrajectoryBuffer.window(),
+    # atau satu sampel 1-D
+    def append(self, samples):
+        samples = np.asarray(samples, dtype=DTYPE)
+        if samples.ndim == 1:
+            samples = samples[:, None]
+        if samples.shape[0] != len(self.fields):
+            raise ValueError(f"sampel harus punya {len(self.fields)} kolom")
+        self.file.write(np.ascontiguousarray(samples.T).tobytes())
+        self.count += samples.shape[1]
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Simpan seluruh sampel sekaligus
+def save(path, samples, parameters=None, **extra):
+    with TrajectoryWriter(path, parameters, **extra) as writer:
+        writer.append(samples)
+
+
+# Urutan kolom waktu yang dibaca per elemen, untuk pencarian biner tanpa
+# memuat seluruh kolom
+class _TimeColumn:
+    def __init__(self, samples, column):
+        self.samples = samples
+        self.column = column
+
+    def __len__(self):
+        return self.samples.shape[0]
+
+    def __getitem__(self, i):
+        return self.samples[i, self.column]
+
+
+# File trajektori yang dibuka sebagai memmap (read-only)
+class TrajectoryFile:
+    def __init__(self, path):
+        self.path = path
+        self.header, self.offset = read_header(path)
+        if self.header.get("encoding", "raw") != "raw":
+            raise TrajectoryFormatError(f"{path} berisi chunk terkompresi; baca dengan recorder.read_recording()")
+        self.fields = tuple(self.header["fields"])
+        self.parameters = self.header.get("parameters", {})
+
+        row_bytes = len(self.fields) * np.dtype(self.header["dtype"]).itemsize
+        count = (os.path.getsize(path) - self.offset) // row_bytes
+        if count > 0:
+            self.samples = np.memmap(path, dtype=self.header["dtype"], mode="r",
+                                     offset=self.offset, shape=(count, len(self.fields)))
+        else:
+            self.samples = np.empty((0, len(self.fields)), dtype=self.header["dtype"])
+
+    def __len__(self):
+        return self.samples.shape[0]
+
+    def column(self, name):
+        return self.samples[:, self.fields.index(name)]
+
+    # Indeks sampel pertama dengan t >= t (pencarian biner, O(log n) baca)
+    def index_of(self, t):
+        return bisect.bisect_left(_TimeColumn(self.samples, self.fields.index("t")), t)
+
+    # Sampel dengan t0 <= t < t1 sebagai view memmap
+    def time_slice(self, t0=None, t1=None):
+        start = 0 if t0 is None else self.index_of(t0)
+        stop = len(self) if t1 is None else self.index_of(t1)
+        return self.samples[start:stop]
+
+
+# Baca header dan seluruh sampel (tanpa memmap) sebagai (header, array)
+def load(path):
+    trajectory = TrajectoryFile(path)
+    return trajectory.header, np.array(trajectory.samples)
+